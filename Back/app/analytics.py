@@ -0,0 +1,165 @@
+"""
+출석 분석 (요일 x 시간 점유 히트맵, 이용 시간 분포)
+- checkins 를 서버측 커서(SSCursor)로 ANALYTICS_BATCH_SIZE 행씩 튜플로 받아 NumPy 열 배열로 모읍니다.
+  시각은 DB 에서 1970-01-01 기준 초(벽시계)로 받아 행마다 datetime 객체를 만들지 않습니다.
+  아카이브된 월(checkin_archive)은 파일의 열 배열을 그대로 씁니다.
+- 점유 인원은 세션 [입장, 퇴장) 을 +1/-1 이벤트로 정렬해 누적합으로 구하는 구간 스윕으로 계산하고,
+  누적 인원-초 함수를 시간 경계에서 읽어 시간당 평균 점유 인원을 냅니다.
+- 자동 퇴장된 세션(이용 시간이 AUTO_CHECKOUT_MINUTES 이상)은 실제 퇴장 시각을 알 수 없으므로
+  점유/이용 시간 분포에서 따로 집계합니다. 아직 입장 중인 세션은 지금(또는 자동 퇴장 기한)까지로 봅니다.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+import numpy as np
+import pymysql
+from dateutil.relativedelta import relativedelta
+from .database import get_connection
+from .checkin_archive import load_archive
+from .config import get_settings
+
+settings = get_settings()
+
+EPOCH = datetime(1970, 1, 1)
+HOUR = 3600
+DURATION_BIN_MINUTES = 15
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+# 벽시계 기준 초 (세션 time_zone 과 무관), 퇴장 전이면 -1
+SESSIONS_SQL = """
+SELECT TIMESTAMPDIFF(SECOND, '1970-01-01', checkin_time),
+       COALESCE(TIMESTAMPDIFF(SECOND, '1970-01-01', checkout_time), -1)
+FROM checkins
+WHERE checkin_time >= %s AND checkin_time < %s
+"""
+
+
+def to_seconds(value: datetime) -> int:
+    return int((value - EPOCH).total_seconds())
+
+
+def _archived_sessions(start: date, end: date) -> List[np.ndarray]:
+    """[start, end) 에 걸친 아카이브 월의 (입장, 퇴장) 초 배열"""
+    chunks = []
+    month = start.replace(day=1)
+    while month < end:
+        arrays = load_archive(month)
+        if arrays is not None:
+            checkin = arrays["checkin_time"].astype("datetime64[s]")
+            checkout = arrays["checkout_time"].astype("datetime64[s]")
+            keep = (checkin >= np.datetime64(start, "s")) & (checkin < np.datetime64(end, "s"))
+            out = checkout.astype(np.int64)
+            out[np.isnat(checkout)] = -1
+            chunks.append(np.column_stack([checkin.astype(np.int64), out])[keep])
+        month += relativedelta(months=1)
+    return chunks
+
+
+def load_sessions(start: date, end: date, batch_size: int = None) -> np.ndarray:
+    """[start, end) 에 입장한 세션 -> (n, 2) int64 배열 [입장 초, 퇴장 초(-1 이면 입장 중)]"""
+    batch_size = batch_size or settings.ANALYTICS_BATCH_SIZE
+    chunks = _archived_sessions(start, end)
+    conn = get_connection()
+    try:
+        with conn.cursor(pymysql.cursors.SSCursor) as cursor:
+            cursor.execute(SESSIONS_SQL, (start, end))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                chunks.append(np.array(rows, dtype=np.int64))
+    finally:
+        conn.close()
+    if not chunks:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(chunks)
+
+
+def occupancy_seconds(starts: np.ndarray, ends: np.ndarray, edges: np.ndarray) -> Tuple[np.ndarray, int, int]:
+    """
+    구간 스윕: 세션 [starts, ends) 의 점유 인원을 edges 경계 구간마다 인원-초로 적분
+    -> (구간별 인원-초, 최대 동시 인원, 최대가 된 시각 초)
+    """
+    if len(starts) == 0:
+        return np.zeros(len(edges) - 1), 0, 0
+    times = np.concatenate([starts, ends])
+    deltas = np.concatenate([np.ones(len(starts), np.int64), -np.ones(len(ends), np.int64)])
+    order = np.argsort(times, kind="stable")
+    times, occupancy = times[order], np.cumsum(deltas[order])
+    # 같은 시각의 입장/퇴장이 모두 반영된 마지막 값만 남김
+    last = np.append(times[1:] != times[:-1], True)
+    times, occupancy = times[last], occupancy[last]
+
+    # integral[k]: times[0] ~ times[k] 사이 인원-초
+    integral = np.concatenate([[0], np.cumsum(occupancy[:-1] * np.diff(times))])
+    idx = np.searchsorted(times, edges, side="right") - 1
+    clipped = np.clip(idx, 0, None)
+    at_edges = np.where(idx >= 0, integral[clipped] + occupancy[clipped] * (edges - times[clipped]), 0)
+    peak = int(np.argmax(occupancy))
+    return np.diff(at_edges).astype(np.float64), int(occupancy[peak]), int(times[peak])
+
+
+def _heatmap(person_seconds: np.ndarray, edges: np.ndarray) -> List[List[float]]:
+    """시간 구간별 인원-초 -> 요일(월=0) x 시(0~23) 평균 점유 인원"""
+    bins = edges[:-1]
+    slot = (((bins // 86400) + 3) % 7) * 24 + (bins // HOUR) % 24  # 1970-01-01 은 목요일
+    totals = np.bincount(slot, weights=person_seconds, minlength=7 * 24)
+    hours = np.bincount(slot, minlength=7 * 24)
+    average = np.divide(totals, hours * HOUR, out=np.zeros(7 * 24), where=hours > 0)
+    return np.round(average.reshape(7, 24), 2).tolist()
+
+
+def _durations(minutes: np.ndarray) -> Dict:
+    if len(minutes) == 0:
+        return {"count": 0, "mean_minutes": None, "p50_minutes": None, "p90_minutes": None, "histogram": []}
+    upper = settings.AUTO_CHECKOUT_MINUTES
+    counts, bin_edges = np.histogram(minutes, bins=np.arange(0, upper + DURATION_BIN_MINUTES, DURATION_BIN_MINUTES))
+    p50, p90 = np.percentile(minutes, [50, 90])
+    return {
+        "count": int(len(minutes)),
+        "mean_minutes": round(float(minutes.mean()), 1),
+        "p50_minutes": round(float(p50), 1),
+        "p90_minutes": round(float(p90), 1),
+        "histogram": [
+            {"from_minutes": int(lo), "to_minutes": int(hi), "count": int(c)}
+            for lo, hi, c in zip(bin_edges[:-1], bin_edges[1:], counts)
+        ],
+    }
+
+
+def compute_attendance(sessions: np.ndarray, start_s: int, end_s: int, now_s: int) -> Dict:
+    """load_sessions 결과로 히트맵/분포 계산 (DB 와 무관한 순수 계산, 벤치마크에서 직접 호출)"""
+    limit = settings.AUTO_CHECKOUT_MINUTES * 60
+    checkin, checkout = sessions[:, 0], sessions[:, 1]
+    is_open = checkout < 0
+    duration = checkout - checkin
+    is_auto = ~is_open & (duration >= limit)
+    ends = np.where(is_open, np.minimum(checkin + limit, max(now_s, start_s)), checkout)
+    ends = np.maximum(ends, checkin)
+
+    edges = np.arange(start_s, end_s + 1, HOUR, dtype=np.int64)
+    normal = ~is_auto
+    occupied, peak, peak_at = occupancy_seconds(checkin[normal], ends[normal], edges)
+    auto_occupied, _, _ = occupancy_seconds(checkin[is_auto], ends[is_auto], edges)
+    closed = ~is_open & ~is_auto
+    return {
+        "sessions": int(len(sessions)),
+        "open_sessions": int(is_open.sum()),
+        "auto_checkout_sessions": int(is_auto.sum()),
+        "peak_occupancy": peak,
+        "peak_at": (EPOCH + timedelta(seconds=peak_at)) if peak else None,
+        "weekdays": WEEKDAYS,
+        "heatmap": _heatmap(occupied, edges),
+        "auto_checkout_heatmap": _heatmap(auto_occupied, edges),
+        "durations": _durations(duration[closed] / 60),
+    }
+
+
+def attendance_analytics(start: date, end: date) -> Dict:
+    """[start, end] (양 끝 포함) 출석 분석"""
+    end_exclusive = end + timedelta(days=1)
+    sessions = load_sessions(start, end_exclusive)
+    result = compute_attendance(
+        sessions, to_seconds(datetime.combine(start, datetime.min.time())),
+        to_seconds(datetime.combine(end_exclusive, datetime.min.time())), to_seconds(datetime.now())
+    )
+    return {"start": start, "end": end, **result}
@@ -0,0 +1,71 @@
+"""
+비동기(aiomysql) 데이터베이스 접근 계층
+async 라우트는 이 풀을 사용해 이벤트 루프를 막지 않고 쿼리합니다.
+"""
+import aiomysql
+from contextlib import asynccontextmanager
+from .config import get_settings
+
+settings = get_settings()
+
+_async_pool = None
+
+
+async def init_async_pool():
+    """aiomysql 연결 풀 생성 (애플리케이션 시작 시 1회)"""
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = await aiomysql.create_pool(
+            host=settings.DB_HOST,
+            user=settings.DB_USER,
+            password=settings.DB_PASSWORD,
+            db=settings.DB_NAME,
+            port=settings.DB_PORT,
+            charset='utf8mb4',
+            cursorclass=aiomysql.DictCursor,
+            minsize=settings.ASYNC_DB_POOL_MIN_SIZE,
+            maxsize=settings.ASYNC_DB_POOL_MAX_SIZE,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            autocommit=False,
+        )
+    return _async_pool
+
+
+async def close_async_pool():
+    global _async_pool
+    if _async_pool is not None:
+        _async_pool.close()
+        await _async_pool.wait_closed()
+        _async_pool = None
+
+
+def async_pool_stats() -> dict:
+    if _async_pool is None:
+        return {"size": 0, "idle": 0, "in_use": 0}
+    return {
+        "size": _async_pool.size,
+        "idle": _async_pool.freesize,
+        "in_use": _async_pool.size - _async_pool.freesize,
+        "min_size": _async_pool.minsize,
+        "max_size": _async_pool.maxsize,
+    }
+
+
+@asynccontextmanager
+async def get_async_cursor():
+    """비동기 커서를 컨텍스트 매니저로 제공합니다."""
+    pool = await init_async_pool()
+    async with pool.acquire() as conn:
+        try:
+            async with conn.cursor() as cursor:
+                yield cursor
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+
+
+# FastAPI dependency
+async def get_async_db():
+    async with get_async_cursor() as cursor:
+        yield cursor
@@ -0,0 +1,192 @@
+"""
+3시간 자동 퇴장 엔진
+체크인마다 MySQL EVENT를 만드는 대신, 앱 안의 주기적 sweeper가 기한이 지난 입장 기록을
+한 번의 집합 UPDATE로 퇴장 처리합니다. (migrations.CHECKIN_INDEXES 의 idx_checkins_open 사용)
+- 퇴장 시각은 실제 처리 시각이 아니라 checkin_time + 3시간으로 기록하므로, 서버가 내려가 있던
+  동안 밀린 기록도 다음 sweep 에서 정확한 시각으로 정리됩니다.
+- 여러 워커가 동시에 떠 있어도 GET_LOCK 리더 락을 잡은 프로세스 하나만 sweep 합니다.
+- 리더는 CHECKIN_MAINTENANCE_INTERVAL_SECONDS 마다 checkins 파티션 유지/아카이브(checkin_archive.maintain)도 실행합니다.
+- 리더는 EXPIRY_SCAN_INTERVAL_SECONDS 마다 만료 예정 스캔(expiry_reminders.scan)을, sweep 마다 알림 outbox 전달(drain)을 실행합니다.
+- 리더는 날짜가 바뀐 뒤 첫 sweep 에서 회원 상태(membership_status)를 다시 계산합니다. (migrations.refresh_member_status)
+  MySQL 이벤트 스케줄러가 꺼져 있어도 '곧 만료'/'만료' 필터가 날짜를 따라갑니다.
+"""
+import threading
+import time
+from datetime import date, timedelta
+from .database import get_connection
+from .checkin_feed import checkin_feed
+from . import checkin_archive
+from . import expiry_reminders
+from .migrations import refresh_member_status
+from .config import get_settings
+
+settings = get_settings()
+
+LEADER_LOCK_NAME = "gym_auto_checkout_leader"
+
+# 기한이 지난 입장 기록을 잠그고 읽습니다. 퇴장 처리(SWEEP_SQL)와 실시간 피드 알림은 모두 이 id 목록 기준입니다.
+DUE_SQL = """
+SELECT c.id, c.member_id, c.checkin_time, m.name
+FROM checkins c
+JOIN members m ON m.member_id = c.member_id
+WHERE c.checkout_time IS NULL
+  AND c.checkin_time <= NOW() - INTERVAL %s MINUTE
+FOR UPDATE
+"""
+
+# DUE_SQL 이 잠근 행만 퇴장 처리 ({ids} 는 id 개수만큼의 %s)
+SWEEP_SQL = """
+UPDATE checkins c
+JOIN members m ON m.member_id = c.member_id
+SET c.checkout_time = c.checkin_time + INTERVAL %s MINUTE,
+    m.checkin_time = NULL,
+    m.checkout_time = c.checkin_time + INTERVAL %s MINUTE,
+    m.last_checkout_time = IF(m.last_checkin_time = c.checkin_time,
+                              c.checkin_time + INTERVAL %s MINUTE, m.last_checkout_time)
+WHERE c.id IN ({ids})
+"""
+
+
+def sweep(cursor, minutes: int = None) -> int:
+    """
+    기한(minutes)이 지난 입장 기록을 모두 퇴장 처리하고 영향받은 행 수(checkins + members)를 반환합니다.
+    DUE_SQL 로 잠근 id 만 같은 트랜잭션에서 UPDATE 하므로, 퇴장 처리된 기록마다 정확히 한 번 피드에 알립니다.
+    """
+    minutes = minutes or settings.AUTO_CHECKOUT_MINUTES
+    cursor.execute(DUE_SQL, (minutes,))
+    due = cursor.fetchall()
+    if not due:
+        cursor.connection.commit()
+        return 0
+    ids = [row['id'] for row in due]
+    affected = cursor.execute(
+        SWEEP_SQL.format(ids=", ".join(["%s"] * len(ids))), (minutes, minutes, minutes, *ids)
+    )
+    cursor.connection.commit()
+    for row in due:
+        checkin_feed.publish(
+            "checkout", checkin_id=row['id'], member_id=row['member_id'], name=row['name'],
+            checkin_time=row['checkin_time'],
+            checkout_time=row['checkin_time'] + timedelta(minutes=minutes),
+            auto=True
+        )
+    return affected
+
+
+class AutoCheckoutEngine:
+    """리더 락을 가진 워커에서만 주기적으로 sweep() 을 실행하는 백그라운드 스레드"""
+
+    def __init__(self, interval_seconds: float = None):
+        self.interval_seconds = interval_seconds or settings.AUTO_CHECKOUT_INTERVAL_SECONDS
+        self._stop = threading.Event()
+        self._thread = None
+        self._conn = None
+        self.is_leader = False
+        self.last_swept = 0
+        self._next_maintenance = 0.0
+        self._next_expiry_scan = 0.0
+        self._status_refreshed_on = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="auto-checkout", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval_seconds)
+        self._disconnect()
+
+    def _disconnect(self):
+        # 세션이 끝나면 GET_LOCK 도 자동으로 해제됩니다.
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self.is_leader = False
+
+    def _ensure_leader(self) -> bool:
+        if self._conn is None:
+            self._conn = get_connection()
+            self.is_leader = False
+        else:
+            self._conn.ping(reconnect=False)
+        if not self.is_leader:
+            with self._conn.cursor() as cursor:
+                cursor.execute("SELECT GET_LOCK(%s, 0) AS acquired", (LEADER_LOCK_NAME,))
+                row = cursor.fetchone()
+                self.is_leader = bool(row and row['acquired'])
+        return self.is_leader
+
+    def run_once(self) -> int:
+        if not self._ensure_leader():
+            return 0
+        with self._conn.cursor() as cursor:
+            self.last_swept = sweep(cursor)
+        if self.last_swept:
+            print(f"✅ [자동 퇴장] {self.last_swept}개 행 갱신")
+        if time.monotonic() >= self._next_maintenance:
+            self._next_maintenance = time.monotonic() + settings.CHECKIN_MAINTENANCE_INTERVAL_SECONDS
+            self.run_maintenance()
+        self.run_status_refresh()
+        self.run_expiry_reminders()
+        return self.last_swept
+
+    def run_maintenance(self):
+        """미래 파티션 생성 + 오래된 파티션 아카이브 (실패해도 sweep 은 계속)"""
+        try:
+            with self._conn.cursor() as cursor:
+                result = checkin_archive.maintain(cursor)
+            for name, rows in result["archived"]:
+                print(f"✅ [checkins 아카이브] {name}: {rows}행")
+        except Exception as e:
+            self._conn.rollback()
+            print(f"⚠️ [checkins 파티션 유지] 실패: {e}")
+
+    def run_status_refresh(self):
+        """하루 한 번 날짜 경과로 바뀐 회원 상태 재계산 (실패하면 다음 sweep 에서 다시 시도, sweep 은 계속)"""
+        today = date.today()
+        if self._status_refreshed_on == today:
+            return
+        try:
+            with self._conn.cursor() as cursor:
+                changed = refresh_member_status(cursor)
+            self._conn.commit()
+            self._status_refreshed_on = today
+            if changed:
+                print(f"✅ [회원 상태] {changed}명 갱신")
+        except Exception as e:
+            self._conn.rollback()
+            print(f"⚠️ [회원 상태 갱신] 실패: {e}")
+
+    def run_expiry_reminders(self):
+        """만료 예정 스캔(주기 도래 시) + 알림 outbox 전달 (실패해도 sweep 은 계속)"""
+        try:
+            with self._conn.cursor() as cursor:
+                if time.monotonic() >= self._next_expiry_scan:
+                    self._next_expiry_scan = time.monotonic() + settings.EXPIRY_SCAN_INTERVAL_SECONDS
+                    queued = sum(c["queued"] for c in expiry_reminders.scan(cursor).values())
+                    if queued:
+                        print(f"✅ [만료 알림] {queued}건 적재")
+                expiry_reminders.drain(cursor)
+        except Exception as e:
+            self._conn.rollback()
+            print(f"⚠️ [만료 알림] 실패: {e}")
+
+    def _run(self):
+        # 기동 직후 한 번 실행해 다운타임 동안 밀린 기록을 먼저 정리합니다.
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️ [자동 퇴장] sweep 실패: {e}")
+                self._disconnect()
+            self._stop.wait(self.interval_seconds)
+
+
+auto_checkout_engine = AutoCheckoutEngine()
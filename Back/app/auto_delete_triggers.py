@@ -3,76 +3,46 @@
 기존 database_setup.py 기능을 그대로 이전
 """
 from .database import get_connection
+from . import migrations
+from . import checkin_archive
+from .auto_checkout import sweep as auto_checkout_sweep
 
 
-def setup_deleted_members_table():
-    """deleted_members 테이블 생성"""
+def setup_auto_checkout_event():
+    """3시간 자동 퇴장 정리 (반복 EVENT 대신 앱의 auto_checkout 엔진 사용)"""
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
-            sql = """
-            CREATE TABLE IF NOT EXISTS deleted_members (
-                member_id INT PRIMARY KEY,
-                member_rank INT,
-                name VARCHAR(100),
-                phone_number VARCHAR(20),
-                gender CHAR(1),
-                membership_type VARCHAR(50),
-                membership_start_date DATE,
-                membership_end_date DATE,
-                locker_number INT,
-                locker_type VARCHAR(50),
-                locker_start_date DATE,
-                locker_end_date DATE,
-                uniform_type VARCHAR(50),
-                uniform_start_date DATE,
-                uniform_end_date DATE,
-                created_at DATETIME,
-                deleted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                INDEX idx_deleted_at (deleted_at)
-            )
-            """
-            cursor.execute(sql)
-            conn.commit()
-            print("✅ deleted_members 테이블 생성 완료")
+            # Remove any existing recurring auto-checkout event. Automatic
+            # checkouts are handled by the in-app sweeper (app/auto_checkout.py)
+            # which runs the same set-based UPDATE periodically.
+            cursor.execute("DROP EVENT IF EXISTS auto_checkout_after_3hours")
+
+            # Immediate one-time cleanup of checkins that are already past
+            # the limit, using the same sweep the app runs.
+            cleaned = auto_checkout_sweep(cursor)
+            print(f"✅ 기존 3시간 초과 체크인 즉시 정리 완료 ({cleaned}개 행 갱신)")
+            print("⚠️ 반복 이벤트는 생성하지 않습니다. 앞으로는 앱의 자동 퇴장 엔진이 처리합니다.")
     except Exception as e:
-        print(f"❌ deleted_members 테이블 생성 실패: {e}")
+        print(f"❌ auto_checkout_after_3hours 이벤트 생성 실패: {e}")
         conn.rollback()
     finally:
         conn.close()
 
 
-def setup_auto_checkout_event():
-    """3시간 자동 퇴장 이벤트 생성"""
+def setup_checkin_partitions():
+    """checkins 월별 파티션 설정 + 미래 파티션 생성 (이후에는 자동 퇴장 리더 워커가 주기적으로 유지)"""
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
-            # Remove any existing recurring auto-checkout event to avoid
-            # mass-updating records on schedule. We will perform a one-time
-            # immediate cleanup for existing overdue checkins below, and
-            # rely on per-checkin EVENTS (created at checkin time) for
-            # future automatic checkouts at the exact checkin_time + 3 hours.
-            cursor.execute("DROP EVENT IF EXISTS auto_checkout_after_3hours")
-
-            # Immediate one-time cleanup: mark existing checkins older than
-            # 180 minutes (3 hours) as checked out now. This makes the
-            # behavior deterministic: any pre-existing rows that are >3h
-            # will be updated once when the setup script runs.
-            cleanup_sql = """
-            UPDATE checkins c
-            JOIN members m ON m.member_id = c.member_id
-            SET c.checkout_time = NOW(),
-                m.checkin_time = NULL,
-                m.checkout_time = NOW()
-            WHERE c.checkout_time IS NULL
-              AND TIMESTAMPDIFF(MINUTE, c.checkin_time, NOW()) >= 180;
-            """
-            cursor.execute(cleanup_sql)
+            converted = checkin_archive.partition_table(cursor)
+            created = checkin_archive.ensure_partitions(cursor)
             conn.commit()
-            print("✅ 기존 3시간 초과 체크인에 대한 즉시 정리 완료")
-            print("⚠️ 반복 이벤트는 생성하지 않습니다. 앞으로는 per-checkin EVENT가 사용됩니다.")
+            if converted:
+                print(f"✅ checkins 월별 파티션 전환 완료 ({converted}개월)")
+            print(f"✅ checkins 미래 파티션 확인 완료 (새로 {len(created)}개)")
     except Exception as e:
-        print(f"❌ auto_checkout_after_3hours 이벤트 생성 실패: {e}")
+        print(f"❌ checkins 파티션 설정 실패: {e}")
         conn.rollback()
     finally:
         conn.close()
@@ -125,7 +95,14 @@ def setup_checkin_insert_trigger():
             FOR EACH ROW
             BEGIN
                 IF NEW.checkout_time IS NOT NULL AND TIMESTAMPDIFF(MINUTE, NEW.checkin_time, NOW()) >= 180 THEN
-                    UPDATE members SET checkin_time = NULL, checkout_time = NOW() WHERE member_id = NEW.member_id;
+                    UPDATE members
+                    SET checkin_time = NULL,
+                        checkout_time = NOW(),
+                        last_checkout_time = IF(last_checkin_time IS NULL OR NEW.checkin_time >= last_checkin_time,
+                                                NEW.checkout_time, last_checkout_time),
+                        last_checkin_time = IF(last_checkin_time IS NULL OR NEW.checkin_time >= last_checkin_time,
+                                               NEW.checkin_time, last_checkin_time)
+                    WHERE member_id = NEW.member_id;
                 END IF;
             END
             """
@@ -140,7 +117,7 @@ def setup_checkin_insert_trigger():
 
 
 def setup_auto_delete_event():
-    """30일 후 자동 영구 삭제 이벤트 생성 (deleted_members에서만)"""
+    """30일 후 자동 영구 삭제 이벤트 생성 (삭제 표시된 회원만, idx_members_deleted_at)"""
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -150,8 +127,8 @@ def setup_auto_delete_event():
             ON SCHEDULE EVERY 1 DAY
             DO
             BEGIN
-                DELETE FROM deleted_members
-                WHERE TIMESTAMPDIFF(DAY, deleted_at, NOW()) >= 30;
+                DELETE FROM members
+                WHERE deleted_at IS NOT NULL AND deleted_at <= NOW() - INTERVAL 30 DAY;
             END
             """
             cursor.execute(sql)
@@ -202,12 +179,13 @@ def setup_all():
     print("=" * 50)
     print("자동 삭제 트리거 및 이벤트 설정 시작")
     print("=" * 50)
-    setup_deleted_members_table()
+    migrations.run_all()  # 생성 컬럼/인덱스 마이그레이션 (삭제 회원 툼스톤 + deleted_members 호환 뷰 포함)
+    setup_checkin_partitions()  # checkins 월별 파티션 (오래된 월은 checkin_archive 가 파일로 보관)
     remove_member_delete_trigger()  # 트리거 제거 (관리자 명시적 삭제만 허용)
     setup_auto_checkout_event()
     # Create INSERT trigger that immediately checks out past checkins
     setup_checkin_insert_trigger()
-    setup_auto_delete_event()  # 30일 후 자동 영구 삭제 (deleted_members에서만)
+    setup_auto_delete_event()  # 30일 후 자동 영구 삭제 (삭제 표시된 회원만)
     enable_event_scheduler()
     print("=" * 50)
     print("자동 삭제 트리거 및 이벤트 설정 완료")
@@ -0,0 +1,345 @@
+"""
+checkins 월별 파티션 관리와 콜드 아카이브
+- checkins 는 checkin_time 기준 RANGE COLUMNS 월 파티션(p{YYYYMM}) + 끝의 p_future(MAXVALUE) 로 나뉩니다.
+  반열린 구간 [시작, 끝) 조회는 파티션 프루닝으로 해당 월만 읽습니다.
+- ensure_partitions: 이번 달부터 CHECKIN_PARTITIONS_AHEAD 개월 뒤까지의 파티션을 p_future 를 쪼개 미리 만듭니다.
+- archive_partitions: CHECKIN_ARCHIVE_AFTER_MONTHS 개월보다 오래된 파티션을 EXCHANGE PARTITION 으로 스테이징 테이블
+  (checkins_archive_p{YYYYMM})에 옮겨 빈 파티션을 DROP 한 뒤, 스테이징 테이블을 컬럼별 압축 파일(.npz)로
+  CHECKIN_ARCHIVE_DIR 에 내보내고 다시 읽어 행 수를 확인한 다음 스테이징 테이블을 지웁니다.
+  내보내는 동안 들어온 기록이 파티션과 함께 지워지는 일이 없고, 중간에 실패하면 다음 실행이 스테이징 테이블부터 이어갑니다.
+- read_member_month: 아카이브된 월의 회원 기록을 파일에서 읽습니다. (CheckinRepository.get_member_calendar 가 사용)
+- 자동 퇴장 리더 워커가 CHECKIN_MAINTENANCE_INTERVAL_SECONDS 마다 maintain() 을 실행합니다.
+  (파일은 리더가 떠 있는 호스트의 로컬 디스크에 쓰이므로 여러 호스트로 운영하면 공유 디렉터리를 지정해야 합니다.)
+- 영구 삭제된 회원의 기록도 아카이브 파일에는 남습니다.
+
+수동 실행: python -m app.checkin_archive
+"""
+import os
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from dateutil.relativedelta import relativedelta
+from .config import get_settings
+from .migrations import MEMBER_CHECKINS_CASCADE_TRIGGER_SQL
+
+settings = get_settings()
+
+FUTURE_PARTITION = "p_future"
+STAGE_PREFIX = "checkins_archive_"
+
+_INT_TYPES = ("tinyint", "smallint", "mediumint", "int", "bigint")
+_TIME_TYPES = ("datetime", "timestamp")
+
+
+def partition_name(month: date) -> str:
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """p{YYYYMM} -> 해당 월 1일 (p_future 등은 None)"""
+    if len(name) == 7 and name[0] == "p" and name[1:].isdigit():
+        return date(int(name[1:5]), int(name[5:]), 1)
+    return None
+
+
+def _partition_sql(month: date) -> str:
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN ('{month + relativedelta(months=1)}')"
+
+
+def _months(start: date, end: date) -> List[date]:
+    """start 월부터 end 월까지 (양 끝 포함) 각 월 1일"""
+    months, month = [], start.replace(day=1)
+    while month <= end:
+        months.append(month)
+        month += relativedelta(months=1)
+    return months
+
+
+def list_partitions(cursor) -> List[str]:
+    """checkins 파티션 이름 (순서대로). 파티션되지 않은 테이블이면 빈 목록"""
+    cursor.execute(
+        """
+        SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'checkins' AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+        """
+    )
+    return [row['PARTITION_NAME'] for row in cursor.fetchall()]
+
+
+def partition_table(cursor, months_ahead: int = None) -> int:
+    """
+    파티션되지 않은 checkins 를 월 파티션으로 바꿉니다. (가장 오래된 기록의 월 ~ 이번 달 + months_ahead)
+    MySQL 파티션 테이블은 모든 UNIQUE 키에 파티션 컬럼이 있어야 하고 외래 키를 가질 수 없으므로
+    PK 를 (id, checkin_time) 으로 바꾸고 checkins -> members 외래 키를 제거합니다.
+    ON DELETE CASCADE 였다면 같은 동작을 members_checkins_after_delete 트리거로 유지합니다.
+    """
+    if list_partitions(cursor):
+        return 0
+    months_ahead = settings.CHECKIN_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+
+    cursor.execute(
+        """
+        SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'checkins'
+          AND NON_UNIQUE = 0 AND INDEX_NAME <> 'PRIMARY'
+        """
+    )
+    unique_keys = [row['INDEX_NAME'] for row in cursor.fetchall()]
+    if unique_keys:
+        raise RuntimeError(f"checkin_time 이 없는 UNIQUE 키가 있어 파티션할 수 없습니다: {unique_keys}")
+
+    cursor.execute(
+        """
+        SELECT CONSTRAINT_NAME, DELETE_RULE FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'checkins'
+        """
+    )
+    foreign_keys = cursor.fetchall()
+    for fk in foreign_keys:
+        cursor.execute(f"ALTER TABLE checkins DROP FOREIGN KEY {fk['CONSTRAINT_NAME']}")
+    if any(fk['DELETE_RULE'] == "CASCADE" for fk in foreign_keys):
+        # FK cascade 처럼 출석 롤업은 건드리지 않음 (migrations.MEMBER_CHECKINS_CASCADE_TRIGGER_SQL)
+        cursor.execute("DROP TRIGGER IF EXISTS members_checkins_after_delete")
+        cursor.execute(MEMBER_CHECKINS_CASCADE_TRIGGER_SQL)
+
+    cursor.execute("ALTER TABLE checkins DROP PRIMARY KEY, ADD PRIMARY KEY (id, checkin_time)")
+
+    cursor.execute("SELECT MIN(checkin_time) AS oldest FROM checkins")
+    oldest = cursor.fetchone()['oldest']
+    this_month = date.today().replace(day=1)
+    first = min(oldest.date(), this_month) if oldest else this_month
+    partitions = [_partition_sql(m) for m in _months(first, this_month + relativedelta(months=months_ahead))]
+    partitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    cursor.execute(f"ALTER TABLE checkins PARTITION BY RANGE COLUMNS(checkin_time) ({', '.join(partitions)})")
+    return len(partitions) - 1
+
+
+def ensure_partitions(cursor, months_ahead: int = None) -> List[str]:
+    """이번 달 ~ months_ahead 개월 뒤 파티션 중 없는 것을 p_future 에서 쪼개 만들고 이름을 반환"""
+    months_ahead = settings.CHECKIN_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    existing = [partition_month(name) for name in list_partitions(cursor)]
+    months = [m for m in existing if m]
+    if not months:
+        return []
+    this_month = date.today().replace(day=1)
+    missing = _months(months[-1] + relativedelta(months=1), this_month + relativedelta(months=months_ahead))
+    if not missing:
+        return []
+    partitions = [_partition_sql(m) for m in missing]
+    partitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    cursor.execute(f"ALTER TABLE checkins REORGANIZE PARTITION {FUTURE_PARTITION} INTO ({', '.join(partitions)})")
+    return [partition_name(m) for m in missing]
+
+
+def archive_path(month: date) -> str:
+    return os.path.join(settings.CHECKIN_ARCHIVE_DIR, f"checkins_{month.year:04d}{month.month:02d}.npz")
+
+
+def _stored_columns(cursor) -> List[Tuple[str, str]]:
+    """checkins 의 저장 컬럼 (가상 생성 컬럼 제외) -> [(이름, 타입)]"""
+    cursor.execute(
+        """
+        SELECT COLUMN_NAME, DATA_TYPE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'checkins' AND EXTRA NOT LIKE '%%GENERATED%%'
+        ORDER BY ORDINAL_POSITION
+        """
+    )
+    return [(row['COLUMN_NAME'], row['DATA_TYPE']) for row in cursor.fetchall()]
+
+
+def _to_array(values: list, data_type: str) -> np.ndarray:
+    if data_type in _INT_TYPES:
+        return np.array([0 if v is None else v for v in values], dtype=np.int64)
+    if data_type in _TIME_TYPES:
+        return np.array(values, dtype="datetime64[s]")  # None -> NaT
+    if data_type == "date":
+        return np.array(values, dtype="datetime64[D]")
+    return np.array(["" if v is None else str(v) for v in values])
+
+
+def export_partition(cursor, name: str, path: str, table: str = None) -> int:
+    """
+    파티션(table 을 주면 그 스테이징 테이블)을 컬럼별 배열로 압축 저장 (member_id, checkin_time 순 정렬 -> 회원 조회는 이진 탐색)
+    NULL 이 있는 컬럼은 "{컬럼}.null" 마스크를 함께 저장합니다. 임시 파일에 쓴 뒤 교체하므로 중간 상태 파일은 남지 않습니다.
+    """
+    columns = _stored_columns(cursor)
+    names = ", ".join(column for column, _ in columns)
+    source = table or f"checkins PARTITION ({name})"
+    cursor.execute(f"SELECT {names} FROM {source} ORDER BY member_id, checkin_time")
+    rows = cursor.fetchall()
+
+    arrays: Dict[str, np.ndarray] = {}
+    for column, data_type in columns:
+        values = [row[column] for row in rows]
+        arrays[column] = _to_array(values, data_type)
+        nulls = np.array([v is None for v in values], dtype=bool)
+        if nulls.any():
+            arrays[f"{column}.null"] = nulls
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+@lru_cache(maxsize=24)
+def _load(path: str, mtime_ns: int) -> Dict[str, np.ndarray]:
+    with np.load(path) as archive:
+        return {key: archive[key] for key in archive.files}
+
+
+def load_archive(month: date) -> Optional[Dict[str, np.ndarray]]:
+    """아카이브된 월이면 컬럼 배열 dict, 아니면 None (파일 mtime 이 바뀌면 다시 읽음)"""
+    path = archive_path(month)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load(path, mtime_ns)
+
+
+def _rows(arrays: Dict[str, np.ndarray], lo: int, hi: int) -> List[dict]:
+    columns = [key for key in arrays if not key.endswith(".null")]
+    values = {}
+    for column in columns:
+        column_values = arrays[column][lo:hi]
+        if column_values.dtype.kind == "M":
+            column_values = column_values.astype(object)  # datetime64 -> datetime / date, NaT -> None
+        column_values = column_values.tolist()
+        nulls = arrays.get(f"{column}.null")
+        if nulls is not None:
+            column_values = [None if null else v for v, null in zip(column_values, nulls[lo:hi].tolist())]
+        values[column] = column_values
+    return [{column: values[column][i] for column in columns} for i in range(hi - lo)]
+
+
+def read_member_month(member_id: int, year: int, month: int) -> Optional[List[dict]]:
+    """아카이브된 월의 회원 기록 (checkin_time 내림차순). 아카이브되지 않은 월이면 None"""
+    arrays = load_archive(date(year, month, 1))
+    if arrays is None:
+        return None
+    member_ids = arrays["member_id"]
+    lo = int(np.searchsorted(member_ids, member_id, side="left"))
+    hi = int(np.searchsorted(member_ids, member_id, side="right"))
+    return _rows(arrays, lo, hi)[::-1]
+
+
+def _stage_tables(cursor) -> List[str]:
+    """이전 실행이 남긴 스테이징 테이블의 파티션 이름"""
+    cursor.execute(
+        """
+        SELECT TABLE_NAME FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND LEFT(TABLE_NAME, %s) = %s
+        """,
+        (len(STAGE_PREFIX), STAGE_PREFIX)
+    )
+    names = [row['TABLE_NAME'][len(STAGE_PREFIX):] for row in cursor.fetchall()]
+    return [name for name in names if partition_month(name)]
+
+
+def _table_exists(cursor, table: str) -> bool:
+    cursor.execute(
+        "SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,)
+    )
+    return cursor.fetchone() is not None
+
+
+def _create_empty_copy(cursor, table: str):
+    """checkins 와 같은 구조의 파티션 없는 빈 테이블 (EXCHANGE PARTITION 상대, 트리거는 복사되지 않음)"""
+    cursor.execute(f"CREATE TABLE {table} LIKE checkins")
+    cursor.execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
+
+
+def stage_partition(cursor, name: str) -> str:
+    """
+    파티션의 행을 스테이징 테이블로 옮기고 빈 파티션을 DROP -> 스테이징 테이블 이름
+    EXCHANGE PARTITION 은 트리거 없이 메타데이터만 바꾸므로 빠르고, 교환 이후 들어온 늦은 기록은
+    checkins 를 잠근 채 파티션이 비었는지 확인해 다시 옮기므로 DROP 과 함께 사라지지 않습니다.
+    교환 테이블({stage}_swap)은 스테이징 테이블에 합친 뒤에만 지웁니다. (중간에 죽으면 다음 실행이 먼저 합침,
+    같은 행을 두 번 합쳐도 PK (id, checkin_time) 로 한 번만 남음)
+    """
+    stage = STAGE_PREFIX + name
+    swap = f"{stage}_swap"
+    if not _table_exists(cursor, stage):
+        _create_empty_copy(cursor, stage)
+    names = ", ".join(column for column, _ in _stored_columns(cursor))
+
+    def merge_swap():
+        cursor.execute(f"INSERT IGNORE INTO {stage} ({names}) SELECT {names} FROM {swap}")
+        cursor.connection.commit()
+        cursor.execute(f"DROP TABLE {swap}")
+
+    if _table_exists(cursor, swap):
+        merge_swap()
+    for _ in range(3):
+        _create_empty_copy(cursor, swap)
+        cursor.execute(f"ALTER TABLE checkins EXCHANGE PARTITION {name} WITH TABLE {swap}")
+        merge_swap()
+
+        # 잠금은 빈 파티션 확인 + DROP 동안만 (수 ms) 유지하고, 늦게 들어온 기록이 있으면 다시 교환
+        cursor.execute("LOCK TABLES checkins WRITE")
+        try:
+            cursor.execute(f"SELECT COUNT(*) AS total FROM checkins PARTITION ({name})")
+            if cursor.fetchone()['total'] == 0:
+                cursor.execute(f"ALTER TABLE checkins DROP PARTITION {name}")
+                return stage
+        finally:
+            cursor.execute("UNLOCK TABLES")
+    raise RuntimeError(f"{name}: 옮기는 동안 기록이 계속 들어와 파티션을 지우지 않았습니다.")
+
+
+def archive_partitions(cursor, keep_months: int = None) -> List[Tuple[str, int]]:
+    """
+    keep_months 개월보다 오래된 월 파티션을 스테이징 테이블로 옮겨 DROP 하고 파일로 내보냄 -> [(파티션, 행 수)]
+    내보낸 파일을 다시 읽어 스테이징 테이블 행 수와 같을 때만 스테이징 테이블을 지웁니다.
+    """
+    keep_months = settings.CHECKIN_ARCHIVE_AFTER_MONTHS if keep_months is None else keep_months
+    if keep_months <= 0:
+        return []
+    cutoff = date.today().replace(day=1) - relativedelta(months=keep_months)
+    partitions = [name for name in list_partitions(cursor) if (partition_month(name) or cutoff) < cutoff]
+    archived = []
+    for name in sorted(set(partitions) | set(_stage_tables(cursor))):
+        month = partition_month(name)
+        stage = stage_partition(cursor, name) if name in partitions else STAGE_PREFIX + name
+        path = archive_path(month)
+        exported = export_partition(cursor, name, path, table=stage)
+        with np.load(path) as archive:
+            written = len(archive["member_id"])
+        if written != exported:
+            raise RuntimeError(f"{path}: 내보낸 행 수({exported})와 파일 행 수({written})가 다릅니다.")
+        # 교환/DROP 은 트리거가 돌지 않으므로, 남아 있을 수 있는 오래된 열린 세션도 정리
+        cursor.execute("DELETE FROM active_sessions WHERE checkin_time < %s", (month + relativedelta(months=1),))
+        cursor.connection.commit()
+        cursor.execute(f"DROP TABLE {stage}")
+        archived.append((name, exported))
+    return archived
+
+
+def maintain(cursor) -> Dict[str, list]:
+    """미래 파티션 생성 + 오래된 파티션 아카이브 (파티션되지 않은 테이블이면 아무것도 하지 않음)"""
+    if not list_partitions(cursor):
+        return {"created": [], "archived": []}
+    created = ensure_partitions(cursor)
+    archived = archive_partitions(cursor)
+    cursor.connection.commit()
+    return {"created": created, "archived": archived}
+
+
+if __name__ == "__main__":
+    from .database import get_connection
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            result = maintain(cursor)
+        print(f"✅ checkins 파티션 {len(result['created'])}개 생성, {len(result['archived'])}개 아카이브")
+        for name, rows in result["archived"]:
+            print(f"  - {name}: {rows}행 -> {settings.CHECKIN_ARCHIVE_DIR}")
+    finally:
+        conn.close()
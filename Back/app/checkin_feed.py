@@ -0,0 +1,110 @@
+"""
+관리자 대시보드용 입장/퇴장 실시간 피드 (Server-Sent Events)
+CheckinService 와 자동 퇴장 sweeper 가 커밋 후 publish() 하면, 연결된 대시보드마다의 asyncio 큐로 전달됩니다.
+- 최근 CHECKIN_FEED_BUFFER_SIZE 개 이벤트를 메모리 링 버퍼에 보관해, 재연결한 대시보드가
+  Last-Event-ID 이후의 이벤트만 받도록 합니다. 버퍼보다 오래 끊겼거나 서버가 재시작되었으면 reset 이벤트를 보내
+  클라이언트가 목록을 한 번 다시 읽게 합니다.
+- 이벤트 id 는 "{프로세스 epoch}-{순번}" 입니다. (워커 프로세스마다 독립된 피드)
+- publish() 는 run_db 워커 스레드에서 호출되므로 call_soon_threadsafe 로 이벤트 루프에 넘깁니다.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from .config import get_settings
+
+settings = get_settings()
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"직렬화할 수 없는 값: {value!r}")
+
+
+class _Subscriber:
+    __slots__ = ("queue", "loop")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CHECKIN_FEED_QUEUE_SIZE)
+        self.loop = loop
+
+
+class CheckinFeed:
+    def __init__(self, buffer_size: int):
+        self.epoch = format(int(time.time() * 1000), "x")
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._buffer: deque = deque(maxlen=buffer_size)  # (seq, 이벤트 dict)
+        self._subscribers: List[_Subscriber] = []
+        self._counters = {"published": 0, "dropped_subscribers": 0, "resets": 0}
+
+    def publish(self, event_type: str, **data) -> Dict:
+        """이벤트를 버퍼에 넣고 모든 구독자에게 전달 (커밋이 끝난 뒤 호출)"""
+        with self._lock:
+            self._seq += 1
+            event = {"id": f"{self.epoch}-{self._seq}", "type": event_type, "data": data}
+            self._buffer.append((self._seq, event))
+            subscribers = list(self._subscribers)
+            self._counters["published"] += 1
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(self._offer, sub, event)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힘 (종료 중)
+                self.unsubscribe(sub)
+        return event
+
+    def _offer(self, sub: _Subscriber, event: Dict):
+        try:
+            sub.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 느린 구독자: 연결을 끊고 Last-Event-ID 재연결로 버퍼에서 따라잡게 함
+            self.unsubscribe(sub)
+            with self._lock:
+                self._counters["dropped_subscribers"] += 1
+            sub.queue.get_nowait()
+            sub.queue.put_nowait(None)
+
+    def subscribe(self, last_event_id: Optional[str]) -> Tuple[_Subscriber, List[Dict], bool]:
+        """
+        (구독자, 재전송할 이벤트, reset 필요 여부)
+        last_event_id 가 없으면 새 이벤트만, 있으면 그 이후 이벤트를 버퍼에서 돌려줍니다.
+        """
+        sub = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.append(sub)
+            if not last_event_id:
+                return sub, [], False
+            epoch, _, seq = last_event_id.partition("-")
+            oldest = self._buffer[0][0] if self._buffer else self._seq + 1
+            if epoch != self.epoch or not seq.isdigit() or int(seq) + 1 < oldest:
+                self._counters["resets"] += 1
+                return sub, [], True
+            last = int(seq)
+            return sub, [event for s, event in self._buffer if s > last], False
+
+    def unsubscribe(self, sub: _Subscriber):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    @staticmethod
+    def format(event: Dict) -> str:
+        data = json.dumps(event["data"], ensure_ascii=False, default=_json_default)
+        return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "buffered": len(self._buffer),
+                "last_id": f"{self.epoch}-{self._seq}",
+                **{f"total_{k}": v for k, v in self._counters.items()},
+            }
+
+
+checkin_feed = CheckinFeed(settings.CHECKIN_FEED_BUFFER_SIZE)
@@ -10,6 +10,70 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_NAME: str = "gym_management"
 
+    # Connection pool settings
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_USES: int = 1000  # N회 사용 후 재생성
+    DB_POOL_RECYCLE_SECONDS: int = 3600  # N초 경과 후 재생성
+    DB_POOL_TIMEOUT: float = 5.0  # 연결 대기 제한 시간(초)
+    DB_POOL_MAX_WAITERS: int = 50  # 대기열 최대 길이
+    DB_POOL_PING_INTERVAL: float = 5.0  # 이 시간 이상 유휴 상태였던 연결은 대여 시 ping
+    DB_THREAD_POOL_SIZE: int = 10  # 동기 DB 작업을 실행할 워커 스레드 수
+
+    # Async (aiomysql) pool settings
+    ASYNC_DB_POOL_MIN_SIZE: int = 1
+    ASYNC_DB_POOL_MAX_SIZE: int = 10
+
+    # Auto checkout settings
+    AUTO_CHECKOUT_ENABLED: bool = True
+    AUTO_CHECKOUT_MINUTES: int = 180  # 입장 후 자동 퇴장까지의 시간
+    AUTO_CHECKOUT_INTERVAL_SECONDS: float = 60.0  # sweep 주기
+
+    # Member list count settings
+    MEMBER_COUNT_CACHE_SIZE: int = 256  # 필터 조합별 정확한 카운트 캐시 크기
+    MEMBER_COUNT_ESTIMATE_TTL_SECONDS: float = 300.0  # count=estimate 일 때 오래된 캐시 값을 허용하는 시간
+
+    # Prepared statement settings (회원 목록 필터 쿼리)
+    PREPARED_STATEMENTS_ENABLED: bool = True
+    PREPARED_STATEMENT_CACHE_SIZE: int = 64  # 연결당 유지할 prepared statement 수
+
+    # Typeahead index settings
+    MEMBER_INDEX_SYNC_SECONDS: float = 2.0  # 다른 워커의 회원 변경을 따라잡는 델타 동기화 주기
+
+    # Check-in live feed (SSE) settings
+    CHECKIN_FEED_BUFFER_SIZE: int = 500  # 재연결 시 다시 보내줄 최근 이벤트 수
+    CHECKIN_FEED_QUEUE_SIZE: int = 256  # 구독자별 미전송 이벤트 한도 (넘으면 연결을 끊어 재연결로 따라잡게 함)
+    CHECKIN_FEED_KEEPALIVE_SECONDS: float = 15.0
+
+    # Check-in partition / archive settings (checkin_archive.py)
+    CHECKIN_PARTITIONS_AHEAD: int = 3  # 미리 만들어 둘 미래 월 파티션 수
+    CHECKIN_ARCHIVE_AFTER_MONTHS: int = 24  # 이보다 오래된 월 파티션은 파일로 내보내고 삭제 (0 이면 아카이브 안 함)
+    CHECKIN_ARCHIVE_DIR: str = "archive/checkins"
+    CHECKIN_MAINTENANCE_INTERVAL_SECONDS: float = 86400.0  # 파티션 생성/아카이브 주기 (자동 퇴장 리더 워커)
+
+    # Attendance analytics settings (analytics.py)
+    ANALYTICS_BATCH_SIZE: int = 50000  # 서버측 커서에서 한 번에 받을 행 수
+    ANALYTICS_MAX_DAYS: int = 1830  # 분석 기간 상한 (약 5년)
+
+    # Member calendar settings
+    CALENDAR_CACHE_SIZE: int = 2048  # 닫힌 달/해 회원 달력 캐시 항목 수
+
+    # Locker inventory settings (locker_inventory.py)
+    LOCKER_COUNT: int = 100  # 락커 수 (번호 1 ~ LOCKER_COUNT)
+    LOCKER_ZONES: str = ""  # 구역 배치, 예: "남:1-60,여:61-100" (비우면 전부 A 구역)
+    LOCKER_BITMAP_TTL_SECONDS: float = 5.0  # 워커별 빈 락커 비트맵을 DB 에서 다시 읽는 주기
+    LOCKER_MAP_CACHE_SECONDS: float = 30.0  # 락커 배치도 캐시 (대여/회원 변경 시 즉시 무효화, 다른 워커 변경은 이만큼 늦을 수 있음)
+
+    # Expiry reminder settings (expiry_reminders.py)
+    EXPIRY_REMINDER_DAYS: str = "7,3,1,0"  # 만료 며칠 전에 알림을 만들지
+    EXPIRY_HORIZON_DAYS: int = 30  # 관리자 만료 예정 목록(upcoming_expiries)에 담는 기간
+    EXPIRY_SCAN_INTERVAL_SECONDS: float = 3600.0  # 만료 스캔 주기 (자동 퇴장 리더 워커, 같은 날 다시 돌려도 중복 없음)
+    EXPIRY_OUTBOX_BATCH_SIZE: int = 200  # outbox 에서 한 번에 전달할 알림 수
+    EXPIRY_OUTBOX_MAX_ATTEMPTS: int = 5  # 이만큼 실패하면 failed 로 두고 더 보내지 않음
+
+    # Deleted member bulk settings
+    DELETED_MEMBERS_BATCH_SIZE: int = 1000  # 전체 복원/영구 삭제 시 한 트랜잭션에서 처리할 회원 수
+
     # JWT settings
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
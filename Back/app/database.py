@@ -1,3 +1,8 @@
+import time
+import threading
+from collections import deque
+from functools import partial
+import anyio
 import pymysql
 from contextlib import contextmanager
 from .config import get_settings
@@ -16,21 +21,277 @@ def get_connection():
         cursorclass=pymysql.cursors.DictCursor
     )
 
+
+class PoolTimeoutError(Exception):
+    """풀에서 제한 시간 안에 연결을 얻지 못했을 때 발생합니다."""
+
+
+class PoolExhaustedError(PoolTimeoutError):
+    """대기열이 가득 차서 더 이상 대기할 수 없을 때 발생합니다."""
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "created_at", "last_used", "uses")
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+        self.uses = 0
+
+
+class ConnectionPool:
+    """
+    pymysql 연결 풀
+    - min_size/max_size: 유지할 최소 연결 수와 동시에 열 수 있는 최대 연결 수
+    - 대여 시 일정 시간(ping_interval) 이상 쉬었던 연결은 ping으로 상태 확인
+    - max_uses 회 사용했거나 recycle_seconds 가 지난 연결은 닫고 새로 생성
+    - 모든 연결이 사용 중이면 최대 max_waiters 개의 요청이 timeout 초 동안 대기
+    """
+
+    def __init__(
+        self,
+        connect=get_connection,
+        min_size: int = 2,
+        max_size: int = 10,
+        max_uses: int = 1000,
+        recycle_seconds: int = 3600,
+        timeout: float = 5.0,
+        max_waiters: int = 50,
+        ping_interval: float = 5.0,
+    ):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("풀 크기 설정이 올바르지 않습니다.")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.recycle_seconds = recycle_seconds
+        self.timeout = timeout
+        self.max_waiters = max_waiters
+        self.ping_interval = ping_interval
+
+        self._lock = threading.Condition()
+        self._idle = deque()
+        self._in_use = {}
+        self._opening = 0
+        self._waiting = 0
+        self._closed = False
+        self._counters = {
+            "acquired": 0,
+            "created": 0,
+            "recycled": 0,
+            "failed_checks": 0,
+            "timeouts": 0,
+            "rejected": 0,
+        }
+
+    # ---------- 내부 헬퍼 ----------
+    def _size(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _expired(self, entry: _PooledConnection) -> bool:
+        if self.max_uses and entry.uses >= self.max_uses:
+            return True
+        if self.recycle_seconds and time.monotonic() - entry.created_at >= self.recycle_seconds:
+            return True
+        return False
+
+    def _healthy(self, entry: _PooledConnection) -> bool:
+        if time.monotonic() - entry.last_used < self.ping_interval:
+            return True
+        try:
+            entry.conn.ping(reconnect=False)
+            return True
+        except Exception:
+            with self._lock:
+                self._counters["failed_checks"] += 1
+            return False
+
+    def _open(self) -> _PooledConnection:
+        """새 연결 생성 (호출 전에 _opening 을 올려 자리를 예약해야 함)"""
+        try:
+            entry = _PooledConnection(self._connect())
+        except Exception:
+            with self._lock:
+                self._opening -= 1
+                self._lock.notify()
+            raise
+        with self._lock:
+            self._opening -= 1
+            self._counters["created"] += 1
+        return entry
+
+    @staticmethod
+    def _close_quietly(entry: _PooledConnection):
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+    # ---------- 공개 API ----------
+    def warm(self):
+        """min_size 만큼 연결을 미리 생성합니다."""
+        while True:
+            with self._lock:
+                if self._closed or self._size() >= self.min_size:
+                    return
+                self._opening += 1
+            entry = self._open()
+            with self._lock:
+                self._idle.append(entry)
+                self._lock.notify()
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            entry = None
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("연결 풀이 종료되었습니다.")
+                while not self._idle and self._size() >= self.max_size:
+                    if self._waiting >= self.max_waiters:
+                        self._counters["rejected"] += 1
+                        raise PoolExhaustedError("DB 연결 대기열이 가득 찼습니다.")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["timeouts"] += 1
+                        raise PoolTimeoutError(f"{self.timeout}초 안에 DB 연결을 얻지 못했습니다.")
+                    self._waiting += 1
+                    try:
+                        self._lock.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._idle:
+                    entry = self._idle.pop()
+                    self._in_use[id(entry.conn)] = entry
+                else:
+                    self._opening += 1
+
+            if entry is None:
+                entry = self._open()
+                with self._lock:
+                    self._in_use[id(entry.conn)] = entry
+            elif self._expired(entry) or not self._healthy(entry):
+                with self._lock:
+                    del self._in_use[id(entry.conn)]
+                    self._counters["recycled"] += 1
+                    self._lock.notify()
+                self._close_quietly(entry)
+                continue
+
+            entry.uses += 1
+            with self._lock:
+                self._counters["acquired"] += 1
+            return entry.conn
+
+    def release(self, conn, discard: bool = False):
+        with self._lock:
+            entry = self._in_use.pop(id(conn), None)
+            if entry is None:
+                return
+            entry.last_used = time.monotonic()
+            keep = not (discard or self._closed or self._expired(entry))
+            if keep:
+                self._idle.append(entry)
+            elif not discard:
+                self._counters["recycled"] += 1
+            self._lock.notify()
+        if not keep:
+            self._close_quietly(entry)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._lock.notify_all()
+        for entry in idle:
+            self._close_quietly(entry)
+
+    def stats(self) -> dict:
+        """풀 상태 게이지/카운터"""
+        with self._lock:
+            return {
+                "size": self._size(),
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "waiting": self._waiting,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **{f"total_{k}": v for k, v in self._counters.items()},
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """애플리케이션 전역 연결 풀 (최초 호출 시 생성)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    min_size=settings.DB_POOL_MIN_SIZE,
+                    max_size=settings.DB_POOL_MAX_SIZE,
+                    max_uses=settings.DB_POOL_MAX_USES,
+                    recycle_seconds=settings.DB_POOL_RECYCLE_SECONDS,
+                    timeout=settings.DB_POOL_TIMEOUT,
+                    max_waiters=settings.DB_POOL_MAX_WAITERS,
+                    ping_interval=settings.DB_POOL_PING_INTERVAL,
+                )
+    return _pool
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
 @contextmanager
 def get_cursor():
-    """데이터베이스 커서를 컨텍스트 매니저로 제공합니다."""
-    conn = get_connection()
+    """데이터베이스 커서를 컨텍스트 매니저로 제공합니다. (연결은 풀에서 대여)"""
+    pool = get_pool()
+    conn = pool.acquire()
+    broken = False
     try:
         with conn.cursor() as cursor:
             yield cursor
         conn.commit()
     except Exception:
-        conn.rollback()
+        try:
+            conn.rollback()
+        except Exception:
+            broken = True
         raise
     finally:
-        conn.close()
+        pool.release(conn, discard=broken)
+
+_db_limiter = None
+
+def _get_db_limiter() -> anyio.CapacityLimiter:
+    global _db_limiter
+    if _db_limiter is None:
+        _db_limiter = anyio.CapacityLimiter(settings.DB_THREAD_POOL_SIZE)
+    return _db_limiter
+
+def _call_with_cursor(fn, args, kwargs):
+    with get_cursor() as cursor:
+        return fn(cursor, *args, **kwargs)
+
+async def run_db(fn, *args, **kwargs):
+    """
+    동기 repository/service 호출을 제한된 스레드 풀에서 실행합니다.
+    fn(cursor, *args, **kwargs) 형태로 호출되며, 커서 대여/커밋도 워커 스레드에서 처리됩니다.
+    """
+    return await anyio.to_thread.run_sync(
+        partial(_call_with_cursor, fn, args, kwargs),
+        limiter=_get_db_limiter()
+    )
 
-# FastAPI dependency
-async def get_db():
+# FastAPI dependency (동기 제너레이터이므로 FastAPI가 스레드 풀에서 실행)
+def get_db():
     with get_cursor() as cursor:
-        yield cursor
\ No newline at end of file
+        yield cursor
@@ -0,0 +1,172 @@
+"""
+만료 예정 스캔 + 알림 outbox
+- scan: 회원권/락커/회원복 만료일을 (is_active, *_end_date) 인덱스 범위로 읽어
+  오늘부터 EXPIRY_HORIZON_DAYS 일 안에 끝나는 항목을 upcoming_expiries 스냅샷에 다시 채우고,
+  EXPIRY_REMINDER_DAYS 기준(예: 7/3/1/0일 전)에 걸린 항목을 expiry_reminders outbox 에 넣습니다.
+  (회원, 종류, 만료일, 기준일수) 유니크 키로 몇 번을 다시 돌려도 같은 알림은 한 번만 쌓이고,
+  스캔이 며칠 밀렸으면 지금 남은 일수에 가장 가까운 기준 하나만 만듭니다.
+- drain: outbox 의 due 알림을 EXPIRY_OUTBOX_BATCH_SIZE 개씩 FOR UPDATE SKIP LOCKED 로 가져와 전달하고
+  sent / 재시도 / failed 로 표시합니다. 지금은 실제 발송 대신 로그로 남기는 로컬 소비자(log_delivery)이며,
+  SMS 등 실제 발송은 deliver 함수만 바꿔 끼우면 됩니다.
+- 만료일이 바뀌거나 회원이 삭제/비활성화되면 members 트리거가 스냅샷 행과 대기 중 알림을 지웁니다.
+  (migrations.setup_expiry_reminders)
+- 자동 퇴장 리더 워커가 EXPIRY_SCAN_INTERVAL_SECONDS 마다 scan, sweep 마다 drain 을 실행합니다.
+  관리자 화면은 upcoming_expiries / expiry_reminders 만 읽습니다. (ExpiryRepository)
+
+수동 실행: python -m app.expiry_reminders [--scan] [--drain]
+"""
+from typing import Callable, Dict, List
+from .config import get_settings
+
+settings = get_settings()
+
+# 종류 -> (만료일 컬럼, 종류 이름 컬럼, 락커 번호 식)
+EXPIRY_KINDS = {
+    "membership": ("membership_end_date", "membership_type", "NULL"),
+    "locker": ("locker_end_date", "locker_type", "locker_number"),
+    "uniform": ("uniform_end_date", "uniform_type", "NULL"),
+}
+
+KIND_LABELS = {"membership": "회원권", "locker": "락커", "uniform": "회원복"}
+
+SNAPSHOT_DELETE_SQL = "DELETE FROM upcoming_expiries WHERE kind = %s"
+
+SNAPSHOT_INSERT_SQL = """
+INSERT INTO upcoming_expiries (kind, member_id, end_date, name, phone_number, item_type, locker_number)
+SELECT %s, member_id, {end_col}, name, phone_number, {type_col}, {locker_expr}
+FROM members
+WHERE is_active = TRUE
+  AND {end_col} >= CURDATE() AND {end_col} <= CURDATE() + INTERVAL %s DAY
+"""
+
+REMINDER_INSERT_SQL = """
+INSERT IGNORE INTO expiry_reminders (member_id, kind, end_date, days_before, due_on, name, phone_number)
+SELECT member_id, kind, end_date, {threshold}, CURDATE(), name, phone_number
+FROM upcoming_expiries
+WHERE kind = %s AND end_date <= CURDATE() + INTERVAL %s DAY
+"""
+
+# 알리기 전에 만료일이 지나 버린 대기 알림은 보내지 않음
+EXPIRE_STALE_SQL = """
+UPDATE expiry_reminders SET status = 'cancelled'
+WHERE status = 'pending' AND end_date < CURDATE()
+"""
+
+PENDING_SQL = """
+SELECT id, member_id, kind, end_date, days_before, name, phone_number, attempts
+FROM expiry_reminders
+WHERE status = 'pending' AND due_on <= CURDATE()
+ORDER BY due_on, id
+LIMIT %s
+FOR UPDATE SKIP LOCKED
+"""
+
+MARK_SENT_SQL = """
+UPDATE expiry_reminders SET status = 'sent', sent_at = NOW(), attempts = attempts + 1
+WHERE id IN ({placeholders})
+"""
+
+# SET 은 왼쪽부터 적용되므로 status 는 증가한 attempts 로 판단
+MARK_RETRY_SQL = """
+UPDATE expiry_reminders
+SET attempts = attempts + 1, last_error = %s,
+    status = IF(attempts >= %s, 'failed', 'pending')
+WHERE id = %s
+"""
+
+
+def reminder_days() -> List[int]:
+    """EXPIRY_REMINDER_DAYS ("7,3,1,0") -> [0, 1, 3, 7]"""
+    days = sorted({int(part) for part in settings.EXPIRY_REMINDER_DAYS.split(",") if part.strip()})
+    if not days or days[0] < 0:
+        raise ValueError(f"잘못된 EXPIRY_REMINDER_DAYS: {settings.EXPIRY_REMINDER_DAYS!r}")
+    return days
+
+
+def _threshold_expr(days: List[int]) -> str:
+    """남은 일수 이상인 기준 중 가장 작은 값 (스캔이 밀렸으면 지난 기준은 건너뜀)"""
+    cases = "".join(f" WHEN DATEDIFF(end_date, CURDATE()) <= {d} THEN {d}" for d in days[:-1])
+    return f"CASE{cases} ELSE {days[-1]} END" if cases else str(days[-1])
+
+
+def scan(cursor) -> Dict[str, Dict[str, int]]:
+    """스냅샷 재계산 + due 알림 적재 (커밋까지) -> 종류별 {upcoming, queued}"""
+    days = reminder_days()
+    horizon = max(settings.EXPIRY_HORIZON_DAYS, days[-1])
+    threshold = _threshold_expr(days)
+    result = {}
+    for kind, (end_col, type_col, locker_expr) in EXPIRY_KINDS.items():
+        cursor.execute(SNAPSHOT_DELETE_SQL, (kind,))
+        upcoming = cursor.execute(
+            SNAPSHOT_INSERT_SQL.format(end_col=end_col, type_col=type_col, locker_expr=locker_expr),
+            (kind, horizon)
+        )
+        queued = cursor.execute(REMINDER_INSERT_SQL.format(threshold=threshold), (kind, days[-1]))
+        cursor.connection.commit()
+        result[kind] = {"upcoming": upcoming, "queued": queued}
+    return result
+
+
+def log_delivery(reminder: dict):
+    """로컬 소비자: 실제 발송 대신 로그로 남김"""
+    label = KIND_LABELS.get(reminder['kind'], reminder['kind'])
+    when = "오늘" if reminder['days_before'] == 0 else f"{reminder['days_before']}일 후"
+    print(f"📨 [만료 알림] {reminder['name']}({reminder['phone_number']}) {label} {when} 만료 ({reminder['end_date']})")
+
+
+def drain(cursor, deliver: Callable[[dict], None] = None, batch_size: int = None) -> Dict[str, int]:
+    """
+    due 알림을 배치로 전달 (배치마다 커밋) -> {sent, retried, cancelled}
+    전달에 실패한 배치가 있으면 이번 drain 은 거기서 멈추고 다음 주기에 다시 시도합니다.
+    """
+    deliver = deliver or log_delivery
+    batch_size = batch_size or settings.EXPIRY_OUTBOX_BATCH_SIZE
+    totals = {"sent": 0, "retried": 0, "cancelled": cursor.execute(EXPIRE_STALE_SQL)}
+    cursor.connection.commit()
+    while True:
+        cursor.execute(PENDING_SQL, (batch_size,))
+        rows = cursor.fetchall()
+        if not rows:
+            cursor.connection.commit()
+            break
+        sent, failed = [], []
+        for row in rows:
+            try:
+                deliver(row)
+                sent.append(row['id'])
+            except Exception as e:
+                failed.append((row['id'], str(e)[:255]))
+        if sent:
+            cursor.execute(MARK_SENT_SQL.format(placeholders=", ".join(["%s"] * len(sent))), sent)
+        for reminder_id, error in failed:
+            cursor.execute(MARK_RETRY_SQL, (error, settings.EXPIRY_OUTBOX_MAX_ATTEMPTS, reminder_id))
+        cursor.connection.commit()
+        totals["sent"] += len(sent)
+        totals["retried"] += len(failed)
+        if failed or len(rows) < batch_size:
+            break
+    return totals
+
+
+if __name__ == "__main__":
+    import argparse
+    from .database import get_connection
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scan", action="store_true", help="만료 예정 스캔만")
+    parser.add_argument("--drain", action="store_true", help="outbox 전달만")
+    args = parser.parse_args()
+    run_scan = args.scan or not args.drain
+    run_drain = args.drain or not args.scan
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            if run_scan:
+                for kind, counts in scan(cursor).items():
+                    print(f"✅ {KIND_LABELS[kind]}: 만료 예정 {counts['upcoming']}건, 알림 적재 {counts['queued']}건")
+            if run_drain:
+                totals = drain(cursor)
+                print(f"✅ 알림 전달 {totals['sent']}건, 재시도 대기 {totals['retried']}건, 취소 {totals['cancelled']}건")
+    finally:
+        conn.close()
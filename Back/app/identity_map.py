@@ -0,0 +1,52 @@
+"""
+요청 단위 identity map
+같은 요청(= 같은 커서) 안에서 members / checkins 행을 한 번만 읽도록 캐시합니다.
+- 조회: load(table, key, loader) 는 처음 한 번만 loader() 로 DB를 읽고 이후에는 캐시된 행을 돌려줍니다.
+- 쓰기: repository/service 는 UPDATE 후 patch() 로 캐시된 행을 갱신하거나 discard() 로 무효화합니다.
+커서마다 하나씩 만들어지며(get_cursor() 가 요청마다 새 커서를 만듦), 커서가 사라지면 함께 정리됩니다.
+"""
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class IdentityMap:
+    def __init__(self):
+        self._rows: Dict[tuple, Optional[dict]] = {}
+
+    def load(self, table: str, key: Hashable, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        row = self._rows.get((table, key), _MISSING)
+        if row is _MISSING:
+            row = loader()
+            self._rows[(table, key)] = row
+        return row
+
+    def put(self, table: str, key: Hashable, row: Optional[dict]):
+        self._rows[(table, key)] = row
+
+    def patch(self, table: str, key: Hashable, changes: Dict[str, Any]):
+        """캐시된 행이 있으면 변경된 컬럼만 반영합니다."""
+        row = self._rows.get((table, key))
+        if row:
+            row.update(changes)
+
+    def discard(self, table: str, key: Hashable):
+        self._rows.pop((table, key), None)
+
+    def clear(self):
+        self._rows.clear()
+
+
+_maps = weakref.WeakKeyDictionary()
+_maps_lock = threading.Lock()
+
+
+def identity_map(cursor) -> IdentityMap:
+    """커서에 연결된 identity map (없으면 생성)"""
+    with _maps_lock:
+        imap = _maps.get(cursor)
+        if imap is None:
+            imap = _maps[cursor] = IdentityMap()
+        return imap
@@ -0,0 +1,251 @@
+"""
+락커 재고 / 배정
+- lockers 테이블(락커 번호 PK, 구역, 사용 회원, 만료일)이 락커 점유의 기준입니다. (migrations.setup_lockers)
+  members.locker_number 가 바뀌면 members 트리거 -> sp_locker_assign 이 같은 문장 안에서 lockers 를 맞추고,
+  이미 다른 회원이 쓰는(만료 전) 락커로 바꾸려 하면 에러(SIGNAL)로 막습니다.
+- 자동 배정(claim)은 빈 락커 한 행을 SELECT ... FOR UPDATE SKIP LOCKED 로 잠급니다.
+  잠금은 호출한 쪽 트랜잭션이 커밋/롤백할 때까지 유지되므로, 동시에 가입하는 회원들은 서로 다른 락커를 받습니다.
+- 빈 락커 비트맵은 워커 프로세스마다 메모리에 두는 힌트입니다. 빈 락커 목록 응답과 claim 의 첫 후보에 쓰고,
+  LOCKER_BITMAP_TTL_SECONDS 마다(또는 invalidate() 후) DB 에서 다시 읽습니다. 배정의 정답은 항상 DB 입니다.
+- 락커 배치도(locker_map)는 락커 전체를 members 와 PK 조인하는 한 번의 쿼리로 만들고 LOCKER_MAP_CACHE_SECONDS 동안
+  캐시합니다. 대여 생성/연장/반납, 회원 생성/수정/삭제/복원 경로가 커밋 후 invalidate() 로 비웁니다.
+"""
+import threading
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from .config import get_settings
+from .utils.http_cache import make_etag
+
+settings = get_settings()
+
+DEFAULT_ZONE = "A"
+LOCKER_TAKEN_ERROR = 1644  # sp_locker_assign 의 SIGNAL (ER_SIGNAL_EXCEPTION)
+CLAIM_PROBES = 3  # 비트맵 후보를 DB 에서 확인해 볼 최대 개수 (넘으면 DB 가 고른 빈 락커)
+EXPIRING_DAYS = 7  # 만료까지 이 일수 이하면 배치도에서 expiring (회원권 '곧 만료' 기준과 같음)
+LOCKER_STATES = ("available", "occupied", "expiring", "expired")
+
+# 빈 락커: 사용 회원이 없거나 대여가 만료됨
+FREE_CONDITION = "(member_id IS NULL OR expires_on < CURDATE())"
+
+FREE_LOCKERS_SQL = f"""
+SELECT locker_number, zone, {FREE_CONDITION} AS is_free
+FROM lockers
+ORDER BY locker_number
+"""
+
+CLAIM_ONE_SQL = f"""
+SELECT locker_number FROM lockers
+WHERE locker_number = %s AND {FREE_CONDITION}
+FOR UPDATE SKIP LOCKED
+"""
+
+CLAIM_ANY_SQL = f"""
+SELECT locker_number FROM lockers
+WHERE {FREE_CONDITION} AND (%s IS NULL OR zone = %s)
+ORDER BY locker_number
+LIMIT 1
+FOR UPDATE SKIP LOCKED
+"""
+
+# 배치도: lockers 전체(PK 순서) + 사용 회원 PK 조인
+LOCKER_MAP_SQL = """
+SELECT l.locker_number, l.zone, l.member_id, l.expires_on,
+       DATEDIFF(l.expires_on, CURDATE()) AS days_left,
+       m.name, m.locker_type, m.locker_start_date
+FROM lockers l
+LEFT JOIN members m ON m.member_id = l.member_id
+ORDER BY l.locker_number
+"""
+
+
+def locker_state(member_id: Optional[int], days_left: Optional[int]) -> str:
+    if member_id is None:
+        return "available"
+    if days_left is None:
+        return "occupied"
+    if days_left < 0:
+        return "expired"
+    return "expiring" if days_left <= EXPIRING_DAYS else "occupied"
+
+
+def locker_layout(count: int = None, zones: str = None) -> List[Tuple[int, str]]:
+    """
+    LOCKER_COUNT / LOCKER_ZONES -> [(락커 번호, 구역)]
+    zones 예: "남:1-60,여:61-100" (구역에 속하지 않는 번호는 DEFAULT_ZONE)
+    """
+    count = settings.LOCKER_COUNT if count is None else count
+    zones = settings.LOCKER_ZONES if zones is None else zones
+    layout = {number: DEFAULT_ZONE for number in range(1, count + 1)}
+    for part in filter(None, (p.strip() for p in zones.split(","))):
+        name, _, numbers = part.rpartition(":")
+        first, _, last = numbers.partition("-")
+        if not name or not first.strip().isdigit() or not (last or first).strip().isdigit():
+            raise ValueError(f"잘못된 LOCKER_ZONES 항목: {part!r}")
+        for number in range(int(first), int(last or first) + 1):
+            if number in layout:
+                layout[number] = name.strip()
+    return sorted(layout.items())
+
+
+def is_locker_taken(error: Exception) -> bool:
+    """다른 회원이 쓰는 락커 번호를 저장하려다 트리거에서 막힌 에러인지"""
+    return bool(getattr(error, "args", None)) and error.args[0] == LOCKER_TAKEN_ERROR
+
+
+class LockerInventory:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._free = bytearray()          # 인덱스 = 락커 번호, 1 이면 빈 락커
+        self._zones: Dict[int, str] = {}  # 락커 번호 -> 구역
+        self._loaded_at = 0.0
+        self._map: Optional[Tuple[date, float, Dict, str]] = None  # (기준일, 적재 시각, 배치도, ETag)
+        self._generation = 0  # invalidate() 마다 증가 -> 읽는 도중 무효화된 배치도는 캐시하지 않음
+        self._counters = {"claims": 0, "stale_hints": 0, "exhausted": 0, "refreshes": 0, "map_loads": 0}
+
+    # ==================== 비트맵 ====================
+    def refresh(self, cursor):
+        cursor.execute(FREE_LOCKERS_SQL)
+        self._load_bitmap([(row['locker_number'], row['zone'], bool(row['is_free'])) for row in cursor.fetchall()])
+
+    def _load_bitmap(self, lockers: List[Tuple[int, str, bool]]):
+        """[(락커 번호, 구역, 비었는지)] 로 비트맵 교체"""
+        free = bytearray(max((number for number, _, _ in lockers), default=0) + 1)
+        zones = {}
+        for number, zone, is_free in lockers:
+            free[number] = 1 if is_free else 0
+            zones[number] = zone
+        with self._lock:
+            self._free, self._zones = free, zones
+            self._loaded_at = time.monotonic()
+            self._counters["refreshes"] += 1
+
+    def _ensure(self, cursor):
+        if time.monotonic() - self._loaded_at >= settings.LOCKER_BITMAP_TTL_SECONDS:
+            self.refresh(cursor)
+
+    def invalidate(self):
+        """락커 점유가 바뀐 쓰기 경로에서 커밋 후 호출 -> 다음 조회 때 DB 에서 다시 읽음"""
+        with self._lock:
+            self._loaded_at = 0.0
+            self._map = None
+            self._generation += 1
+
+    def _mark(self, number: int, free: bool):
+        with self._lock:
+            if number < len(self._free):
+                self._free[number] = 1 if free else 0
+
+    def _free_numbers(self, zone: Optional[str]) -> List[int]:
+        with self._lock:
+            return [
+                number for number, zone_name in self._zones.items()
+                if self._free[number] and (zone is None or zone_name == zone)
+            ]
+
+    # ==================== 조회 / 배정 ====================
+    def free_numbers(self, cursor, zone: Optional[str] = None) -> List[int]:
+        """빈 락커 번호 (비트맵 기준, 최대 TTL 만큼 늦을 수 있음)"""
+        self._ensure(cursor)
+        return sorted(self._free_numbers(zone))
+
+    def zone_summary(self, cursor) -> Dict[str, Dict[str, int]]:
+        """구역별 전체/빈 락커 수"""
+        self._ensure(cursor)
+        with self._lock:
+            summary: Dict[str, Dict[str, int]] = {}
+            for number, zone in self._zones.items():
+                entry = summary.setdefault(zone, {"total": 0, "available": 0})
+                entry["total"] += 1
+                entry["available"] += self._free[number]
+            return summary
+
+    def total(self, cursor) -> int:
+        self._ensure(cursor)
+        with self._lock:
+            return len(self._zones)
+
+    def claim(self, cursor, zone: Optional[str] = None) -> Optional[int]:
+        """
+        빈 락커 하나를 잠그고 번호를 돌려줍니다. 없으면 None
+        호출한 쪽은 같은 트랜잭션에서 members.locker_number 를 이 번호로 저장하고 커밋해야 합니다.
+        (커밋 전까지 다른 트랜잭션의 claim 은 이 행을 건너뜀)
+        """
+        self._ensure(cursor)
+        for number in self._free_numbers(zone)[:CLAIM_PROBES]:
+            cursor.execute(CLAIM_ONE_SQL, (number,))
+            self._mark(number, False)
+            if cursor.fetchone():
+                self._count("claims")
+                return number
+            # 다른 워커가 이미 가져갔거나 잠금 중
+            self._count("stale_hints")
+
+        cursor.execute(CLAIM_ANY_SQL, (zone, zone))
+        row = cursor.fetchone()
+        if row is None:
+            self._count("exhausted")
+            return None
+        self._mark(row['locker_number'], False)
+        self._count("claims")
+        return row['locker_number']
+
+    # ==================== 배치도 ====================
+    def locker_map(self, cursor) -> Tuple[Dict, str]:
+        """락커 전체의 상태 / 사용 회원 / 대여 종류 / 만료까지 남은 일수 -> (배치도, ETag)"""
+        today = date.today()
+        with self._lock:
+            cached, generation = self._map, self._generation
+        if cached and cached[0] == today and time.monotonic() - cached[1] < settings.LOCKER_MAP_CACHE_SECONDS:
+            return cached[2], cached[3]
+
+        cursor.execute(LOCKER_MAP_SQL)
+        rows = cursor.fetchall()
+        lockers = []
+        counts = {state: 0 for state in LOCKER_STATES}
+        zones: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            days_left = None if row['days_left'] is None else int(row['days_left'])
+            state = locker_state(row['member_id'], days_left)
+            counts[state] += 1
+            zone = zones.setdefault(row['zone'], {"total": 0, **{s: 0 for s in LOCKER_STATES}})
+            zone["total"] += 1
+            zone[state] += 1
+            occupied = row['member_id'] is not None
+            lockers.append({
+                "locker_number": row['locker_number'],
+                "zone": row['zone'],
+                "state": state,
+                "member_id": row['member_id'],
+                "name": row['name'] if occupied else None,
+                "rental_type": row['locker_type'] if occupied else None,
+                "start_date": row['locker_start_date'] if occupied else None,
+                "end_date": row['expires_on'],
+                "days_left": days_left,
+            })
+        # 같은 행으로 비트맵도 새로 맞춤 (expired 는 다시 배정 가능)
+        self._load_bitmap([(l["locker_number"], l["zone"], l["state"] in ("available", "expired")) for l in lockers])
+
+        payload = {"date": today, "total": len(lockers), "counts": counts, "zones": zones, "lockers": lockers}
+        etag = make_etag(payload)
+        with self._lock:
+            if generation == self._generation:
+                self._map = (today, time.monotonic(), payload, etag)
+            self._counters["map_loads"] += 1
+        return payload, etag
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "lockers": len(self._zones),
+                "available": sum(self._free[number] for number in self._zones),
+                "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+                **{f"total_{k}": v for k, v in self._counters.items()},
+            }
+
+
+locker_inventory = LockerInventory()
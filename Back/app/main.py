@@ -1,12 +1,45 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .config import get_settings
 from .routers import kiosk, admin, members, rentals, checkin, deleted_members
-from .database import get_connection
+from .database import get_pool, close_pool
+from .async_database import init_async_pool, close_async_pool, async_pool_stats
+from .auto_checkout import auto_checkout_engine
+from .database import get_cursor
+from .member_index import member_index
+from .prepared import prepared_statements
+from .checkin_feed import checkin_feed
 
 # 설정 로드
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 연결 풀 예열 (DB가 아직 준비되지 않았어도 서버는 기동)
+    try:
+        get_pool().warm()
+    except Exception as e:
+        print(f"⚠️ DB 연결 풀 예열 실패: {e}")
+    try:
+        await init_async_pool()
+    except Exception as e:
+        print(f"⚠️ 비동기 DB 연결 풀 생성 실패: {e}")
+    # 자동완성 인덱스 예열 (실패하면 첫 조회 때 적재)
+    try:
+        with get_cursor() as cursor:
+            member_index.warm(cursor)
+    except Exception as e:
+        print(f"⚠️ 자동완성 인덱스 적재 실패: {e}")
+    if settings.AUTO_CHECKOUT_ENABLED:
+        auto_checkout_engine.start()
+    yield
+    auto_checkout_engine.stop()
+    await close_async_pool()
+    close_pool()
+
+
 # 애플리케이션 생성
 app = FastAPI(
     title="GYM Management System",
@@ -14,7 +47,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url=f"{settings.API_PREFIX}/docs",
     redoc_url=f"{settings.API_PREFIX}/redoc",
-    openapi_url=f"{settings.API_PREFIX}/openapi.json"
+    openapi_url=f"{settings.API_PREFIX}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -41,4 +75,10 @@ async def root():
         "status": "running",
         "message": "GYM Management System API",
         "version": "1.0.0"
-    }
\ No newline at end of file
+    }
+
+# DB 연결 풀 게이지
+@app.get(f"{settings.API_PREFIX}/health/db-pool")
+async def db_pool_stats():
+    return {"sync": get_pool().stats(), "async": async_pool_stats(), "member_index": member_index.stats(),
+            "prepared_statements": prepared_statements.stats(), "checkin_feed": checkin_feed.stats()}
@@ -0,0 +1,226 @@
+"""
+관리자 검색창 자동완성(typeahead)용 메모리 인덱스
+활성 회원의 이름 / 초성 / 전화번호를 정렬된 키 목록으로 들고 있다가 bisect 로 접두어를 찾습니다.
+- "ㄱㅁㅅ" -> 김민수 (초성), "김ㅁ" -> 김민수 (완성형 + 초성 혼합), "김민" / "민수" -> 이름(또는 성을 뺀 이름) 접두어
+- 숫자 -> 전화번호 접두어 / 가운데 4자리 / 뒷 4자리
+앱 기동 시 warm() 으로 채우고, MemberRepository / AdminService / DeletedMemberRepository 의
+생성·수정·삭제·복원 경로에서 refresh() 로 즉시 반영합니다.
+다른 워커 프로세스의 변경은 members.updated_at 델타 동기화(sync)로 따라잡습니다.
+"""
+import bisect
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from .config import get_settings
+
+settings = get_settings()
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_BASE = 0xAC00
+_HANGUL_COUNT = 11172
+
+INDEX_COLUMNS = "member_id, name, phone_number, gender, membership_end_date, is_active"
+
+
+def choseong_of(ch: str) -> str:
+    code = ord(ch) - _HANGUL_BASE
+    if 0 <= code < _HANGUL_COUNT:
+        return CHOSEONG[code // 588]
+    return ch
+
+
+def to_choseong(text: str) -> str:
+    return "".join(choseong_of(ch) for ch in text)
+
+
+def _normalize(text: Optional[str]) -> str:
+    return "".join((text or "").split()).lower()
+
+
+def _phone_keys(phone: Optional[str]) -> List[str]:
+    digits = "".join(ch for ch in (phone or "") if ch.isdigit())
+    if not digits:
+        return []
+    keys = {digits, digits[-4:]}
+    if len(digits) > 7:
+        keys.add(digits[3:])  # 010 뒤 가운데 자리부터
+    return sorted(keys)
+
+
+def _name_keys(name: str) -> List[str]:
+    """공백 없는 이름 + (한글 세 글자 이상이면) 성을 뺀 이름 -> "민수" 로도 김민수를 찾음"""
+    if not name:
+        return []
+    keys = [name]
+    if len(name) >= 3 and choseong_of(name[0]) != name[0]:
+        keys.append(name[1:])
+    return keys
+
+
+def _matches(name: str, query: str) -> bool:
+    """query 의 각 글자가 완성형이면 같은 글자, 초성이면 그 초성으로 시작하는 글자와 대응"""
+    if len(name) < len(query):
+        return False
+    for n, q in zip(name, query):
+        if q in CHOSEONG:
+            if choseong_of(n) != q:
+                return False
+        elif n != q:
+            return False
+    return True
+
+
+class MemberTypeaheadIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._members: Dict[int, dict] = {}
+        self._names: List[Tuple[str, int]] = []      # (공백 없는 이름, member_id)
+        self._choseong: List[Tuple[str, int]] = []   # (이름 초성, member_id)
+        self._phones: List[Tuple[str, int]] = []     # (전화번호 키, member_id)
+        self._synced_at = None  # 마지막 동기화 기준 DB 시각
+        self._checked_at = 0.0
+        self.ready = False
+
+    # ==================== 적재 / 동기화 ====================
+    def warm(self, cursor):
+        cursor.execute("SELECT NOW(3) AS now")
+        now = cursor.fetchone()['now']
+        cursor.execute(f"SELECT {INDEX_COLUMNS} FROM members WHERE is_active = TRUE")
+        rows = cursor.fetchall()
+        with self._lock:
+            self._members.clear()
+            self._names, self._choseong, self._phones = [], [], []
+            for row in rows:
+                self._add(row, sort=False)
+            self._names.sort()
+            self._choseong.sort()
+            self._phones.sort()
+            self._synced_at = now
+            self._checked_at = time.monotonic()
+            self.ready = True
+        print(f"✅ [자동완성 인덱스] 활성 회원 {len(rows)}명 적재 완료")
+
+    def sync(self, cursor, force: bool = False):
+        """updated_at 이 마지막 동기화 이후인 회원만 다시 읽어 반영 (다른 워커의 변경 포함)"""
+        if not self.ready:
+            self.warm(cursor)
+            return
+        if not force and time.monotonic() - self._checked_at < settings.MEMBER_INDEX_SYNC_SECONDS:
+            return
+        cursor.execute("SELECT NOW(3) AS now")
+        now = cursor.fetchone()['now']
+        cursor.execute(
+            f"SELECT {INDEX_COLUMNS} FROM members WHERE updated_at >= %s",
+            (self._synced_at,)
+        )
+        rows = cursor.fetchall()
+        with self._lock:
+            for row in rows:
+                self._apply(row)
+            self._synced_at = now
+            self._checked_at = time.monotonic()
+
+    def refresh(self, cursor, member_id: int):
+        """한 회원의 현재 상태를 DB 에서 읽어 반영 (쓰기 경로에서 커밋 후 호출)"""
+        if not self.ready:
+            return
+        cursor.execute(f"SELECT {INDEX_COLUMNS} FROM members WHERE member_id = %s", (member_id,))
+        row = cursor.fetchone()
+        with self._lock:
+            if row:
+                self._apply(row)
+            else:
+                self._remove(member_id)
+
+    # ==================== 내부 갱신 ====================
+    def _apply(self, row: dict):
+        self._remove(row['member_id'])
+        if row.get('is_active'):
+            self._add(row)
+
+    def _add(self, row: dict, sort: bool = True):
+        member_id = row['member_id']
+        name = _normalize(row.get('name'))
+        entry = {
+            'member_id': member_id,
+            'name': row.get('name'),
+            'phone_number': row.get('phone_number'),
+            'gender': row.get('gender'),
+            'membership_end_date': str(row['membership_end_date']) if row.get('membership_end_date') else None,
+            '_keys': (_name_keys(name), _phone_keys(row.get('phone_number'))),
+        }
+        self._members[member_id] = entry
+        insert = bisect.insort if sort else (lambda lst, item: lst.append(item))
+        for key in entry['_keys'][0]:
+            insert(self._names, (key, member_id))
+            insert(self._choseong, (to_choseong(key), member_id))
+        for key in entry['_keys'][1]:
+            insert(self._phones, (key, member_id))
+
+    def _remove(self, member_id: int):
+        entry = self._members.pop(member_id, None)
+        if not entry:
+            return
+        name_keys, phone_keys = entry['_keys']
+        for key in name_keys:
+            self._discard(self._names, (key, member_id))
+            self._discard(self._choseong, (to_choseong(key), member_id))
+        for key in phone_keys:
+            self._discard(self._phones, (key, member_id))
+
+    @staticmethod
+    def _discard(keys: List[Tuple[str, int]], item: Tuple[str, int]):
+        i = bisect.bisect_left(keys, item)
+        if i < len(keys) and keys[i] == item:
+            del keys[i]
+
+    # ==================== 조회 ====================
+    @staticmethod
+    def _prefix(keys: List[Tuple[str, int]], prefix: str):
+        i = bisect.bisect_left(keys, (prefix, -1))
+        while i < len(keys) and keys[i][0].startswith(prefix):
+            yield keys[i]
+            i += 1
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        q = _normalize(query)
+        if not q:
+            return []
+        found: List[int] = []
+        seen = set()
+
+        def collect(member_id: int) -> bool:
+            if member_id not in seen:
+                seen.add(member_id)
+                found.append(member_id)
+            return len(found) >= limit
+
+        with self._lock:
+            digits = q.replace("-", "")
+            if digits.isdigit():
+                for _, member_id in self._prefix(self._phones, digits):
+                    if collect(member_id):
+                        break
+            elif any(ch in CHOSEONG for ch in q):
+                # 초성이 섞인 검색어: 초성 접두어로 후보를 좁힌 뒤 글자별로 확인
+                for _, member_id in self._prefix(self._choseong, to_choseong(q)):
+                    name_keys = self._members[member_id]['_keys'][0]
+                    if any(_matches(key, q) for key in name_keys) and collect(member_id):
+                        break
+            else:
+                for _, member_id in self._prefix(self._names, q):
+                    if collect(member_id):
+                        break
+            results = []
+            for member_id in found:
+                entry = self._members[member_id]
+                results.append({k: v for k, v in entry.items() if k != '_keys'})
+        results.sort(key=lambda m: (m['name'] or '', m['member_id']))
+        return results
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"ready": self.ready, "members": len(self._members)}
+
+
+member_index = MemberTypeaheadIndex()
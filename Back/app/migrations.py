@@ -0,0 +1,1181 @@
+"""
+스키마 마이그레이션 (생성 컬럼/인덱스 추가)
+auto_delete_triggers.setup_all() 에서 호출되며, 여러 번 실행해도 안전하도록
+information_schema 로 존재 여부를 확인한 뒤 변경합니다.
+"""
+from .database import get_connection
+from .utils.date_utils import parse_membership_type
+
+
+def _column_exists(cursor, table: str, column: str) -> bool:
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """,
+        (table, column)
+    )
+    return cursor.fetchone() is not None
+
+
+def _index_exists(cursor, table: str, index: str) -> bool:
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        LIMIT 1
+        """,
+        (table, index)
+    )
+    return cursor.fetchone() is not None
+
+
+def add_phone_last4_columns():
+    """키오스크 뒷자리 검색용 phone_last4 생성 컬럼 (인덱스는 setup_member_tombstones 의 idx_members_phone_state)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            if not _column_exists(cursor, "members", "phone_last4"):
+                cursor.execute("""
+                ALTER TABLE members
+                ADD COLUMN phone_last4 CHAR(4)
+                    GENERATED ALWAYS AS (RIGHT(phone_number, 4)) STORED
+                """)
+            conn.commit()
+            print("✅ phone_last4 생성 컬럼 추가 완료")
+    except Exception as e:
+        print(f"❌ phone_last4 컬럼 추가 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# checkins 인덱스 계획 (이 모듈이 소유). 조회는 모두 checkin_time 반열린 구간 [시작, 끝) 으로 작성합니다.
+# - idx_checkins_checkin_time: 오늘/기간별 출입 기록 (CheckinRepository / MemberRepository / AdminService 의 today 조회)
+# - idx_checkins_member_time : 회원별 월간 기록, 회원별 최근 기록
+# - idx_checkins_open        : 자동 퇴장 sweep (checkout_time IS NULL AND checkin_time <= 기한)
+# - idx_checkins_open_member : 열린 세션만 값을 갖는 open_member_id 가상 컬럼 (MySQL 에 없는 부분 인덱스 대용)
+CHECKIN_INDEXES = {
+    "idx_checkins_checkin_time": "(checkin_time)",
+    "idx_checkins_member_time": "(member_id, checkin_time)",
+    "idx_checkins_open": "(checkout_time, checkin_time)",
+    "idx_checkins_open_member": "(open_member_id, checkin_time)",
+}
+
+
+def add_checkin_indexes():
+    """checkins 인덱스 생성 (CHECKIN_INDEXES) + 열린 세션 부분 인덱스용 open_member_id 가상 컬럼"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            if not _column_exists(cursor, "checkins", "open_member_id"):
+                cursor.execute("""
+                ALTER TABLE checkins
+                ADD COLUMN open_member_id INT
+                    GENERATED ALWAYS AS (IF(checkout_time IS NULL, member_id, NULL)) VIRTUAL
+                """)
+            for name, columns in CHECKIN_INDEXES.items():
+                if not _index_exists(cursor, "checkins", name):
+                    cursor.execute(f"ALTER TABLE checkins ADD INDEX {name} {columns}")
+            conn.commit()
+            print(f"✅ checkins 인덱스 {len(CHECKIN_INDEXES)}개 확인/추가 완료")
+    except Exception as e:
+        print(f"❌ checkins 인덱스 추가 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def drop_per_checkin_events():
+    """예전 체크인마다 만들던 auto_checkout_checkin_* 일회성 EVENT 정리"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT EVENT_NAME FROM information_schema.EVENTS
+                WHERE EVENT_SCHEMA = DATABASE() AND EVENT_NAME LIKE %s
+                """,
+                ("auto\\_checkout\\_checkin\\_%",)
+            )
+            names = [row['EVENT_NAME'] for row in cursor.fetchall()]
+            for name in names:
+                cursor.execute(f"DROP EVENT IF EXISTS `{name}`")
+            conn.commit()
+            print(f"✅ per-checkin 자동 퇴장 EVENT {len(names)}개 제거 완료")
+    except Exception as e:
+        print(f"❌ per-checkin EVENT 제거 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+LAST_CHECKIN_BACKFILL_SQL = """
+UPDATE members m
+JOIN (
+    SELECT c.member_id, MAX(c.checkin_time) AS last_checkin_time
+    FROM checkins c
+    GROUP BY c.member_id
+) latest ON latest.member_id = m.member_id
+JOIN checkins c ON c.member_id = latest.member_id AND c.checkin_time = latest.last_checkin_time
+SET m.last_checkin_time = c.checkin_time,
+    m.last_checkout_time = c.checkout_time
+"""
+
+
+def add_last_checkin_projection():
+    """
+    회원 목록용 마지막 방문 투영 컬럼 members.last_checkin_time / last_checkout_time
+    - 처음 추가할 때 checkins 를 한 번의 그룹 조인으로 채웁니다.
+    - 이후에는 입장/퇴장/자동 퇴장 경로가 함께 갱신합니다.
+    - (is_active, last_checkin_time) 인덱스로 recent_checkin 정렬을 filesort 없이 처리합니다.
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            backfill = False
+            for column in ("last_checkin_time", "last_checkout_time"):
+                if not _column_exists(cursor, "members", column):
+                    cursor.execute(f"ALTER TABLE members ADD COLUMN {column} DATETIME NULL")
+                    backfill = True
+            if not _index_exists(cursor, "members", "idx_members_active_last_checkin"):
+                cursor.execute(
+                    "ALTER TABLE members ADD INDEX idx_members_active_last_checkin (is_active, last_checkin_time)"
+                )
+            if backfill:
+                cursor.execute(LAST_CHECKIN_BACKFILL_SQL)
+            conn.commit()
+            print("✅ members 마지막 방문 투영 컬럼 및 인덱스 추가 완료")
+    except Exception as e:
+        print(f"❌ 마지막 방문 투영 컬럼 추가 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def add_member_updated_at():
+    """members.updated_at (행이 바뀔 때마다 자동 갱신) + 인덱스 - 자동완성 인덱스 델타 동기화용"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            if not _column_exists(cursor, "members", "updated_at"):
+                cursor.execute("""
+                ALTER TABLE members
+                ADD COLUMN updated_at DATETIME(3) NOT NULL
+                    DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3)
+                """)
+            if not _index_exists(cursor, "members", "idx_members_updated_at"):
+                cursor.execute("ALTER TABLE members ADD INDEX idx_members_updated_at (updated_at)")
+            conn.commit()
+            print("✅ members.updated_at 컬럼 및 인덱스 추가 완료")
+    except Exception as e:
+        print(f"❌ members.updated_at 컬럼 추가 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# 소프트 삭제 툼스톤: members.deleted_at (삭제 시 is_active = FALSE 와 함께 설정, 복원 시 NULL)
+# 예전에는 행 전체를 deleted_members 테이블로 복사했지만 이제 members 한 테이블만 씁니다.
+# MySQL 은 부분 인덱스가 없으므로 deleted_at 을 인덱스 뒤쪽 키로 둡니다. (활성 행은 deleted_at IS NULL 구간)
+# - idx_members_phone_state: 키오스크 뒷자리 조회가 활성/휴면/없음을 인덱스 한 번으로 판단 (MemberRepository.probe_phone_tail)
+# - idx_members_deleted_at : 삭제 회원 목록(deleted_at DESC), 전체 복원/영구 삭제 배치, 30일 자동 영구 삭제
+MEMBER_TOMBSTONE_INDEXES = {
+    "idx_members_phone_state": "(phone_last4, deleted_at)",
+    "idx_members_deleted_at": "(deleted_at)",
+}
+
+# 예전 deleted_members 테이블의 컬럼 (호환 뷰도 같은 컬럼 + phone_last4 / search_text)
+DELETED_MEMBER_COLUMNS = [
+    "member_id", "member_rank", "name", "phone_number", "gender",
+    "membership_type", "membership_start_date", "membership_end_date",
+    "locker_number", "locker_type", "locker_start_date", "locker_end_date",
+    "uniform_type", "uniform_start_date", "uniform_end_date",
+    "created_at",
+]
+
+# 예전 deleted_members 행을 툼스톤으로 옮김: members 에 남아 있는 행은 표시만, 사라진 행은 다시 만듦
+TOMBSTONE_BACKFILL_SQL = [
+    """
+    UPDATE members m
+    JOIN deleted_members d ON d.member_id = m.member_id
+    SET m.is_active = FALSE, m.deleted_at = COALESCE(d.deleted_at, NOW())
+    """,
+    f"""
+    INSERT INTO members ({", ".join(DELETED_MEMBER_COLUMNS)}, is_active, deleted_at)
+    SELECT {", ".join(f"d.{col}" for col in DELETED_MEMBER_COLUMNS)}, FALSE, COALESCE(d.deleted_at, NOW())
+    FROM deleted_members d
+    LEFT JOIN members m ON m.member_id = d.member_id
+    WHERE m.member_id IS NULL
+    """,
+]
+
+DELETED_MEMBERS_VIEW_SQL = f"""
+CREATE OR REPLACE VIEW deleted_members AS
+SELECT {", ".join(DELETED_MEMBER_COLUMNS)}, deleted_at, phone_last4, search_text
+FROM members
+WHERE deleted_at IS NOT NULL
+"""
+
+
+def _table_type(cursor, table: str):
+    cursor.execute(
+        """
+        SELECT TABLE_TYPE FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (table,)
+    )
+    row = cursor.fetchone()
+    return row['TABLE_TYPE'] if row else None
+
+
+def setup_member_tombstones():
+    """
+    members.deleted_at 툼스톤 + 인덱스, deleted_members 호환 뷰
+    - 예전 deleted_members 테이블이 있으면 행을 툼스톤으로 옮기고 deleted_members_legacy 로 이름을 바꿔 보관합니다.
+    - 뷰는 기존 화면/리포트 호환용이고, 앱은 members 를 직접 읽습니다. (utils/member_query.MEMBER_TABLES)
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            if not _column_exists(cursor, "members", "deleted_at"):
+                cursor.execute("ALTER TABLE members ADD COLUMN deleted_at DATETIME NULL DEFAULT NULL")
+            for name, columns in MEMBER_TOMBSTONE_INDEXES.items():
+                if not _index_exists(cursor, "members", name):
+                    cursor.execute(f"ALTER TABLE members ADD INDEX {name} {columns}")
+            # (phone_last4) 단독 인덱스는 idx_members_phone_state 의 앞부분과 같음
+            if _index_exists(cursor, "members", "idx_members_phone_last4"):
+                cursor.execute("ALTER TABLE members DROP INDEX idx_members_phone_last4")
+
+            migrated = 0
+            if _table_type(cursor, "deleted_members") == "BASE TABLE":
+                for sql in TOMBSTONE_BACKFILL_SQL:
+                    cursor.execute(sql)
+                cursor.execute("SELECT COUNT(*) AS total FROM deleted_members")
+                migrated = cursor.fetchone()['total']
+                conn.commit()
+                cursor.execute("DROP TABLE IF EXISTS deleted_members_legacy")
+                cursor.execute("RENAME TABLE deleted_members TO deleted_members_legacy")
+            cursor.execute(DELETED_MEMBERS_VIEW_SQL)
+            conn.commit()
+            if migrated:
+                print(f"✅ deleted_members {migrated}행을 members.deleted_at 툼스톤으로 이전 (원본: deleted_members_legacy)")
+            print("✅ members.deleted_at 툼스톤 및 deleted_members 호환 뷰 설정 완료")
+    except Exception as e:
+        print(f"❌ 툼스톤 소프트 삭제 설정 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# 검색용 생성 컬럼: 공백 없는 이름 + 숫자만 남긴 전화번호 (utils/search.py 와 같은 정규화)
+SEARCH_TEXT_EXPR = (
+    "CONCAT_WS(' ', REPLACE(name, ' ', ''), REPLACE(REPLACE(phone_number, '-', ''), ' ', ''))"
+)
+
+
+def add_member_search_index():
+    """이름/전화번호 부분 검색용 search_text 생성 컬럼 + ngram FULLTEXT 인덱스 (삭제 회원 목록도 같은 인덱스 사용)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            # 영문 불용어가 포함된 ngram 토큰이 빠지지 않도록 인덱스 생성 시 불용어 목록을 끔
+            cursor.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+            if not _column_exists(cursor, "members", "search_text"):
+                cursor.execute(f"""
+                ALTER TABLE members
+                ADD COLUMN search_text VARCHAR(160)
+                    GENERATED ALWAYS AS ({SEARCH_TEXT_EXPR}) STORED
+                """)
+            if not _index_exists(cursor, "members", "ft_members_search"):
+                cursor.execute("ALTER TABLE members ADD FULLTEXT INDEX ft_members_search (search_text) WITH PARSER ngram")
+            conn.commit()
+            print("✅ search_text 생성 컬럼 및 ngram FULLTEXT 인덱스 추가 완료")
+    except Exception as e:
+        print(f"❌ 검색 인덱스 추가 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# 회원 목록 카운트용 증분 카운터 (활성 회원 기준)
+# facet 이름 -> 행 조건 ({r} 자리에 NEW / OLD / 테이블 별칭이 들어감)
+MEMBER_FACETS = {
+    "active": "{r}.is_active = TRUE",
+    "gender:M": "{r}.is_active = TRUE AND {r}.gender = 'M'",
+    "gender:F": "{r}.is_active = TRUE AND {r}.gender = 'F'",
+    "locker": "{r}.is_active = TRUE AND {r}.locker_type IS NOT NULL",
+    "uniform": "{r}.is_active = TRUE AND {r}.uniform_type IS NOT NULL",
+    "pt": "{r}.is_active = TRUE AND {r}.membership_type LIKE 'PT%'",
+    "membership": "{r}.is_active = TRUE AND {r}.membership_type NOT LIKE 'PT%' AND {r}.membership_type IS NOT NULL",
+    # 한 번이라도 방문한 활성 회원 (첫 입장 때만 바뀜). 관리자 목록의 퇴장 개수 = visited - 입장 중(active_sessions)
+    "visited": "{r}.is_active = TRUE AND {r}.last_checkin_time IS NOT NULL",
+}
+
+# 이 컬럼들이 바뀌면 목록 필터 결과가 달라질 수 있으므로 _version 을 올려 캐시된 카운트를 무효화
+# 입장/퇴장 컬럼은 넣지 않습니다. 입장/퇴장마다 _version 한 행을 갱신하면 가장 바쁜 쓰기 경로가 그 행에서 줄을 서고
+# (다건 자동 퇴장 sweep 과 교착 가능), 캐시도 매번 버려집니다. 입장 상태 필터가 걸린 카운트는
+# active_sessions 로 세거나 active_sessions 기준 버전으로 캐시합니다. (MemberCountRepository)
+MEMBER_FILTER_COLUMNS = (
+    "is_active", "name", "phone_number", "gender", "membership_type", "membership_end_date",
+    "locker_type", "uniform_type",
+)
+
+# 위 컬럼 외에 카운터 갱신이 필요한 변화: 첫 방문 (visited facet)
+MEMBER_FILTER_EXPRS = (
+    "({r}.last_checkin_time IS NULL)",
+)
+
+
+def _facet(name: str, row: str) -> str:
+    return "IFNULL(" + MEMBER_FACETS[name].replace("{r}", row) + ", 0)"
+
+
+def _member_counts_trigger_sql(event: str) -> str:
+    """members INSERT/UPDATE/DELETE 시 facet 카운터와 만료일 카운터를 증감하는 트리거"""
+    if event == "INSERT":
+        deltas = {name: _facet(name, "NEW") for name in MEMBER_FACETS}
+    elif event == "DELETE":
+        deltas = {name: f"-{_facet(name, 'OLD')}" for name in MEMBER_FACETS}
+    else:
+        deltas = {name: f"{_facet(name, 'NEW')} - {_facet(name, 'OLD')}" for name in MEMBER_FACETS}
+
+    rows = "\n            UNION ALL ".join(
+        ["SELECT '_version' AS facet, 1 AS delta"]
+        + [f"SELECT '{name}', {delta}" for name, delta in deltas.items()]
+    )
+    body = f"""
+        INSERT INTO member_facet_counts (facet, value)
+        SELECT d.facet, d.delta FROM (
+            {rows}
+        ) d
+        WHERE d.delta <> 0
+        ON DUPLICATE KEY UPDATE value = value + VALUES(value);"""
+
+    end_date_old = """
+        IF OLD.is_active = TRUE AND OLD.membership_end_date IS NOT NULL THEN
+            INSERT INTO member_end_date_counts (end_date, value) VALUES (OLD.membership_end_date, -1)
+            ON DUPLICATE KEY UPDATE value = value - 1;
+        END IF;"""
+    end_date_new = """
+        IF NEW.is_active = TRUE AND NEW.membership_end_date IS NOT NULL THEN
+            INSERT INTO member_end_date_counts (end_date, value) VALUES (NEW.membership_end_date, 1)
+            ON DUPLICATE KEY UPDATE value = value + 1;
+        END IF;"""
+
+    if event == "INSERT":
+        body += end_date_new
+    elif event == "DELETE":
+        body += end_date_old
+    else:
+        unchanged = " AND ".join(
+            [f"OLD.{col} <=> NEW.{col}" for col in MEMBER_FILTER_COLUMNS]
+            + [f"{expr.replace('{r}', 'OLD')} <=> {expr.replace('{r}', 'NEW')}" for expr in MEMBER_FILTER_EXPRS]
+        )
+        body = f"""
+        IF NOT ({unchanged}) THEN{body}
+            IF NOT (OLD.is_active <=> NEW.is_active AND OLD.membership_end_date <=> NEW.membership_end_date) THEN{end_date_old}{end_date_new}
+            END IF;
+        END IF;"""
+
+    return f"""
+    CREATE TRIGGER members_counts_after_{event.lower()}
+    AFTER {event} ON members
+    FOR EACH ROW
+    BEGIN{body}
+    END
+    """
+
+
+def rebuild_member_counts(cursor):
+    """members 전체를 한 번 집계해 facet / 만료일 카운터를 다시 채웁니다. (커밋은 호출자가)"""
+    sums = ",\n".join(f"SUM({_facet(name, 'm')}) AS `{name}`" for name in MEMBER_FACETS)
+    cursor.execute(f"SELECT {sums} FROM members m")
+    totals = cursor.fetchone() or {}
+    cursor.execute("DELETE FROM member_facet_counts WHERE facet <> '_version'")
+    cursor.executemany(
+        "INSERT INTO member_facet_counts (facet, value) VALUES (%s, %s)",
+        [(name, int(totals.get(name) or 0)) for name in MEMBER_FACETS]
+    )
+    cursor.execute(
+        """
+        INSERT INTO member_facet_counts (facet, value) VALUES ('_version', 1)
+        ON DUPLICATE KEY UPDATE value = value + 1
+        """
+    )
+    cursor.execute("DELETE FROM member_end_date_counts")
+    cursor.execute(
+        """
+        INSERT INTO member_end_date_counts (end_date, value)
+        SELECT membership_end_date, COUNT(*) FROM members
+        WHERE is_active = TRUE AND membership_end_date IS NOT NULL
+        GROUP BY membership_end_date
+        """
+    )
+
+
+def setup_member_counts():
+    """회원 목록 카운트용 카운터 테이블 + members 트리거 생성 후 전체 재집계"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS member_facet_counts (
+                    facet VARCHAR(40) PRIMARY KEY,
+                    value BIGINT NOT NULL DEFAULT 0
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS member_end_date_counts (
+                    end_date DATE PRIMARY KEY,
+                    value INT NOT NULL DEFAULT 0
+                )
+                """
+            )
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS members_counts_after_{event.lower()}")
+                cursor.execute(_member_counts_trigger_sql(event))
+            rebuild_member_counts(cursor)
+            conn.commit()
+            print("✅ 회원 카운터 테이블 및 트리거 생성 완료 (member_facet_counts, member_end_date_counts)")
+    except Exception as e:
+        print(f"❌ 회원 카운터 설정 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# 회원권/대여(락커·회원복) 카탈로그: (kind, name, sort_rank) - 기간(개월)은 utils.date_utils 규칙으로 계산
+# 대여 종류는 '3개월(하체)' 처럼 접미어가 붙을 수 있어 이름 접두어로 매칭합니다.
+MEMBERSHIP_CATALOG = [
+    ("membership", "PT(1개월)", 1), ("membership", "PT(3개월)", 2),
+    ("membership", "PT(6개월)", 3), ("membership", "PT(1년)", 4),
+    ("membership", "1개월", 5), ("membership", "3개월", 6),
+    ("membership", "6개월", 7), ("membership", "1년", 8),
+    ("rental", "1개월", 1), ("rental", "3개월", 2), ("rental", "6개월", 3),
+    ("rental", "12개월", 4), ("rental", "1년", 4),
+]
+UNKNOWN_RANK = 99  # 카탈로그에 없는 종류 / 미사용은 맨 뒤
+
+# members.membership_status: 0 만료일 없음, 1 활성, 2 곧 만료(7일 이내), 3 만료
+# 날짜가 지나면 값이 바뀌므로 쓰기 시점(트리거) + 매일 자정(refresh_member_status 이벤트, 자동 퇴장 리더)에 다시 계산합니다.
+MEMBER_STATUS_EXPR = """CASE
+        WHEN {r}.membership_end_date IS NULL THEN 0
+        WHEN {r}.membership_end_date < CURDATE() THEN 3
+        WHEN {r}.membership_end_date <= DATE_ADD(CURDATE(), INTERVAL 7 DAY) THEN 2
+        ELSE 1
+    END"""
+
+MEMBER_RANK_COLUMNS = {
+    # 순위 컬럼 -> (카탈로그 kind, 원본 컬럼)
+    "membership_rank": ("membership", "membership_type"),
+    "locker_rank": ("rental", "locker_type"),
+    "uniform_rank": ("rental", "uniform_type"),
+}
+
+
+def _rank_expr(column: str, row: str) -> str:
+    kind, source = MEMBER_RANK_COLUMNS[column]
+    if kind == "membership":
+        match = f"c.name = {row}.{source}"
+    else:
+        match = f"{row}.{source} LIKE CONCAT(c.name, '%')"
+    return f"""IFNULL((
+            SELECT c.sort_rank FROM membership_catalog c
+            WHERE c.kind = '{kind}' AND {match}
+            ORDER BY CHAR_LENGTH(c.name) DESC LIMIT 1
+        ), {UNKNOWN_RANK})"""
+
+
+def _member_ranks_trigger_sql(event: str) -> str:
+    """members 쓰기 시 상태/정렬 순위 컬럼을 다시 계산하는 BEFORE 트리거"""
+    sets = [f"SET NEW.membership_status = {MEMBER_STATUS_EXPR.replace('{r}', 'NEW')};"]
+    sets += [f"SET NEW.{column} = {_rank_expr(column, 'NEW')};" for column in MEMBER_RANK_COLUMNS]
+    body = "\n    ".join(sets)
+    return f"""
+CREATE TRIGGER members_ranks_before_{event.lower()}
+BEFORE {event} ON members
+FOR EACH ROW
+BEGIN
+    {body}
+END
+"""
+
+
+def rebuild_member_ranks(cursor):
+    """카탈로그 순위를 바꾼 뒤 등, 모든 회원의 상태/순위 컬럼을 다시 계산"""
+    sets = [f"m.membership_status = {MEMBER_STATUS_EXPR.replace('{r}', 'm')}"]
+    sets += [f"m.{column} = {_rank_expr(column, 'm')}" for column in MEMBER_RANK_COLUMNS]
+    cursor.execute("UPDATE members m SET " + ",\n    ".join(sets))
+
+
+def refresh_member_status(cursor) -> int:
+    """날짜가 바뀌어 상태가 달라진 회원만 갱신 (refresh_member_status 이벤트와 같은 SQL, AutoCheckoutEngine 이 매일 실행)"""
+    status = MEMBER_STATUS_EXPR.replace('{r}', 'members')
+    return cursor.execute(
+        f"UPDATE members SET membership_status = {status} WHERE NOT (membership_status <=> {status})"
+    )
+
+
+def setup_membership_catalog():
+    """
+    회원권/대여 카탈로그 + members 상태/정렬 순위 컬럼
+    - membership_catalog: 종류별 정렬 순위와 기간(개월). 이미 있는 행은 덮어쓰지 않습니다.
+    - members.membership_status / membership_rank / locker_rank / uniform_rank: BEFORE 트리거가 쓰기마다 계산
+    - (is_active, 순위) / (is_active, membership_status, membership_end_date) 인덱스로
+      종류 정렬과 status_filter 를 CASE/LIKE 식과 filesort 없이 처리합니다. (utils/member_query.py)
+    - 매일 자정 refresh_member_status 이벤트가 날짜 경과로 바뀐 상태를 다시 계산합니다.
+      이벤트 스케줄러가 꺼져 있어도 자동 퇴장 리더(AutoCheckoutEngine.run_status_refresh)가 하루 한 번 같은 갱신을 합니다.
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS membership_catalog (
+                    kind VARCHAR(20) NOT NULL,
+                    name VARCHAR(50) NOT NULL,
+                    sort_rank SMALLINT NOT NULL,
+                    duration_months SMALLINT NOT NULL,
+                    PRIMARY KEY (kind, name)
+                )
+                """
+            )
+            cursor.executemany(
+                """
+                INSERT IGNORE INTO membership_catalog (kind, name, sort_rank, duration_months)
+                VALUES (%s, %s, %s, %s)
+                """,
+                [(kind, name, rank, parse_membership_type(name)) for kind, name, rank in MEMBERSHIP_CATALOG]
+            )
+
+            if not _column_exists(cursor, "members", "membership_status"):
+                cursor.execute("ALTER TABLE members ADD COLUMN membership_status TINYINT NOT NULL DEFAULT 0")
+            for column in MEMBER_RANK_COLUMNS:
+                if not _column_exists(cursor, "members", column):
+                    cursor.execute(
+                        f"ALTER TABLE members ADD COLUMN {column} SMALLINT NOT NULL DEFAULT {UNKNOWN_RANK}"
+                    )
+
+            for event in ("INSERT", "UPDATE"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS members_ranks_before_{event.lower()}")
+                cursor.execute(_member_ranks_trigger_sql(event))
+            rebuild_member_ranks(cursor)
+
+            indexes = {
+                "idx_members_active_status": "(is_active, membership_status, membership_end_date)",
+                **{f"idx_members_active_{column}": f"(is_active, {column})" for column in MEMBER_RANK_COLUMNS},
+            }
+            for name, columns in indexes.items():
+                if not _index_exists(cursor, "members", name):
+                    cursor.execute(f"ALTER TABLE members ADD INDEX {name} {columns}")
+
+            status = MEMBER_STATUS_EXPR.replace('{r}', 'members')
+            cursor.execute("DROP EVENT IF EXISTS refresh_member_status")
+            cursor.execute(f"""
+            CREATE EVENT refresh_member_status
+            ON SCHEDULE EVERY 1 DAY
+            STARTS (CURRENT_DATE + INTERVAL 1 DAY + INTERVAL 5 SECOND)
+            DO
+                UPDATE members SET membership_status = {status}
+                WHERE NOT (membership_status <=> {status})
+            """)
+            conn.commit()
+            print("✅ 회원권 카탈로그 및 members 상태/정렬 순위 컬럼 설정 완료")
+    except Exception as e:
+        print(f"❌ 회원권 카탈로그 설정 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# 지금 입장 중인 세션 (회원당 최대 1행). checkins 트리거가 같은 문장 안에서 갱신하므로
+# 입장/퇴장/자동 퇴장(sweeper)/과거 체크인 즉시 퇴장 어느 경로든 checkins 와 원자적으로 맞춰집니다.
+ACTIVE_SESSION_TRIGGERS = {
+    "checkins_sessions_after_insert": """
+CREATE TRIGGER checkins_sessions_after_insert
+AFTER INSERT ON checkins
+FOR EACH ROW
+BEGIN
+    IF NEW.checkout_time IS NULL THEN
+        INSERT INTO active_sessions (member_id, checkin_id, checkin_time)
+        VALUES (NEW.member_id, NEW.id, NEW.checkin_time);
+    END IF;
+END
+""",
+    "checkins_sessions_after_update": """
+CREATE TRIGGER checkins_sessions_after_update
+AFTER UPDATE ON checkins
+FOR EACH ROW
+BEGIN
+    IF OLD.checkout_time IS NULL AND NEW.checkout_time IS NOT NULL THEN
+        DELETE FROM active_sessions WHERE checkin_id = NEW.id;
+    END IF;
+END
+""",
+    "checkins_sessions_after_delete": """
+CREATE TRIGGER checkins_sessions_after_delete
+AFTER DELETE ON checkins
+FOR EACH ROW
+BEGIN
+    DELETE FROM active_sessions WHERE checkin_id = OLD.id;
+END
+""",
+    "members_sessions_after_delete": """
+CREATE TRIGGER members_sessions_after_delete
+AFTER DELETE ON members
+FOR EACH ROW
+BEGIN
+    DELETE FROM active_sessions WHERE member_id = OLD.member_id;
+END
+""",
+}
+
+# 열린 checkins 중 회원별 가장 최근 기록으로 다시 채움 (idx_checkins_open_member 만 읽음)
+ACTIVE_SESSIONS_REBUILD_SQL = """
+INSERT IGNORE INTO active_sessions (member_id, checkin_id, checkin_time)
+SELECT c.member_id, c.id, c.checkin_time
+FROM checkins c
+JOIN (
+    SELECT open_member_id AS member_id, MAX(checkin_time) AS checkin_time
+    FROM checkins
+    WHERE open_member_id IS NOT NULL
+    GROUP BY open_member_id
+) latest ON latest.member_id = c.open_member_id AND latest.checkin_time = c.checkin_time
+"""
+
+
+def setup_active_sessions():
+    """
+    active_sessions: 지금 입장 중인 회원 (member_id PK -> 회원당 열린 세션 1개를 DB 가 보장)
+    - 현재 인원/입장 중 필터/중복 입장 검사가 checkins 이력 대신 이 테이블(O(입장 인원))을 읽습니다.
+    - checkins / members 트리거가 유지하고, 설정할 때 열린 checkins 로 다시 채웁니다.
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS active_sessions (
+                    member_id INT PRIMARY KEY,
+                    checkin_id BIGINT NOT NULL,
+                    checkin_time DATETIME NOT NULL,
+                    UNIQUE KEY uq_active_sessions_checkin (checkin_id),
+                    KEY idx_active_sessions_checkin_time (checkin_time)
+                )
+                """
+            )
+            for name, sql in ACTIVE_SESSION_TRIGGERS.items():
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(sql)
+            cursor.execute("DELETE FROM active_sessions")
+            cursor.execute(ACTIVE_SESSIONS_REBUILD_SQL)
+            conn.commit()
+            print("✅ active_sessions 테이블 및 트리거 설정 완료 (현재 입장 인원)")
+    except Exception as e:
+        print(f"❌ active_sessions 설정 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# 출석 롤업: 시간/일/회원-월 단위 방문 수, 종료된 세션 수, 세션 시간 합
+# 방문은 입장 시각의 구간에, 세션 시간은 퇴장이 기록될 때 같은 (입장 시각) 구간에 더합니다.
+# checkins 트리거 -> sp_attendance_apply 로 입장/퇴장/자동 퇴장/과거 체크인 어느 경로든 같은 문장 안에서 반영되고,
+# DROP PARTITION(아카이브)은 트리거를 타지 않으므로 아카이브된 월의 통계도 그대로 남습니다.
+ATTENDANCE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS attendance_hourly (
+        hour_start DATETIME PRIMARY KEY,
+        visits INT NOT NULL DEFAULT 0,
+        sessions_closed INT NOT NULL DEFAULT 0,
+        duration_seconds BIGINT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance_daily (
+        day DATE PRIMARY KEY,
+        visits INT NOT NULL DEFAULT 0,
+        sessions_closed INT NOT NULL DEFAULT 0,
+        duration_seconds BIGINT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance_member_monthly (
+        member_id INT NOT NULL,
+        month DATE NOT NULL,
+        visits INT NOT NULL DEFAULT 0,
+        sessions_closed INT NOT NULL DEFAULT 0,
+        duration_seconds BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (member_id, month),
+        KEY idx_attendance_member_monthly_month (month)
+    )
+    """,
+]
+
+# (버킷 테이블, 키 컬럼, 키 식) - 프로시저와 재구성 쿼리가 같은 정의를 씁니다. t 는 입장 시각
+ATTENDANCE_ROLLUPS = [
+    ("attendance_hourly", "hour_start", "DATE_FORMAT({t}, '%Y-%m-%d %H:00:00')"),
+    ("attendance_daily", "day", "DATE({t})"),
+    ("attendance_member_monthly", "member_id, month", "{m}, DATE_FORMAT({t}, '%Y-%m-01')"),
+]
+
+_ROLLUP_UPSERT_SQL = """
+    INSERT INTO {table} ({key}, visits, sessions_closed, duration_seconds)
+    VALUES ({key_expr}, p_sign, v_closed, v_seconds)
+    ON DUPLICATE KEY UPDATE
+        visits = visits + VALUES(visits),
+        sessions_closed = sessions_closed + VALUES(sessions_closed),
+        duration_seconds = duration_seconds + VALUES(duration_seconds);"""
+
+# p_sign = 1 이면 기록을 더하고, -1 이면 뺌 (수정/삭제 시 이전 값을 되돌림)
+ATTENDANCE_APPLY_PROCEDURE_SQL = """
+CREATE PROCEDURE sp_attendance_apply(IN p_member_id INT, IN p_checkin DATETIME, IN p_checkout DATETIME, IN p_sign INT)
+BEGIN
+    DECLARE v_closed INT DEFAULT IF(p_checkout IS NULL, 0, p_sign);
+    DECLARE v_seconds BIGINT DEFAULT IF(p_checkout IS NULL, 0,
+        p_sign * GREATEST(TIMESTAMPDIFF(SECOND, p_checkin, p_checkout), 0));
+""" + "".join(
+    _ROLLUP_UPSERT_SQL.format(table=table, key=key, key_expr=expr.format(t="p_checkin", m="p_member_id"))
+    for table, key, expr in ATTENDANCE_ROLLUPS
+) + """
+END
+"""
+
+# 파티션 전환(checkin_archive.partition_table)으로 없어진 ON DELETE CASCADE FK 대신 쓰는 트리거.
+# 진짜 FK cascade 는 checkins 트리거를 실행하지 않으므로, 이 트리거로 지울 때도 세션 변수를 걸어
+# checkins_rollups_after_delete 가 건너뛰게 합니다. -> 파티션 여부와 상관없이 영구 삭제된 회원의 출석은
+# 롤업에 남습니다. (해당 기간을 rebuild_attendance_rollups 로 다시 계산하면 그때 빠짐)
+CHECKINS_CASCADE_VAR = "@checkins_member_cascade"
+
+MEMBER_CHECKINS_CASCADE_TRIGGER_SQL = f"""
+CREATE TRIGGER members_checkins_after_delete
+AFTER DELETE ON members
+FOR EACH ROW
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        SET {CHECKINS_CASCADE_VAR} = NULL;
+        RESIGNAL;
+    END;
+    SET {CHECKINS_CASCADE_VAR} = 1;
+    DELETE FROM checkins WHERE member_id = OLD.member_id;
+    SET {CHECKINS_CASCADE_VAR} = NULL;
+END
+"""
+
+ATTENDANCE_TRIGGERS = {
+    "checkins_rollups_after_insert": """
+CREATE TRIGGER checkins_rollups_after_insert
+AFTER INSERT ON checkins
+FOR EACH ROW
+CALL sp_attendance_apply(NEW.member_id, NEW.checkin_time, NEW.checkout_time, 1)
+""",
+    "checkins_rollups_after_update": """
+CREATE TRIGGER checkins_rollups_after_update
+AFTER UPDATE ON checkins
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.member_id <=> NEW.member_id AND OLD.checkin_time <=> NEW.checkin_time
+            AND OLD.checkout_time <=> NEW.checkout_time) THEN
+        CALL sp_attendance_apply(OLD.member_id, OLD.checkin_time, OLD.checkout_time, -1);
+        CALL sp_attendance_apply(NEW.member_id, NEW.checkin_time, NEW.checkout_time, 1);
+    END IF;
+END
+""",
+    # 회원 영구 삭제로 따라 지워지는 기록은 롤업에서 빼지 않음 (아래 MEMBER_CHECKINS_CASCADE_TRIGGER_SQL)
+    "checkins_rollups_after_delete": f"""
+CREATE TRIGGER checkins_rollups_after_delete
+AFTER DELETE ON checkins
+FOR EACH ROW
+BEGIN
+    IF {CHECKINS_CASCADE_VAR} IS NULL THEN
+        CALL sp_attendance_apply(OLD.member_id, OLD.checkin_time, OLD.checkout_time, -1);
+    END IF;
+END
+""",
+}
+
+_ROLLUP_REBUILD_SQL = """
+INSERT INTO {table} ({key}, visits, sessions_closed, duration_seconds)
+SELECT {key_expr}, COUNT(*), COUNT(checkout_time),
+       COALESCE(SUM(GREATEST(TIMESTAMPDIFF(SECOND, checkin_time, checkout_time), 0)), 0)
+FROM checkins
+WHERE checkin_time >= %s
+GROUP BY {key_expr}
+"""
+
+
+def rebuild_attendance_rollups(cursor, since=None):
+    """
+    since(월 1일로 내림) 이후의 롤업을 checkins 로 다시 계산합니다. (커밋은 호출하는 쪽에서)
+    since 가 없으면 DB 에 남아 있는 가장 오래된 월부터 -> 아카이브되어 checkins 에 없는 월의 롤업은 그대로 둡니다.
+    """
+    if since is None:
+        cursor.execute("SELECT MIN(checkin_time) AS oldest FROM checkins")
+        oldest = cursor.fetchone()['oldest']
+        if oldest is None:
+            return
+        since = oldest
+    since = since.replace(day=1)
+    since = since.date() if hasattr(since, "date") else since
+    for table, key, expr in ATTENDANCE_ROLLUPS:
+        column = key.split(", ")[-1]
+        cursor.execute(f"DELETE FROM {table} WHERE {column} >= %s", (since,))
+        key_expr = expr.format(t="checkin_time", m="member_id").replace("%", "%%")
+        cursor.execute(_ROLLUP_REBUILD_SQL.format(table=table, key=key, key_expr=key_expr), (since,))
+
+
+def setup_attendance_rollups():
+    """출석 롤업 테이블 + 갱신 프로시저/트리거 생성, 처음 만들 때는 checkins 로 채움"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SHOW TABLES LIKE 'attendance_daily'")
+            first_setup = cursor.fetchone() is None
+            for sql in ATTENDANCE_TABLES:
+                cursor.execute(sql)
+            cursor.execute("DROP PROCEDURE IF EXISTS sp_attendance_apply")
+            cursor.execute(ATTENDANCE_APPLY_PROCEDURE_SQL)
+            for name, sql in ATTENDANCE_TRIGGERS.items():
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(sql)
+            # 이미 파티션된 DB 의 cascade 트리거도 세션 변수를 거는 버전으로 교체
+            cursor.execute("SHOW TRIGGERS WHERE `Trigger` = 'members_checkins_after_delete'")
+            if cursor.fetchone():
+                cursor.execute("DROP TRIGGER members_checkins_after_delete")
+                cursor.execute(MEMBER_CHECKINS_CASCADE_TRIGGER_SQL)
+            if first_setup:
+                rebuild_attendance_rollups(cursor)
+            conn.commit()
+            print("✅ 출석 롤업 테이블 및 트리거 설정 완료 (시간/일/회원-월)")
+    except Exception as e:
+        print(f"❌ 출석 롤업 설정 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+KIOSK_CHECKIN_PROCEDURE_SQL = """
+CREATE PROCEDURE sp_kiosk_checkin(IN p_member_id INT)
+BEGIN
+    DECLARE v_found INT DEFAULT 1;
+    DECLARE v_name VARCHAR(100);
+    DECLARE v_end DATE;
+    DECLARE v_deleted_at DATETIME;
+    DECLARE v_now DATETIME;
+    DECLARE v_result VARCHAR(20);
+    DECLARE v_checkin_id BIGINT;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_found = 0;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+    SELECT name, membership_end_date, deleted_at INTO v_name, v_end, v_deleted_at
+    FROM members WHERE member_id = p_member_id
+    FOR UPDATE;
+
+    IF v_found = 0 THEN
+        SET v_result = 'not_found';
+    ELSEIF v_deleted_at IS NOT NULL THEN
+        SET v_result = 'deleted';
+    ELSEIF v_end IS NOT NULL AND v_end < CURDATE() THEN
+        SET v_result = 'expired';
+    ELSEIF EXISTS (SELECT 1 FROM active_sessions WHERE member_id = p_member_id) THEN
+        SET v_result = 'already_checked_in';
+    ELSE
+        SET v_now = NOW();
+        INSERT INTO checkins (member_id, checkin_time) VALUES (p_member_id, v_now);
+        SET v_checkin_id = LAST_INSERT_ID();
+        UPDATE members
+        SET checkin_time = v_now, checkout_time = NULL,
+            last_checkin_time = v_now, last_checkout_time = NULL
+        WHERE member_id = p_member_id;
+        SET v_result = 'success';
+    END IF;
+    COMMIT;
+
+    SELECT v_result AS result, v_name AS name, v_end AS membership_end_date, v_now AS checkin_time,
+           v_checkin_id AS checkin_id;
+END
+"""
+
+
+def create_kiosk_checkin_procedure():
+    """키오스크 입장 검증+기록을 한 번의 CALL 로 처리하는 sp_kiosk_checkin 생성"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP PROCEDURE IF EXISTS sp_kiosk_checkin")
+            cursor.execute(KIOSK_CHECKIN_PROCEDURE_SQL)
+            conn.commit()
+            print("✅ sp_kiosk_checkin 프로시저 생성 완료")
+    except Exception as e:
+        print(f"❌ sp_kiosk_checkin 프로시저 생성 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# 락커 재고: 락커마다 1행, 사용 회원은 회원당 1개 (uq_lockers_member)
+LOCKERS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS lockers (
+    locker_number INT PRIMARY KEY,
+    zone VARCHAR(20) NOT NULL,
+    member_id INT NULL,
+    expires_on DATE NULL,
+    claimed_at DATETIME NULL,
+    UNIQUE KEY uq_lockers_member (member_id),
+    KEY idx_lockers_zone (zone, locker_number)
+)
+"""
+
+# 회원에게 락커를 붙임 (members 트리거에서 호출). 회원이 쓰던 다른 락커는 놓고,
+# 대상 락커가 비었거나 / 본인 것이거나 / 대여가 만료됐으면 가져옵니다.
+# 다른 회원이 쓰는 중이면 p_strict 일 때 에러, 아니면(복원 등) 그대로 둡니다. 재고에 없는 번호는 무시합니다.
+LOCKER_ASSIGN_PROCEDURE_SQL = """
+CREATE PROCEDURE sp_locker_assign(IN p_member_id INT, IN p_locker INT, IN p_expires DATE, IN p_strict BOOLEAN)
+BEGIN
+    DECLARE v_exists INT DEFAULT 0;
+    DECLARE v_holder INT;
+    DECLARE v_expires DATE;
+
+    UPDATE lockers SET member_id = NULL, expires_on = NULL, claimed_at = NULL
+    WHERE member_id = p_member_id AND locker_number <> p_locker;
+
+    SELECT COUNT(*), MAX(member_id), MAX(expires_on) INTO v_exists, v_holder, v_expires
+    FROM lockers WHERE locker_number = p_locker
+    FOR UPDATE;
+
+    IF v_exists > 0 AND (v_holder IS NULL OR v_holder = p_member_id OR v_expires < CURDATE()) THEN
+        UPDATE lockers
+        SET member_id = p_member_id, expires_on = p_expires,
+            claimed_at = IF(v_holder <=> p_member_id, claimed_at, NOW())
+        WHERE locker_number = p_locker;
+    ELSEIF v_exists > 0 AND p_strict THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = '이미 사용 중인 락커입니다.';
+    END IF;
+END
+"""
+
+LOCKER_TRIGGERS = {
+    "members_lockers_after_insert": """
+CREATE TRIGGER members_lockers_after_insert
+AFTER INSERT ON members
+FOR EACH ROW
+BEGIN
+    IF NEW.is_active AND NEW.locker_number IS NOT NULL THEN
+        CALL sp_locker_assign(NEW.member_id, NEW.locker_number, NEW.locker_end_date, TRUE);
+    END IF;
+END
+""",
+    "members_lockers_after_update": """
+CREATE TRIGGER members_lockers_after_update
+AFTER UPDATE ON members
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.locker_number <=> NEW.locker_number AND OLD.locker_end_date <=> NEW.locker_end_date
+            AND OLD.is_active <=> NEW.is_active) THEN
+        IF NEW.is_active AND NEW.locker_number IS NOT NULL THEN
+            CALL sp_locker_assign(NEW.member_id, NEW.locker_number, NEW.locker_end_date,
+                                  NOT (OLD.locker_number <=> NEW.locker_number));
+        ELSE
+            UPDATE lockers SET member_id = NULL, expires_on = NULL, claimed_at = NULL
+            WHERE member_id = NEW.member_id;
+        END IF;
+    END IF;
+END
+""",
+    "members_lockers_after_delete": """
+CREATE TRIGGER members_lockers_after_delete
+AFTER DELETE ON members
+FOR EACH ROW
+BEGIN
+    UPDATE lockers SET member_id = NULL, expires_on = NULL, claimed_at = NULL
+    WHERE member_id = OLD.member_id;
+END
+""",
+}
+
+# 활성 회원의 members.locker_number 로 점유를 다시 채움 (같은 번호가 겹치면 만료일이 가장 늦은 회원)
+LOCKERS_REBUILD_SQL = """
+UPDATE lockers l
+JOIN (
+    SELECT member_id, locker_number, locker_end_date,
+           ROW_NUMBER() OVER (
+               PARTITION BY locker_number
+               ORDER BY locker_end_date IS NULL DESC, locker_end_date DESC, member_id DESC
+           ) AS rn
+    FROM members
+    WHERE is_active = TRUE AND locker_number IS NOT NULL
+) m ON m.locker_number = l.locker_number AND m.rn = 1
+SET l.member_id = m.member_id, l.expires_on = m.locker_end_date, l.claimed_at = NOW()
+"""
+
+
+def setup_lockers():
+    """
+    lockers: 락커 재고 (LOCKER_COUNT / LOCKER_ZONES 로 행을 맞춤)
+    - members 트리거가 락커 번호/만료일/활성 여부 변경을 같은 문장 안에서 반영하고,
+      설정할 때마다 members.locker_number 로 점유를 다시 채웁니다.
+    """
+    from .locker_inventory import locker_layout
+
+    layout = locker_layout()
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(LOCKERS_TABLE_SQL)
+            cursor.executemany(
+                "INSERT INTO lockers (locker_number, zone) VALUES (%s, %s) "
+                "ON DUPLICATE KEY UPDATE zone = VALUES(zone)",
+                layout
+            )
+            cursor.execute("DELETE FROM lockers WHERE locker_number > %s", (len(layout),))
+            cursor.execute("DROP PROCEDURE IF EXISTS sp_locker_assign")
+            cursor.execute(LOCKER_ASSIGN_PROCEDURE_SQL)
+            for name, sql in LOCKER_TRIGGERS.items():
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(sql)
+            cursor.execute("UPDATE lockers SET member_id = NULL, expires_on = NULL, claimed_at = NULL")
+            cursor.execute(LOCKERS_REBUILD_SQL)
+            conn.commit()
+            print(f"✅ lockers 테이블 및 트리거 설정 완료 (락커 {len(layout)}개)")
+    except Exception as e:
+        print(f"❌ lockers 설정 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# 만료 스캔(expiry_reminders.scan)이 읽는 인덱스 범위: 활성 회원의 종류별 만료일
+EXPIRY_INDEXES = {
+    "idx_members_active_membership_end": "(is_active, membership_end_date)",
+    "idx_members_active_locker_end": "(is_active, locker_end_date)",
+    "idx_members_active_uniform_end": "(is_active, uniform_end_date)",
+}
+
+EXPIRY_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS upcoming_expiries (
+        kind VARCHAR(20) NOT NULL,
+        member_id INT NOT NULL,
+        end_date DATE NOT NULL,
+        name VARCHAR(100),
+        phone_number VARCHAR(20),
+        item_type VARCHAR(50) NULL,
+        locker_number INT NULL,
+        PRIMARY KEY (kind, member_id),
+        KEY idx_upcoming_expiries_end (end_date, kind),
+        KEY idx_upcoming_expiries_member (member_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS expiry_reminders (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        member_id INT NOT NULL,
+        kind VARCHAR(20) NOT NULL,
+        end_date DATE NOT NULL,
+        days_before SMALLINT NOT NULL,
+        due_on DATE NOT NULL,
+        name VARCHAR(100),
+        phone_number VARCHAR(20),
+        status VARCHAR(10) NOT NULL DEFAULT 'pending',
+        attempts SMALLINT NOT NULL DEFAULT 0,
+        last_error VARCHAR(255) NULL,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        sent_at DATETIME NULL,
+        UNIQUE KEY uq_expiry_reminders (member_id, kind, end_date, days_before),
+        KEY idx_expiry_reminders_status (status, due_on, id)
+    )
+    """,
+]
+
+# 회원의 한 종류 만료 정보가 바뀌면 스냅샷 행과 아직 보내지 않은 알림을 지움 (다음 스캔이 새 만료일로 다시 만듦)
+EXPIRY_CLEAR_PROCEDURE_SQL = """
+CREATE PROCEDURE sp_expiry_clear(IN p_member_id INT, IN p_kind VARCHAR(20))
+BEGIN
+    DELETE FROM upcoming_expiries WHERE kind = p_kind AND member_id = p_member_id;
+    DELETE FROM expiry_reminders WHERE member_id = p_member_id AND kind = p_kind AND status = 'pending';
+END
+"""
+
+
+def _expiry_triggers() -> dict:
+    from .expiry_reminders import EXPIRY_KINDS
+
+    changed = "".join(
+        f"""
+    IF NOT (OLD.is_active <=> NEW.is_active AND OLD.{end_col} <=> NEW.{end_col}) THEN
+        CALL sp_expiry_clear(NEW.member_id, '{kind}');
+    END IF;"""
+        for kind, (end_col, _, _) in EXPIRY_KINDS.items()
+    )
+    removed = "".join(f"\n    CALL sp_expiry_clear(OLD.member_id, '{kind}');" for kind in EXPIRY_KINDS)
+    return {
+        "members_expiries_after_update": f"""
+CREATE TRIGGER members_expiries_after_update
+AFTER UPDATE ON members
+FOR EACH ROW
+BEGIN{changed}
+END
+""",
+        "members_expiries_after_delete": f"""
+CREATE TRIGGER members_expiries_after_delete
+AFTER DELETE ON members
+FOR EACH ROW
+BEGIN{removed}
+END
+""",
+    }
+
+
+def setup_expiry_reminders():
+    """
+    만료 예정 스냅샷(upcoming_expiries) + 알림 outbox(expiry_reminders) 테이블, 만료일 인덱스,
+    만료일 변경/회원 삭제 시 정리하는 트리거 생성 (채우는 것은 expiry_reminders.scan)
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            for sql in EXPIRY_TABLES:
+                cursor.execute(sql)
+            for name, columns in EXPIRY_INDEXES.items():
+                if not _index_exists(cursor, "members", name):
+                    cursor.execute(f"ALTER TABLE members ADD INDEX {name} {columns}")
+            cursor.execute("DROP PROCEDURE IF EXISTS sp_expiry_clear")
+            cursor.execute(EXPIRY_CLEAR_PROCEDURE_SQL)
+            for name, sql in _expiry_triggers().items():
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(sql)
+            conn.commit()
+            print("✅ 만료 예정 스냅샷 / 알림 outbox 테이블 및 트리거 설정 완료")
+    except Exception as e:
+        print(f"❌ 만료 알림 설정 실패: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def run_all():
+    add_phone_last4_columns()
+    add_checkin_indexes()
+    add_last_checkin_projection()
+    add_member_search_index()
+    add_member_updated_at()
+    setup_member_tombstones()
+    setup_member_counts()
+    setup_membership_catalog()
+    setup_active_sessions()
+    setup_attendance_rollups()
+    setup_lockers()
+    setup_expiry_reminders()
+    drop_per_checkin_events()
+    create_kiosk_checkin_procedure()
@@ -0,0 +1,117 @@
+"""
+서버측 prepared statement 캐시 (연결별)
+같은 SQL 본문은 연결마다 한 번만 PREPARE 하고, 이후에는 EXECUTE ... USING 으로 파라미터만 보내
+서버가 매 요청 SQL 을 다시 파싱하지 않게 합니다. (utils/member_query.py 가 만드는 고정 문장 집합용)
+- pymysql 은 바이너리 프로토콜(COM_STMT_PREPARE/COM_STMT_EXECUTE)을 지원하지 않으므로 텍스트 프로토콜의
+  SQL PREPARE / SET @변수 / EXECUTE ... USING 을 사용합니다. EXECUTE USING 은 사용자 변수만 받기 때문에
+  파라미터가 있으면 캐시 적중 시에도 SET, EXECUTE, 변수 비우기(SET ... = NULL)로 세 번 왕복합니다. (처음엔 PREPARE 까지 네 번)
+- 사용자 변수는 세션에 남아 풀 연결을 다음에 빌린 요청이 읽을 수 있으므로(검색어, 전화번호 등) 실행 후 항상 NULL 로 비웁니다.
+  목록 쿼리는 FULLTEXT 검색 + 여러 필터 + 키셋 조건으로 파싱/최적화 비용이 왕복 한 번보다 크다고 보고 이 방식을 씁니다.
+  DB 가 멀리 있어 왕복 비용이 더 크면 PREPARED_STATEMENTS_ENABLED=False 로 일반 cursor.execute(한 번 왕복)로 돌아갑니다.
+- 풀 연결이 재생성되면 WeakKeyDictionary 에서 같이 사라지고, 서버가 문장을 잃어버린 경우(1243)엔 다시 PREPARE 합니다.
+- 연결당 PREPARED_STATEMENT_CACHE_SIZE 개를 넘으면 가장 오래 안 쓴 문장을 DEALLOCATE 합니다.
+"""
+import itertools
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Sequence
+import pymysql
+from .config import get_settings
+
+settings = get_settings()
+
+ER_UNKNOWN_STMT_HANDLER = 1243
+
+_PLACEHOLDER = re.compile(r"%(s|%)")
+
+
+def to_server_sql(sql: str) -> str:
+    """pymysql 형식(%s, %%)을 서버 PREPARE 형식(?, %)으로 변환"""
+    return _PLACEHOLDER.sub(lambda m: "?" if m.group(1) == "s" else "%", sql)
+
+
+class PreparedStatementCache:
+    def __init__(self, size: int):
+        self.size = size
+        self._lock = threading.Lock()
+        self._statements: "weakref.WeakKeyDictionary[object, OrderedDict]" = weakref.WeakKeyDictionary()
+        self._names = itertools.count(1)
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "reprepares": 0,
+        }
+
+    def execute(self, cursor, sql: str, params: Sequence = ()):
+        """
+        cursor.execute(sql, params) 와 같은 결과를 prepared statement 로 실행 (결과는 cursor.fetch* 로 읽음)
+        파라미터는 SET @ps_N_i = %s 로 먼저 보내고 EXECUTE ps_N USING @ps_N_0, ... 로 실행한 뒤 변수를 비웁니다. (모듈 설명 참고)
+        """
+        if not settings.PREPARED_STATEMENTS_ENABLED:
+            cursor.execute(sql, tuple(params))
+            return
+        try:
+            self._execute(cursor, sql, params)
+        except pymysql.MySQLError as e:
+            if not e.args or e.args[0] != ER_UNKNOWN_STMT_HANDLER:
+                raise
+            # 서버 쪽 세션이 바뀌어 문장이 사라짐 -> 이 연결의 캐시를 비우고 한 번 더
+            with self._lock:
+                self._statements.pop(cursor.connection, None)
+                self._counters["reprepares"] += 1
+            self._execute(cursor, sql, params)
+
+    def _execute(self, cursor, sql: str, params: Sequence):
+        conn = cursor.connection
+        evicted = None
+        with self._lock:
+            statements = self._statements.get(conn)
+            if statements is None:
+                statements = self._statements[conn] = OrderedDict()
+            name = statements.get(sql)
+            if name:
+                statements.move_to_end(sql)
+                self._counters["hits"] += 1
+            else:
+                self._counters["misses"] += 1
+                if len(statements) >= self.size:
+                    _, evicted = statements.popitem(last=False)
+                    self._counters["evictions"] += 1
+
+        if evicted:
+            cursor.execute(f"DEALLOCATE PREPARE {evicted}")
+        if not name:
+            name = f"ps_{next(self._names)}"
+            cursor.execute(f"PREPARE {name} FROM %s", (to_server_sql(sql),))
+            with self._lock:
+                statements[sql] = name
+
+        if params:
+            variables = [f"@{name}_{i}" for i in range(len(params))]
+            try:
+                cursor.execute("SET " + ", ".join(f"{v} = %s" for v in variables), tuple(params))
+                cursor.execute(f"EXECUTE {name} USING {', '.join(variables)}")
+            finally:
+                # 결과가 버퍼된 cursor 를 덮어쓰지 않도록 같은 연결의 다른 커서로 비움
+                with conn.cursor() as cleanup:
+                    cleanup.execute("SET " + ", ".join(f"{v} = NULL" for v in variables))
+        else:
+            cursor.execute(f"EXECUTE {name}")
+
+    def stats(self) -> Dict:
+        """파싱 캐시 적중률: hits / (hits + misses). misses 는 서버에서 PREPARE(파싱)한 횟수"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "enabled": settings.PREPARED_STATEMENTS_ENABLED,
+                "connections": len(self._statements),
+                "statements": sum(len(s) for s in self._statements.values()),
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else None,
+                **{f"total_{k}": v for k, v in self._counters.items()},
+            }
+
+
+prepared_statements = PreparedStatementCache(settings.PREPARED_STATEMENT_CACHE_SIZE)
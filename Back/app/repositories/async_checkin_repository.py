@@ -0,0 +1,38 @@
+from typing import List, Optional, Tuple
+from datetime import date
+from aiomysql import DictCursor
+from .checkin_repository import (
+    TODAY_CHECKINS_COUNT_SQL,
+    TODAY_CHECKINS_SQL,
+    OCCUPANCY_COUNT_SQL,
+    OCCUPANCY_SQL,
+    day_range,
+)
+
+
+class AsyncCheckinRepository:
+    """checkins 조회용 비동기 Repository (aiomysql 커서 사용)"""
+
+    @staticmethod
+    async def get_occupancy(cursor: DictCursor, include_members: bool = False) -> Tuple[int, List[dict]]:
+        """현재 입장 인원 (include_members 면 입장 중인 회원 목록도)"""
+        await cursor.execute(OCCUPANCY_COUNT_SQL)
+        total = (await cursor.fetchone())['total']
+        members = []
+        if include_members:
+            await cursor.execute(OCCUPANCY_SQL)
+            members = list(await cursor.fetchall())
+        return total, members
+
+    @staticmethod
+    async def get_today_checkins(cursor: DictCursor, skip: int = 0, limit: int = 50) -> Tuple[List[dict], int]:
+        """오늘 출입 기록 조회"""
+        start, end = day_range(date.today())
+
+        await cursor.execute(TODAY_CHECKINS_COUNT_SQL, (start, end))
+        total_res = await cursor.fetchone()
+        total = total_res['total'] if total_res else 0
+
+        await cursor.execute(TODAY_CHECKINS_SQL, (start, end, limit, skip))
+        checkins = await cursor.fetchall()
+        return list(checkins), total
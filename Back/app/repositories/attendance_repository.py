@@ -0,0 +1,85 @@
+from datetime import date, datetime
+from typing import List, Optional
+from pymysql.cursors import DictCursor
+
+# 출석 롤업 조회 (migrations.setup_attendance_rollups 가 만든 테이블만 읽음)
+# checkins 건수와 무관하게 기간의 일/시간 버킷 수(최대 366일 x 24)만큼만 읽습니다.
+DAILY_SQL = """
+SELECT day, visits, sessions_closed, duration_seconds
+FROM attendance_daily
+WHERE day >= %s AND day < %s
+ORDER BY day
+"""
+
+HOUR_OF_DAY_SQL = """
+SELECT HOUR(hour_start) AS hour,
+       SUM(visits) AS visits,
+       SUM(sessions_closed) AS sessions_closed,
+       SUM(duration_seconds) AS duration_seconds
+FROM attendance_hourly
+WHERE hour_start >= %s AND hour_start < %s
+GROUP BY HOUR(hour_start)
+ORDER BY hour
+"""
+
+MEMBER_MONTHLY_SQL = """
+SELECT month, visits, sessions_closed, duration_seconds
+FROM attendance_member_monthly
+WHERE member_id = %s AND month >= %s AND month < %s
+ORDER BY month
+"""
+
+
+def average_minutes(duration_seconds, sessions_closed) -> Optional[float]:
+    """종료된 세션 평균 이용 시간(분). 종료된 세션이 없으면 None"""
+    if not sessions_closed:
+        return None
+    return round(int(duration_seconds) / int(sessions_closed) / 60, 1)
+
+
+class AttendanceRepository:
+
+    @staticmethod
+    def get_daily(cursor: DictCursor, start: date, end: date) -> List[dict]:
+        """[start, end) 일별 방문 수 / 평균 이용 시간"""
+        cursor.execute(DAILY_SQL, (start, end))
+        return [
+            {
+                "day": row['day'],
+                "visits": int(row['visits']),
+                "sessions_closed": int(row['sessions_closed']),
+                "duration_seconds": int(row['duration_seconds']),
+                "avg_session_minutes": average_minutes(row['duration_seconds'], row['sessions_closed']),
+            }
+            for row in cursor.fetchall()
+        ]
+
+    @staticmethod
+    def get_hours_of_day(cursor: DictCursor, start: date, end: date) -> List[dict]:
+        """[start, end) 동안 시간대(0~23시)별 방문 수 합계 (방문이 없는 시간대도 0 으로 채움)"""
+        cursor.execute(HOUR_OF_DAY_SQL, (datetime.combine(start, datetime.min.time()),
+                                         datetime.combine(end, datetime.min.time())))
+        by_hour = {int(row['hour']): row for row in cursor.fetchall()}
+        hours = []
+        for hour in range(24):
+            row = by_hour.get(hour)
+            hours.append({
+                "hour": hour,
+                "visits": int(row['visits']) if row else 0,
+                "avg_session_minutes": average_minutes(row['duration_seconds'], row['sessions_closed']) if row else None,
+            })
+        return hours
+
+    @staticmethod
+    def get_member_monthly(cursor: DictCursor, member_id: int, start: date, end: date) -> List[dict]:
+        """회원의 [start, end) 월별 방문 수 / 평균 이용 시간"""
+        cursor.execute(MEMBER_MONTHLY_SQL, (member_id, start, end))
+        return [
+            {
+                "month": row['month'].strftime('%Y-%m'),
+                "visits": int(row['visits']),
+                "sessions_closed": int(row['sessions_closed']),
+                "avg_session_minutes": average_minutes(row['duration_seconds'], row['sessions_closed']),
+            }
+            for row in cursor.fetchall()
+        ]
@@ -1,6 +1,92 @@
 from typing import List, Optional, Tuple
 from datetime import datetime, date, timedelta
 from pymysql.cursors import DictCursor
+from ..identity_map import identity_map
+from ..checkin_archive import read_member_month
+
+# 동기/비동기 repository가 함께 사용하는 조회 쿼리
+# 날짜 조건은 DATE(checkin_time) = ? 대신 반열린 구간 [당일 0시, 다음날 0시) 로 써서 idx_checkins_checkin_time 을 탑니다.
+TODAY_CHECKINS_COUNT_SQL = "SELECT COUNT(*) as total FROM checkins WHERE checkin_time >= %s AND checkin_time < %s"
+
+# [수정] 조인 시 m.id가 아니라 m.member_id 사용!
+TODAY_CHECKINS_SQL = """
+SELECT 
+    c.id as checkin_id,
+    c.member_id,
+    c.checkin_time,
+    c.checkout_time,
+    m.name,
+    m.phone_number
+FROM checkins c
+LEFT JOIN members m ON c.member_id = m.member_id
+WHERE c.checkin_time >= %s AND c.checkin_time < %s
+ORDER BY c.checkin_time DESC
+LIMIT %s OFFSET %s
+"""
+
+# 회원 달력: 일별 방문 수 / 이용 시간 (idx_checkins_member_time 범위 스캔, 월 파티션 프루닝)
+MEMBER_CALENDAR_SQL = """
+SELECT DATE(checkin_time) AS day,
+       COUNT(*) AS visits,
+       COALESCE(SUM(TIMESTAMPDIFF(SECOND, checkin_time, checkout_time)), 0) AS duration_seconds,
+       MIN(checkin_time) AS first_checkin
+FROM checkins
+WHERE member_id = %s
+AND checkin_time >= %s
+AND checkin_time < %s
+GROUP BY DATE(checkin_time)
+"""
+
+
+# 현재 입장 인원: active_sessions (회원당 열린 세션 1행, migrations.setup_active_sessions) 만 읽음
+OCCUPANCY_COUNT_SQL = "SELECT COUNT(*) AS total FROM active_sessions"
+
+OCCUPANCY_SQL = """
+SELECT
+    s.checkin_id,
+    s.member_id,
+    s.checkin_time,
+    m.name,
+    m.phone_number
+FROM active_sessions s
+JOIN members m ON m.member_id = s.member_id
+ORDER BY s.checkin_time DESC
+"""
+
+# members.last_checkin_time / last_checkout_time 투영(projection) 갱신
+# 회원 목록이 회원마다 checkins 를 상관 서브쿼리로 뒤지지 않도록 마지막 방문 정보를 members 에 유지합니다.
+SYNC_LAST_CHECKIN_SQL = """
+UPDATE members m
+JOIN checkins c ON c.member_id = m.member_id
+SET m.last_checkin_time = c.checkin_time,
+    m.last_checkout_time = c.checkout_time
+WHERE c.id = %s
+  AND (m.last_checkin_time IS NULL OR c.checkin_time >= m.last_checkin_time)
+"""
+
+SYNC_LAST_CHECKOUT_SQL = """
+UPDATE members m
+JOIN checkins c ON c.member_id = m.member_id
+SET m.last_checkout_time = c.checkout_time
+WHERE c.id = %s
+  AND m.last_checkin_time = c.checkin_time
+"""
+
+
+def day_range(day: date) -> Tuple[date, date]:
+    """해당 일의 [당일, 다음날) 구간"""
+    return day, day + timedelta(days=1)
+
+
+def month_range(year: int, month: int) -> Tuple[date, date]:
+    """해당 월의 [시작일, 다음 달 1일) 구간"""
+    start_date = date(year, month, 1)
+    if month == 12:
+        end_date = date(year + 1, 1, 1)
+    else:
+        end_date = date(year, month + 1, 1)
+    return start_date, end_date
+
 
 class CheckinRepository:
     
@@ -14,63 +100,28 @@ class CheckinRepository:
         """
         cursor.execute(sql, (member_id,))
         checkin_id = cursor.lastrowid
+        cursor.execute(SYNC_LAST_CHECKIN_SQL, (checkin_id,))
         cursor.connection.commit()
-        
-        # Create a per-checkin scheduled EVENT that will run once at
-        # the actual stored checkin_time + 3 hours to set checkout_time if
-        # the user hasn't checked out. Read the stored checkin_time from DB
-        # to avoid scheduling drift when the DB time differs from the app.
-        try:
-            event_name = f"auto_checkout_checkin_{checkin_id}"
-            # Ensure no leftover event with same name
-            try:
-                cursor.execute(f"DROP EVENT IF EXISTS {event_name}")
-            except Exception:
-                # ignore drop failures
-                pass
-            # Fetch the stored checkin_time to compute an exact schedule time
-            cursor.execute("SELECT checkin_time FROM checkins WHERE id = %s", (checkin_id,))
-            row = cursor.fetchone()
-            if row and row.get('checkin_time'):
-                stored_checkin = row['checkin_time']
-                # compute event run time = stored_checkin + 3 hours
-                run_time = (stored_checkin + timedelta(hours=3)).strftime('%Y-%m-%d %H:%M:%S')
-
-                # Build CREATE EVENT as a single-statement body
-                create_sql = f"""
-                CREATE EVENT `{event_name}`
-                ON SCHEDULE AT '{run_time}'
-                ON COMPLETION NOT PRESERVE
-                DO
-                UPDATE checkins c
-                JOIN members m ON m.member_id = c.member_id
-                SET c.checkout_time = NOW(), m.checkin_time = NULL, m.checkout_time = NOW()
-                WHERE c.id = {checkin_id} AND c.checkout_time IS NULL;
-                """
-                cursor.execute(create_sql)
-                cursor.connection.commit()
-            else:
-                # Fallback: schedule relative to CURRENT_TIMESTAMP (less accurate)
-                create_sql = f"""
-                CREATE EVENT `{event_name}`
-                ON SCHEDULE AT CURRENT_TIMESTAMP + INTERVAL 3 HOUR
-                ON COMPLETION NOT PRESERVE
-                DO
-                UPDATE checkins c
-                JOIN members m ON m.member_id = c.member_id
-                SET c.checkout_time = NOW(), m.checkin_time = NULL, m.checkout_time = NOW()
-                WHERE c.id = {checkin_id} AND c.checkout_time IS NULL;
-                """
-                cursor.execute(create_sql)
-                cursor.connection.commit()
-            cursor.connection.commit()
-        except Exception as e:
-            # Event creation can fail if the DB user lacks EVENT privileges;
-            # log and continue so checkin creation is not blocked.
-            print(f"⚠️ per-checkin event 생성 실패 (checkin_id={checkin_id}): {e}")
-
+        # 3시간 자동 퇴장은 app/auto_checkout.py 의 sweeper가 처리합니다.
         return CheckinRepository.get_checkin_by_id(cursor, checkin_id)
 
+    @staticmethod
+    def kiosk_checkin(cursor: DictCursor, member_id: int) -> dict:
+        """
+        sp_kiosk_checkin 호출 (휴면/만료/중복 입장 검증 + 입장 기록을 한 트랜잭션, 한 번의 왕복으로 처리)
+        result: success | deleted | not_found | expired | already_checked_in
+        """
+        cursor.execute("CALL sp_kiosk_checkin(%s)", (member_id,))
+        row = cursor.fetchone()
+        # CALL 은 결과 셋 뒤에 상태 셋을 하나 더 돌려주므로 비워둡니다. (추가 왕복 없음)
+        while cursor.nextset():
+            pass
+        if row and row['result'] == 'success':
+            identity_map(cursor).patch('members', member_id, {
+                'checkin_time': row['checkin_time'], 'checkout_time': None
+            })
+        return row
+
     @staticmethod
     def update_checkout(cursor: DictCursor, checkin_id: int) -> dict:
         """퇴장 시간 업데이트"""
@@ -80,94 +131,109 @@ class CheckinRepository:
         WHERE id = %s
         """
         cursor.execute(sql, (checkin_id,))
+        cursor.execute(SYNC_LAST_CHECKOUT_SQL, (checkin_id,))
         cursor.connection.commit()
-        
+
+        # DB가 정한 checkout_time 만 읽어 캐시된 행에 반영 (행 전체를 다시 읽지 않음)
+        imap = identity_map(cursor)
+        cursor.execute("SELECT checkout_time FROM checkins WHERE id = %s", (checkin_id,))
+        row = cursor.fetchone()
+        if row:
+            imap.patch('checkins', checkin_id, row)
         return CheckinRepository.get_checkin_by_id(cursor, checkin_id)
 
     @staticmethod
     def get_checkin_by_id(cursor: DictCursor, checkin_id: int) -> Optional[dict]:
-        """ID로 기록 조회"""
-        sql = "SELECT * FROM checkins WHERE id = %s"
-        cursor.execute(sql, (checkin_id,))
-        return cursor.fetchone()
+        """ID로 기록 조회 (요청 내에서는 identity map 캐시 사용)"""
+        def fetch():
+            sql = "SELECT * FROM checkins WHERE id = %s"
+            cursor.execute(sql, (checkin_id,))
+            return cursor.fetchone()
+        return identity_map(cursor).load('checkins', checkin_id, fetch)
 
     @staticmethod
     def get_member_by_phone_tail(cursor: DictCursor, phone_tail: str) -> Optional[dict]:
         """
         [중요 수정] 키오스크 검색용
         members 테이블에서 조회하므로 'id'가 아니라 'member_id'를 써야 합니다.
+        4자리 입력은 phone_last4 인덱스를 사용합니다.
         """
-        sql = """
-        SELECT * FROM members 
-        WHERE phone_number LIKE %s AND is_active = TRUE
-        ORDER BY created_at DESC 
-        LIMIT 1
-        """
-        cursor.execute(sql, (f"%{phone_tail}",))
+        if len(phone_tail) == 4:
+            sql = """
+            SELECT * FROM members 
+            WHERE phone_last4 = %s AND is_active = TRUE
+            ORDER BY created_at DESC 
+            LIMIT 1
+            """
+            cursor.execute(sql, (phone_tail,))
+        else:
+            sql = """
+            SELECT * FROM members 
+            WHERE phone_number LIKE %s AND is_active = TRUE
+            ORDER BY created_at DESC 
+            LIMIT 1
+            """
+            cursor.execute(sql, (f"%{phone_tail}",))
         return cursor.fetchone()
 
     @staticmethod
     def get_active_checkin(cursor: DictCursor, member_id: int) -> Optional[dict]:
-        """현재 입장 중인 기록 조회"""
-        # checkins 테이블은 id 컬럼을 가짐
+        """현재 입장 중인 기록 조회 (active_sessions PK 조회 -> checkins PK 조회)"""
         sql = """
-        SELECT * FROM checkins 
-        WHERE member_id = %s AND checkout_time IS NULL
-        ORDER BY checkin_time DESC 
-        LIMIT 1
+        SELECT c.* FROM active_sessions s
+        JOIN checkins c ON c.id = s.checkin_id
+        WHERE s.member_id = %s
         """
         cursor.execute(sql, (member_id,))
-        return cursor.fetchone()
+        row = cursor.fetchone()
+        if row:
+            # get_checkin_by_id 와 같은 SELECT * 이므로 identity map 에 등록
+            row = identity_map(cursor).load('checkins', row['id'], lambda: row)
+        return row
+
+    @staticmethod
+    def get_occupancy(cursor: DictCursor, include_members: bool = False) -> Tuple[int, List[dict]]:
+        """현재 입장 인원 (include_members 면 입장 중인 회원 목록도)"""
+        cursor.execute(OCCUPANCY_COUNT_SQL)
+        total = cursor.fetchone()['total']
+        members = []
+        if include_members:
+            cursor.execute(OCCUPANCY_SQL)
+            members = cursor.fetchall()
+        return total, members
 
     @staticmethod
     def get_today_checkins(cursor: DictCursor, skip: int = 0, limit: int = 50) -> Tuple[List[dict], int]:
         """오늘 출입 기록 조회"""
-        today = date.today()
+        start, end = day_range(date.today())
         
-        count_sql = "SELECT COUNT(*) as total FROM checkins WHERE DATE(checkin_time) = %s"
-        cursor.execute(count_sql, (today,))
+        cursor.execute(TODAY_CHECKINS_COUNT_SQL, (start, end))
         total_res = cursor.fetchone()
         total = total_res['total'] if total_res else 0
 
-        # [수정] 조인 시 m.id가 아니라 m.member_id 사용!
-        sql = """
-        SELECT 
-            c.id as checkin_id,
-            c.member_id,
-            c.checkin_time,
-            c.checkout_time,
-            m.name,
-            m.phone_number
-        FROM checkins c
-        LEFT JOIN members m ON c.member_id = m.member_id
-        WHERE DATE(c.checkin_time) = %s
-        ORDER BY c.checkin_time DESC
-        LIMIT %s OFFSET %s
-        """
-        cursor.execute(sql, (today, limit, skip))
+        cursor.execute(TODAY_CHECKINS_SQL, (start, end, limit, skip))
         checkins = cursor.fetchall()
         return checkins, total
 
     @staticmethod
-    def get_member_checkins(
-        cursor: DictCursor,
-        member_id: int,
-        year: int,
-        month: int
-    ) -> List[dict]:
-        """회원별 월간 기록"""
-        start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1)
-        else:
-            end_date = date(year, month + 1, 1)
-
-        sql = """
-        SELECT * FROM checkins
-        WHERE member_id = %s
-        AND checkin_time >= %s
-        AND checkin_time < %s
-        ORDER BY checkin_time DESC
+    def get_member_calendar(cursor: DictCursor, member_id: int, start_date: date, end_date: date) -> List[dict]:
         """
-        cursor.execute(sql, (member_id, start_date, end_date))
-        return cursor.fetchall()
\ No newline at end of file
+        회원의 [start_date, end_date) 일별 방문 수 / 이용 시간(초) / 첫 입장 시각 (날짜순)
+        아카이브된 월은 파일의 기록을 같은 방식으로 집계해 합칩니다.
+        """
+        cursor.execute(MEMBER_CALENDAR_SQL, (member_id, start_date, end_date))
+        days = {row['day']: dict(row) for row in cursor.fetchall()}
+
+        month = start_date.replace(day=1)
+        while month < end_date:
+            for record in read_member_month(member_id, month.year, month.month) or []:
+                checkin_time, checkout_time = record['checkin_time'], record['checkout_time']
+                day = days.setdefault(checkin_time.date(), {
+                    'day': checkin_time.date(), 'visits': 0, 'duration_seconds': 0, 'first_checkin': checkin_time
+                })
+                day['visits'] += 1
+                if checkout_time:
+                    day['duration_seconds'] += int((checkout_time - checkin_time).total_seconds())
+                day['first_checkin'] = min(day['first_checkin'], checkin_time)
+            month = month_range(month.year, month.month)[1]
+        return [days[day] for day in sorted(days)]
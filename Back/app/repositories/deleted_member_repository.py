@@ -1,5 +1,87 @@
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 from pymysql.cursors import DictCursor
+from ..utils.member_query import compile_member_query, DELETED_MEMBER_SORTS
+from ..prepared import prepared_statements
+from ..identity_map import identity_map
+from ..member_index import member_index
+from ..locker_inventory import locker_inventory
+from ..config import get_settings
+
+settings = get_settings()
+
+DELETED_MEMBER_COLUMNS = """
+            m.member_id, m.member_rank, m.name, m.phone_number, m.gender,
+            m.membership_type, m.membership_start_date, m.membership_end_date,
+            m.locker_number, m.locker_type, m.locker_start_date, m.locker_end_date,
+            m.uniform_type, m.uniform_start_date, m.uniform_end_date,
+            m.created_at, m.deleted_at"""
+
+# 삭제된 회원은 members.deleted_at 툼스톤입니다. (migrations.setup_member_tombstones, deleted_members 는 호환 뷰)
+RESTORE_SQL = """
+UPDATE members SET is_active = TRUE, deleted_at = NULL
+WHERE member_id = %s AND deleted_at IS NOT NULL
+"""
+
+PURGE_SQL = "DELETE FROM members WHERE member_id = %s AND deleted_at IS NOT NULL"
+
+TOMBSTONE_COUNT_SQL = "SELECT COUNT(*) AS total FROM members WHERE deleted_at IS NOT NULL"
+
+# 전체 복원/영구 삭제는 삭제된 회원을 member_id 구간 (lo, hi] 로 나눠 집합 문장으로 처리합니다.
+# (행마다 왕복하거나 거대한 IN 목록을 만들지 않고, 배치마다 커밋해 잠금을 짧게 유지)
+# 다음 배치의 끝 member_id: PK 순서로 읽으며 툼스톤 batch_size 행에서 멈춤 (배치 전체로 members 를 한 번 훑음)
+BATCH_END_SQL = """
+SELECT MAX(member_id) AS hi FROM (
+    SELECT member_id FROM members
+    WHERE member_id > %s AND deleted_at IS NOT NULL
+    ORDER BY member_id
+    LIMIT %s
+) batch
+"""
+
+# 각 문장은 (lo, hi) 를 파라미터로 받음. 반환 개수는 마지막 문장의 행 수
+RESTORE_BATCH_SQL = [
+    """
+    UPDATE members SET is_active = TRUE, deleted_at = NULL
+    WHERE member_id > %s AND member_id <= %s AND deleted_at IS NOT NULL
+    """,
+]
+
+PURGE_BATCH_SQL = [
+    "DELETE FROM members WHERE member_id > %s AND member_id <= %s AND deleted_at IS NOT NULL",
+]
+
+
+def run_in_batches(cursor, statements: List[str], batch_size: int = None,
+                   on_progress: Callable[[int, int], None] = None, end_sql: str = BATCH_END_SQL,
+                   count_sql: str = TOMBSTONE_COUNT_SQL) -> int:
+    """
+    삭제된 회원을 member_id 구간 배치로 나눠 statements 를 차례로 실행하고 배치마다 커밋
+    on_progress(처리한 행 수, 시작 시점 전체 행 수) 를 배치마다 호출 -> 처리한 행 수
+    """
+    batch_size = batch_size or settings.DELETED_MEMBERS_BATCH_SIZE
+    cursor.execute(count_sql)
+    total = int(cursor.fetchone()['total'])
+    done, lo = 0, 0
+    while True:
+        cursor.execute(end_sql, (lo, batch_size))
+        hi = cursor.fetchone()['hi']
+        if hi is None:
+            break
+        affected = 0
+        for sql in statements:
+            affected = cursor.execute(sql, (lo, hi))
+        cursor.connection.commit()
+        done += affected
+        lo = hi
+        if on_progress:
+            on_progress(done, total)
+    return done
+
+
+def _print_progress(label: str) -> Callable[[int, int], None]:
+    def report(done: int, total: int):
+        print(f"🔵 [삭제 회원 {label}] {done}/{total}")
+    return report
 
 
 class DeletedMemberRepository:
@@ -12,217 +94,68 @@ class DeletedMemberRepository:
         limit: int = 20,
         search: Optional[str] = None
     ) -> Tuple[List[dict], int]:
-        """삭제된 회원 목록 조회 (페이지네이션) - Raw Query"""
-        params = []
-        where_clause = "1=1"
-        
-        # 검색 (공백 제거) - Raw Query
-        if search:
-            search_clean = search.replace(" ", "")
-            where_clause += " AND (REPLACE(name, ' ', '') LIKE %s OR REPLACE(phone_number, ' ', '') LIKE %s)"
-            params.extend([f"%{search_clean}%", f"%{search_clean}%"])
-        
-        # 총 개수 조회 - Raw Query
-        count_sql = f"SELECT COUNT(*) as total FROM deleted_members WHERE {where_clause}"
-        cursor.execute(count_sql, tuple(params))
+        """삭제된 회원 목록 조회 (페이지네이션) - 공용 필터 컴파일러 + prepared statement"""
+        query = compile_member_query(
+            table="deleted_members",
+            search=search,
+            sorts=DELETED_MEMBER_SORTS,
+            default_sort=DELETED_MEMBER_SORTS['deleted_at'],
+        )
+
+        # 총 개수 조회
+        count_sql, count_params = query.count_sql()
+        prepared_statements.execute(cursor, count_sql, count_params)
         result = cursor.fetchone()
         total = result['total'] if result else 0
         
-        # 목록 조회 - Raw Query
-        sql = f"""
-        SELECT 
-            member_id, member_rank, name, phone_number, gender,
-            membership_type, membership_start_date, membership_end_date,
-            locker_number, locker_type, locker_start_date, locker_end_date,
-            uniform_type, uniform_start_date, uniform_end_date,
-            created_at, deleted_at
-        FROM deleted_members
-        WHERE {where_clause}
-        ORDER BY deleted_at DESC
-        LIMIT %s OFFSET %s
-        """
-        params.extend([limit, skip])
-        cursor.execute(sql, tuple(params))
-        members = cursor.fetchall()
+        # 목록 조회
+        sql, params = query.list_sql(DELETED_MEMBER_COLUMNS, limit, skip)
+        prepared_statements.execute(cursor, sql, params)
+        members, _ = query.page_rows(cursor.fetchall(), limit)
         
         return members, total
     
     @staticmethod
     def restore_member(cursor: DictCursor, member_id: int) -> bool:
-        """회원 복원 (deleted_members -> members) - Raw Query"""
-        # 1. deleted_members에서 데이터 조회 - Raw Query
-        sql = """
-        SELECT 
-            member_id, member_rank, name, phone_number, gender,
-            membership_type, membership_start_date, membership_end_date,
-            locker_number, locker_type, locker_start_date, locker_end_date,
-            uniform_type, uniform_start_date, uniform_end_date,
-            created_at
-        FROM deleted_members
-        WHERE member_id = %s
-        """
-        cursor.execute(sql, (member_id,))
-        deleted_member = cursor.fetchone()
-        
-        if not deleted_member:
+        """회원 복원 (툼스톤을 지우고 활성화, 행은 삭제 전 그대로)"""
+        result = cursor.execute(RESTORE_SQL, (member_id,))
+        if not result:
             return False
         
-        # 2. members 테이블에 복원 (is_active = TRUE) - Raw Query
-        insert_sql = """
-        INSERT INTO members (
-            member_id, member_rank, name, phone_number, gender,
-            membership_type, membership_start_date, membership_end_date,
-            locker_number, locker_type, locker_start_date, locker_end_date,
-            uniform_type, uniform_start_date, uniform_end_date,
-            is_active, created_at
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, TRUE, %s)
-        ON DUPLICATE KEY UPDATE
-            is_active = TRUE,
-            member_rank = VALUES(member_rank),
-            name = VALUES(name),
-            phone_number = VALUES(phone_number),
-            gender = VALUES(gender),
-            membership_type = VALUES(membership_type),
-            membership_start_date = VALUES(membership_start_date),
-            membership_end_date = VALUES(membership_end_date),
-            locker_number = VALUES(locker_number),
-            locker_type = VALUES(locker_type),
-            locker_start_date = VALUES(locker_start_date),
-            locker_end_date = VALUES(locker_end_date),
-            uniform_type = VALUES(uniform_type),
-            uniform_start_date = VALUES(uniform_start_date),
-            uniform_end_date = VALUES(uniform_end_date)
-        """
-        cursor.execute(insert_sql, (
-            deleted_member['member_id'],
-            deleted_member['member_rank'],
-            deleted_member['name'],
-            deleted_member['phone_number'],
-            deleted_member['gender'],
-            deleted_member['membership_type'],
-            deleted_member['membership_start_date'],
-            deleted_member['membership_end_date'],
-            deleted_member['locker_number'],
-            deleted_member['locker_type'],
-            deleted_member['locker_start_date'],
-            deleted_member['locker_end_date'],
-            deleted_member['uniform_type'],
-            deleted_member['uniform_start_date'],
-            deleted_member['uniform_end_date'],
-            deleted_member['created_at']
-        ))
-        
-        # 3. deleted_members에서 삭제 - Raw Query
-        delete_sql = "DELETE FROM deleted_members WHERE member_id = %s"
-        cursor.execute(delete_sql, (member_id,))
-        
         cursor.connection.commit()
+        identity_map(cursor).discard('members', member_id)
+        member_index.refresh(cursor, member_id)
+        locker_inventory.invalidate()
         return True
     
     @staticmethod
     def permanent_delete_member(cursor: DictCursor, member_id: int) -> bool:
-        """회원 영구 삭제 - Raw Query (deleted_members와 members 모두에서 삭제)"""
-        # 1. deleted_members에서 삭제
-        sql1 = "DELETE FROM deleted_members WHERE member_id = %s"
-        cursor.execute(sql1, (member_id,))
-        
-        # 2. members에서도 삭제
-        sql2 = "DELETE FROM members WHERE member_id = %s"
-        result = cursor.execute(sql2, (member_id,))
+        """회원 영구 삭제 (삭제 처리된 회원만 members 에서 지움)"""
+        result = cursor.execute(PURGE_SQL, (member_id,))
         
         cursor.connection.commit()
+        identity_map(cursor).discard('members', member_id)
+        member_index.refresh(cursor, member_id)
         return result > 0
     
     @staticmethod
-    def permanent_delete_all(cursor: DictCursor) -> int:
-        """모든 삭제된 회원 영구 삭제 - Raw Query (deleted_members와 members 모두에서 삭제)"""
-        # 1. deleted_members에서 member_id 목록 가져오기
-        sql_select = "SELECT member_id FROM deleted_members"
-        cursor.execute(sql_select)
-        member_ids = [row['member_id'] for row in cursor.fetchall()]
-        
-        # 2. deleted_members에서 모두 삭제
-        sql1 = "DELETE FROM deleted_members"
-        cursor.execute(sql1)
-        
-        # 3. members에서도 해당 member_id들 삭제
-        if member_ids:
-            placeholders = ', '.join(['%s'] * len(member_ids))
-            sql2 = f"DELETE FROM members WHERE member_id IN ({placeholders})"
-            cursor.execute(sql2, tuple(member_ids))
-        
-        cursor.connection.commit()
-        return len(member_ids)
-    
+    def permanent_delete_all(cursor: DictCursor, batch_size: int = None,
+                             on_progress: Callable[[int, int], None] = None) -> int:
+        """모든 삭제된 회원 영구 삭제 (member_id 구간 배치마다 커밋)"""
+        try:
+            return run_in_batches(cursor, PURGE_BATCH_SQL, batch_size, on_progress or _print_progress("영구 삭제"))
+        finally:
+            identity_map(cursor).clear()
+            member_index.sync(cursor, force=True)
+            locker_inventory.invalidate()
+
     @staticmethod
-    def restore_all(cursor: DictCursor) -> int:
-        """모든 삭제된 회원 복원 - Raw Query"""
-        # 1. deleted_members에서 모든 데이터 조회
-        sql_select = """
-        SELECT 
-            member_id, member_rank, name, phone_number, gender,
-            membership_type, membership_start_date, membership_end_date,
-            locker_number, locker_type, locker_start_date, locker_end_date,
-            uniform_type, uniform_start_date, uniform_end_date,
-            created_at
-        FROM deleted_members
-        """
-        cursor.execute(sql_select)
-        deleted_members = cursor.fetchall()
-        
-        if not deleted_members:
-            return 0
-        
-        # 2. members 테이블에 복원
-        insert_sql = """
-        INSERT INTO members (
-            member_id, member_rank, name, phone_number, gender,
-            membership_type, membership_start_date, membership_end_date,
-            locker_number, locker_type, locker_start_date, locker_end_date,
-            uniform_type, uniform_start_date, uniform_end_date,
-            is_active, created_at
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, TRUE, %s)
-        ON DUPLICATE KEY UPDATE
-            is_active = TRUE,
-            member_rank = VALUES(member_rank),
-            name = VALUES(name),
-            phone_number = VALUES(phone_number),
-            gender = VALUES(gender),
-            membership_type = VALUES(membership_type),
-            membership_start_date = VALUES(membership_start_date),
-            membership_end_date = VALUES(membership_end_date),
-            locker_number = VALUES(locker_number),
-            locker_type = VALUES(locker_type),
-            locker_start_date = VALUES(locker_start_date),
-            locker_end_date = VALUES(locker_end_date),
-            uniform_type = VALUES(uniform_type),
-            uniform_start_date = VALUES(uniform_start_date),
-            uniform_end_date = VALUES(uniform_end_date)
-        """
-        
-        for member in deleted_members:
-            cursor.execute(insert_sql, (
-                member['member_id'],
-                member['member_rank'],
-                member['name'],
-                member['phone_number'],
-                member['gender'],
-                member['membership_type'],
-                member['membership_start_date'],
-                member['membership_end_date'],
-                member['locker_number'],
-                member['locker_type'],
-                member['locker_start_date'],
-                member['locker_end_date'],
-                member['uniform_type'],
-                member['uniform_start_date'],
-                member['uniform_end_date'],
-                member['created_at']
-            ))
-        
-        # 3. deleted_members에서 삭제
-        delete_sql = "DELETE FROM deleted_members"
-        cursor.execute(delete_sql)
-        
-        cursor.connection.commit()
-        return len(deleted_members)
+    def restore_all(cursor: DictCursor, batch_size: int = None,
+                    on_progress: Callable[[int, int], None] = None) -> int:
+        """모든 삭제된 회원 복원 (member_id 구간 배치마다 커밋)"""
+        try:
+            return run_in_batches(cursor, RESTORE_BATCH_SQL, batch_size, on_progress or _print_progress("복원"))
+        finally:
+            identity_map(cursor).clear()
+            member_index.sync(cursor, force=True)
+            locker_inventory.invalidate()
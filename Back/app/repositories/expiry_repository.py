@@ -0,0 +1,58 @@
+from typing import Dict, List, Optional
+from pymysql.cursors import DictCursor
+
+# 만료 예정 / 알림 outbox 조회 (expiry_reminders.scan 이 채운 테이블만 읽음, members 는 읽지 않음)
+UPCOMING_SQL = """
+SELECT kind, member_id, end_date, DATEDIFF(end_date, CURDATE()) AS days_left,
+       name, phone_number, item_type, locker_number
+FROM upcoming_expiries
+WHERE end_date >= CURDATE() AND end_date <= CURDATE() + INTERVAL %s DAY
+  AND (%s IS NULL OR kind = %s)
+ORDER BY end_date, kind, member_id
+LIMIT %s
+"""
+
+UPCOMING_COUNTS_SQL = """
+SELECT kind, COUNT(*) AS total
+FROM upcoming_expiries
+WHERE end_date >= CURDATE() AND end_date <= CURDATE() + INTERVAL %s DAY
+GROUP BY kind
+"""
+
+REMINDERS_SQL = """
+SELECT id, member_id, kind, end_date, days_before, due_on, name, phone_number,
+       status, attempts, last_error, created_at, sent_at
+FROM expiry_reminders
+WHERE status = %s
+ORDER BY due_on DESC, id DESC
+LIMIT %s
+"""
+
+REMINDER_COUNTS_SQL = "SELECT status, COUNT(*) AS total FROM expiry_reminders GROUP BY status"
+
+
+class ExpiryRepository:
+
+    @staticmethod
+    def get_upcoming(cursor: DictCursor, days: int, kind: Optional[str], limit: int) -> List[dict]:
+        """오늘부터 days 일 안에 끝나는 회원권/락커/회원복 (만료일 순)"""
+        cursor.execute(UPCOMING_SQL, (days, kind, kind, limit))
+        rows = cursor.fetchall()
+        for row in rows:
+            row['days_left'] = int(row['days_left'])
+        return rows
+
+    @staticmethod
+    def count_upcoming(cursor: DictCursor, days: int) -> Dict[str, int]:
+        cursor.execute(UPCOMING_COUNTS_SQL, (days,))
+        return {row['kind']: int(row['total']) for row in cursor.fetchall()}
+
+    @staticmethod
+    def get_reminders(cursor: DictCursor, status: str, limit: int) -> List[dict]:
+        cursor.execute(REMINDERS_SQL, (status, limit))
+        return cursor.fetchall()
+
+    @staticmethod
+    def count_reminders(cursor: DictCursor) -> Dict[str, int]:
+        cursor.execute(REMINDER_COUNTS_SQL)
+        return {row['status']: int(row['total']) for row in cursor.fetchall()}
@@ -3,6 +3,7 @@ from datetime import date
 from ..utils.date_utils import calculate_end_date
 from ..utils.validators import get_rental_months
 from pymysql.cursors import DictCursor
+from ..locker_inventory import locker_inventory, FREE_CONDITION
 
 class LockerRepository:
     @staticmethod
@@ -27,6 +28,11 @@ class LockerRepository:
             end_date
         ))
         locker_id = cursor.lastrowid
+        # 락커 재고에도 점유 기록 (다른 회원이 쓰는 중이면 에러)
+        cursor.execute(
+            "CALL sp_locker_assign(%s, %s, %s, TRUE)",
+            (member_id, locker_data.locker_number, end_date)
+        )
         return LockerRepository.get_locker_by_member(cursor, member_id)
 
     @staticmethod
@@ -48,24 +54,36 @@ class LockerRepository:
         cursor.execute(sql, (rental_type, new_end_date, locker_id))
         # return updated record
         cursor.execute("SELECT * FROM locker_rentals WHERE locker_id = %s", (locker_id,))
-        return cursor.fetchone()
+        locker = cursor.fetchone()
+        if locker:
+            cursor.execute(
+                "UPDATE lockers SET expires_on = %s WHERE locker_number = %s AND member_id = %s",
+                (new_end_date, locker['locker_number'], locker['member_id'])
+            )
+        return locker
 
     @staticmethod
-    def get_available_lockers(cursor: DictCursor) -> List[int]:
-        sql = "SELECT locker_number FROM locker_rentals WHERE is_active = TRUE"
-        cursor.execute(sql)
-        used = cursor.fetchall()
-        used_numbers = {row['locker_number'] for row in used}
-        return [i for i in range(1, 101) if i not in used_numbers]
+    def get_available_lockers(cursor: DictCursor, zone: Optional[str] = None) -> List[int]:
+        """빈 락커 번호 (락커 재고 비트맵)"""
+        return locker_inventory.free_numbers(cursor, zone)
 
     @staticmethod
     def is_locker_available(cursor: DictCursor, locker_number: int) -> bool:
-        sql = "SELECT 1 FROM locker_rentals WHERE locker_number = %s AND is_active = TRUE"
+        sql = f"SELECT 1 FROM lockers WHERE locker_number = %s AND {FREE_CONDITION}"
         cursor.execute(sql, (locker_number,))
-        return cursor.fetchone() is None
+        return cursor.fetchone() is not None
 
     @staticmethod
     def release_locker(cursor: DictCursor, locker_id: int) -> bool:
         sql = "UPDATE locker_rentals SET is_active = FALSE WHERE locker_id = %s"
         result = cursor.execute(sql, (locker_id,))
-        return result > 0
\ No newline at end of file
+        cursor.execute(
+            """
+            UPDATE lockers l
+            JOIN locker_rentals r ON r.locker_number = l.locker_number AND r.member_id = l.member_id
+            SET l.member_id = NULL, l.expires_on = NULL, l.claimed_at = NULL
+            WHERE r.locker_id = %s
+            """,
+            (locker_id,)
+        )
+        return result > 0
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import List, Optional, Tuple
+from pymysql.cursors import DictCursor
+from ..config import get_settings
+from ..prepared import prepared_statements
+
+settings = get_settings()
+
+# 임의 필터 조합의 정확한 카운트 캐시: (count_sql, params, 오늘 날짜) -> (total, 버전, 저장 시각)
+_count_cache: "OrderedDict[tuple, Tuple[int, tuple, float]]" = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+# 입장 상태 버전: checkin_id 는 계속 커지므로 입장이 있으면 MAX 가, 퇴장만 있으면 COUNT 가 반드시 바뀜
+CHECKIN_VERSION_SQL = "SELECT COUNT(*) AS total, COALESCE(MAX(checkin_id), 0) AS last_id FROM active_sessions"
+
+CHECKED_IN_COUNT_SQL = """
+SELECT COUNT(*) AS total FROM active_sessions s
+JOIN members m ON m.member_id = s.member_id
+WHERE m.is_active = TRUE
+"""
+
+
+class MemberCountRepository:
+    """
+    회원 목록 전체 개수 조회 전략
+    - 단일 facet 필터(성별/락커/회원복/PT권 등): member_facet_counts 증분 카운터 (트리거가 유지)
+    - 입장 중 / 퇴장(관리자 목록): active_sessions 로 셈 (입장/퇴장은 members 카운터를 건드리지 않음)
+    - 회원권 상태 필터(active/inactive/expiring_soon): member_end_date_counts 만료일별 카운터 합산
+    - 그 외 조합: 정확한 COUNT(*) 결과를 캐시하고, members 가 바뀌면 트리거가 올리는 _version 으로 무효화
+      (입장 상태 필터가 있으면 active_sessions 버전도 함께 비교)
+    count 모드: exact(기본) | estimate(캐시/EXPLAIN 추정 허용) | none(카운트 생략)
+    """
+
+    @staticmethod
+    def get_facet(cursor: DictCursor, facet: str) -> Optional[int]:
+        cursor.execute("SELECT value FROM member_facet_counts WHERE facet = %s", (facet,))
+        row = cursor.fetchone()
+        return int(row['value']) if row else None
+
+    @staticmethod
+    def sum_end_dates(cursor: DictCursor, condition: str) -> int:
+        """만료일이 condition 을 만족하는 활성 회원 수 (condition 은 end_date 에 대한 고정 SQL 조건)"""
+        cursor.execute(
+            f"SELECT COALESCE(SUM(value), 0) AS total FROM member_end_date_counts WHERE {condition}"
+        )
+        return int(cursor.fetchone()['total'])
+
+    @staticmethod
+    def count_facet(cursor: DictCursor, facet: str) -> Optional[int]:
+        """facet 카운터로 답할 수 있으면 개수, 카운터가 없으면 None (날짜 기준은 목록 쿼리와 같은 CURDATE())"""
+        if facet == "checked_in":
+            # 입장 중인 활성 회원: active_sessions 만큼만 PK 조인
+            cursor.execute(CHECKED_IN_COUNT_SQL)
+            return int(cursor.fetchone()['total'])
+        if facet == "checked_out":
+            # 마지막 방문이 퇴장으로 끝난 활성 회원 = 방문한 적 있는 회원 - 입장 중
+            visited = MemberCountRepository.get_facet(cursor, "visited")
+            if visited is None:
+                return None
+            cursor.execute(CHECKED_IN_COUNT_SQL)
+            return visited - int(cursor.fetchone()['total'])
+        if facet == "status:expiring_soon":
+            return MemberCountRepository.sum_end_dates(
+                cursor, "end_date BETWEEN CURDATE() AND DATE_ADD(CURDATE(), INTERVAL 7 DAY)"
+            )
+        if facet == "status:inactive":
+            return MemberCountRepository.sum_end_dates(cursor, "end_date < CURDATE()")
+        if facet == "status:active":
+            active = MemberCountRepository.get_facet(cursor, "active")
+            if active is None:
+                return None
+            return active - MemberCountRepository.sum_end_dates(cursor, "end_date < CURDATE()")
+        return MemberCountRepository.get_facet(cursor, facet)
+
+    @staticmethod
+    def estimate(cursor: DictCursor, count_sql: str, params: List) -> int:
+        """옵티마이저 추정치(EXPLAIN rows x filtered)로 개수 추정"""
+        cursor.execute("EXPLAIN " + count_sql, tuple(params))
+        row = cursor.fetchone()
+        if not row or row.get('rows') is None:
+            return 0
+        return int(row['rows'] * float(row.get('filtered') or 100) / 100)
+
+    @staticmethod
+    def count(
+        cursor: DictCursor,
+        count_sql: str,
+        params: List,
+        facet: Optional[str] = None,
+        mode: str = "exact",
+        checkin_dependent: bool = False
+    ) -> Tuple[Optional[int], bool]:
+        """
+        count_sql 은 'SELECT COUNT(*) AS total ...' 형태여야 합니다.
+        checkin_dependent: 입장 상태 필터가 걸린 쿼리 (MemberQuery.checkin_dependent)
+        반환: (개수 또는 None, 정확한 값인지 여부)
+        """
+        if mode == "none":
+            return None, False
+
+        if facet:
+            try:
+                total = MemberCountRepository.count_facet(cursor, facet)
+            except Exception as e:
+                # 카운터 테이블이 아직 없으면 (마이그레이션 전) 일반 경로로
+                print(f"⚠️ [회원 카운트] facet 카운터 조회 실패, COUNT(*) 사용: {e}")
+                total = None
+            if total is not None:
+                return total, True
+
+        key = (count_sql, tuple(params), date.today())
+        with _count_cache_lock:
+            cached = _count_cache.get(key)
+
+        if mode == "estimate":
+            if cached and time.monotonic() - cached[2] <= settings.MEMBER_COUNT_ESTIMATE_TTL_SECONDS:
+                return cached[0], False
+            return MemberCountRepository.estimate(cursor, count_sql, params), False
+
+        try:
+            version = MemberCountRepository.get_facet(cursor, "_version")
+            if version is not None:
+                version = (version,)
+                if checkin_dependent:
+                    cursor.execute(CHECKIN_VERSION_SQL)
+                    row = cursor.fetchone()
+                    version += (int(row['total']), int(row['last_id']))
+        except Exception:
+            version = None
+        if cached and version is not None and cached[1] == version:
+            return cached[0], True
+
+        prepared_statements.execute(cursor, count_sql, params)
+        row = cursor.fetchone()
+        total = int(row['total']) if row else 0
+        if version is not None:
+            with _count_cache_lock:
+                _count_cache[key] = (total, version, time.monotonic())
+                _count_cache.move_to_end(key)
+                while len(_count_cache) > settings.MEMBER_COUNT_CACHE_SIZE:
+                    _count_cache.popitem(last=False)
+        return total, True
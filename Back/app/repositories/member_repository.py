@@ -1,8 +1,61 @@
 from typing import List, Optional, Tuple, Dict, Any
 from ..schemas.member import MemberCreate, MemberUpdate
 from ..utils.date_utils import calculate_end_date
+from ..utils.member_query import compile_member_query
+from ..prepared import prepared_statements
+from .member_count_repository import MemberCountRepository
+from ..identity_map import identity_map
+from ..member_index import member_index
+from ..locker_inventory import locker_inventory, is_locker_taken
 from pymysql.cursors import DictCursor
 
+# /members 목록 기본 정렬 (나머지 정렬은 utils/member_query.MEMBER_SORTS 공용)
+MEMBER_LIST_DEFAULT_SORT = ("m.member_id", "DESC")
+
+MEMBER_LIST_COLUMNS = """
+            m.member_id, m.member_rank, m.name, m.phone_number, m.gender,
+            m.membership_type, m.membership_start_date, m.membership_end_date,
+            m.locker_number, m.locker_type, m.locker_start_date, m.locker_end_date,
+            m.uniform_type, m.uniform_start_date, m.uniform_end_date, m.is_active, m.created_at,
+            m.checkin_time, m.checkout_time,
+            ELT(m.membership_status, '활성', '곧 만료', '만료') as status_text"""
+
+# [수정] id -> member_id, checkins 테이블 컬럼명 일치
+# 파라미터 없이 실행하므로 DATE_FORMAT 의 % 는 그대로 씁니다.
+MEMBER_TODAY_CHECKINS_SQL = """
+SELECT 
+    cl.id as checkin_id, cl.member_id, cl.checkin_time, cl.checkout_time,
+    m.name, m.phone_number, m.gender, m.membership_type,
+    DATE_FORMAT(cl.checkin_time, '%H:%i') as checkin_time_formatted,
+    CASE 
+        WHEN cl.checkout_time IS NULL THEN '입장 중'
+        ELSE DATE_FORMAT(cl.checkout_time, '%H:%i')
+    END as checkout_time_formatted
+FROM checkins cl
+JOIN members m ON cl.member_id = m.member_id
+WHERE cl.checkin_time >= CURDATE() AND cl.checkin_time < CURDATE() + INTERVAL 1 DAY
+ORDER BY cl.checkin_time DESC
+"""
+
+# 키오스크 뒷자리 조회 (idx_members_phone_state)
+PHONE_TAIL_PROBE_SQL = """
+SELECT 
+    member_id, member_rank, name, phone_number, gender,
+    membership_type, membership_start_date, membership_end_date,
+    locker_number, locker_type, locker_start_date, locker_end_date,
+    uniform_type, uniform_start_date, uniform_end_date, is_active,
+    checkin_time, checkout_time, deleted_at
+FROM members
+WHERE phone_last4 = %s
+ORDER BY name ASC
+"""
+
+# 소프트 삭제는 툼스톤만 남김 (deleted_members 는 members.deleted_at 위의 호환 뷰)
+SOFT_DELETE_SQL = """
+UPDATE members SET is_active = FALSE, deleted_at = NOW()
+WHERE member_id = %s AND deleted_at IS NULL
+"""
+
 
 class MemberRepository:
 
@@ -12,26 +65,15 @@ class MemberRepository:
          UPDATE members SET is_active = %s WHERE member_id = %s
         """
         cursor.execute(sql, (is_active, member_id))
-        cursor.connection.commit()    
+        cursor.connection.commit()
+        identity_map(cursor).patch('members', member_id, {'is_active': is_active})
+        member_index.refresh(cursor, member_id)
     
     @staticmethod
     def get_next_available_locker(cursor: DictCursor) -> Optional[int]:
-        sql = """
-        SELECT locker_number 
-        FROM members 
-        WHERE locker_number IS NOT NULL 
-        AND locker_end_date >= CURDATE()
-        AND is_active = TRUE
-        """
-        cursor.execute(sql)
-        used_lockers = cursor.fetchall()
-        used_numbers = {row['locker_number'] for row in used_lockers}
-        
-        for number in range(1, 101):
-            if number not in used_numbers:
-                return number
-        return None 
-    
+        """빈 락커를 잠그고 번호를 돌려줌 (같은 트랜잭션에서 members 에 저장 후 커밋해야 함, locker_inventory 참고)"""
+        return locker_inventory.claim(cursor)
+
     @staticmethod
     def get_next_member_rank(cursor: DictCursor) -> int:
         sql = "SELECT MAX(member_rank) as max_rank FROM members"
@@ -80,12 +122,22 @@ class MemberRepository:
         
         member_id = cursor.lastrowid
         cursor.connection.commit()
+        member_index.refresh(cursor, member_id)
+        if locker_number is not None:
+            locker_inventory.invalidate()
         
         return MemberRepository.get_member_by_id(cursor, member_id)
 
     @staticmethod
     def get_member_by_id(cursor: DictCursor, member_id: int) -> Optional[dict]:
-        """회원 ID로 조회 (입장/퇴장 상태 무관)"""
+        """회원 ID로 조회 (입장/퇴장 상태 무관, 요청 내에서는 identity map 캐시 사용)"""
+        return identity_map(cursor).load(
+            'members', member_id,
+            lambda: MemberRepository._fetch_member_by_id(cursor, member_id)
+        )
+
+    @staticmethod
+    def _fetch_member_by_id(cursor: DictCursor, member_id: int) -> Optional[dict]:
         sql = """
         SELECT 
             member_id, member_rank, name, phone_number, gender,
@@ -120,21 +172,33 @@ class MemberRepository:
         return cursor.fetchone()
 
     @staticmethod
-    def list_members_by_phone_tail(cursor: DictCursor, last_four: str) -> List[dict]:
-        """휴대폰 끝 4자리로 검색 (입장/퇴장 상태 무관)"""
-        sql = """
-        SELECT 
-            member_id, member_rank, name, phone_number, gender,
-            membership_type, membership_start_date, membership_end_date,
-            locker_number, locker_type, locker_start_date, locker_end_date,
-            uniform_type, uniform_start_date, uniform_end_date, is_active,
-            checkin_time, checkout_time
-        FROM members
-        WHERE RIGHT(phone_number, 4) = %s
-        ORDER BY name ASC
+    def probe_phone_tail(cursor: DictCursor, last_four: str) -> Tuple[str, List[dict]]:
         """
-        cursor.execute(sql, (last_four,))
-        return cursor.fetchall()
+        키오스크 뒷자리 조회: idx_members_phone_state (phone_last4, deleted_at) 한 번으로
+        ('active' | 'dormant' | 'unknown', 삭제되지 않은 회원 목록) 을 돌려줌 (입장/퇴장 상태 무관)
+        삭제된(휴면) 회원이 하나라도 걸리면 기존처럼 휴면으로 답합니다.
+        """
+        cursor.execute(PHONE_TAIL_PROBE_SQL, (last_four,))
+        rows = cursor.fetchall()
+        if any(row['deleted_at'] for row in rows):
+            return 'dormant', []
+        for row in rows:
+            row.pop('deleted_at')
+        return ('active' if rows else 'unknown'), rows
+
+    @staticmethod
+    def list_members_by_phone_tail(cursor: DictCursor, last_four: str) -> List[dict]:
+        """휴대폰 끝 4자리로 검색 (입장/퇴장 상태 무관, 휴면 회원이 걸리면 빈 목록)"""
+        return MemberRepository.probe_phone_tail(cursor, last_four)[1]
+
+    @staticmethod
+    def get_member_state(cursor: DictCursor, member_id: int) -> str:
+        """회원 상태 (PK 조회 한 번) -> 'active' | 'dormant' | 'unknown'"""
+        cursor.execute("SELECT deleted_at FROM members WHERE member_id = %s", (member_id,))
+        row = cursor.fetchone()
+        if not row:
+            return 'unknown'
+        return 'dormant' if row['deleted_at'] else 'active'
 
     @staticmethod
     def update_member(cursor: DictCursor, member_id: int, update_data: Dict[str, Any]) -> dict:
@@ -165,6 +229,7 @@ class MemberRepository:
         
         update_fields = []
         values = []
+        changes = {}
         
         for key, value in update_data.items():
             # 매핑된 컬럼명이 있거나, 락커/유니폼 관련 컬럼이면 사용
@@ -178,6 +243,7 @@ class MemberRepository:
             if key in column_mapping or key.startswith('locker_') or key.startswith('uniform_') or key == 'membership_type':
                  update_fields.append(f"{db_col} = %s")
                  values.append(value)
+                 changes[db_col] = value
         
         if not update_fields:
             return MemberRepository.get_member_by_id(cursor, member_id)
@@ -187,12 +253,21 @@ class MemberRepository:
         values.append(member_id)
         
         try:
-            cursor.execute(sql, tuple(values))
+            affected = cursor.execute(sql, tuple(values))
             cursor.connection.commit()
         except Exception as e:
             cursor.connection.rollback()
+            identity_map(cursor).discard('members', member_id)
+            if is_locker_taken(e):
+                raise ValueError("이미 사용 중인 락커입니다.")
             raise e
         
+        # 트리거가 계산하는 컬럼(membership_status, 순위 등)까지 맞추려면 캐시를 버리고 다시 읽어야 함
+        identity_map(cursor).discard('members', member_id)
+        if affected:
+            member_index.refresh(cursor, member_id)
+            if any(col.startswith('locker_') for col in changes):
+                locker_inventory.invalidate()
         return MemberRepository.get_member_by_id(cursor, member_id)
 
     @staticmethod
@@ -205,60 +280,18 @@ class MemberRepository:
 
     @staticmethod
     def soft_delete_member(cursor: DictCursor, member_id: int) -> bool:
-        """회원 소프트 삭제 (deleted_members로 이동)"""
+        """회원 소프트 삭제 (members.deleted_at 툼스톤 + is_active = FALSE, 행은 그대로 둠)"""
         try:
-            # 1. 회원 정보 조회 (is_active 상관없이)
-            select_sql = """
-            SELECT 
-                member_id, member_rank, name, phone_number, gender,
-                membership_type, membership_start_date, membership_end_date,
-                locker_number, locker_type, locker_start_date, locker_end_date,
-                uniform_type, uniform_start_date, uniform_end_date, created_at, is_active
-            FROM members
-            WHERE member_id = %s
-            """
-            cursor.execute(select_sql, (member_id,))
-            member = cursor.fetchone()
-            
-            if not member:
-                return False
-            
-            # 이미 비활성화된 회원인지 확인
-            if not member['is_active']:
-                # 이미 deleted_members에 있는지 확인
-                check_sql = "SELECT member_id FROM deleted_members WHERE member_id = %s"
-                cursor.execute(check_sql, (member_id,))
-                if cursor.fetchone():
-                    return True  # 이미 삭제 처리됨
-            
-            # 2. deleted_members에 삽입
-            insert_sql = """
-            INSERT INTO deleted_members (
-                member_id, member_rank, name, phone_number, gender,
-                membership_type, membership_start_date, membership_end_date,
-                locker_number, locker_type, locker_start_date, locker_end_date,
-                uniform_type, uniform_start_date, uniform_end_date,
-                created_at, deleted_at
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-            ON DUPLICATE KEY UPDATE deleted_at = NOW()
-            """
-            cursor.execute(insert_sql, (
-                member['member_id'], member['member_rank'], member['name'],
-                member['phone_number'], member['gender'],
-                member['membership_type'], member['membership_start_date'],
-                member['membership_end_date'], member['locker_number'],
-                member['locker_type'], member['locker_start_date'],
-                member['locker_end_date'], member['uniform_type'],
-                member['uniform_start_date'], member['uniform_end_date'],
-                member['created_at']
-            ))
-            
-            # 3. members 테이블에서 is_active를 FALSE로 변경
-            update_sql = "UPDATE members SET is_active = FALSE WHERE member_id = %s"
-            result = cursor.execute(update_sql, (member_id,))
-            
+            result = cursor.execute(SOFT_DELETE_SQL, (member_id,))
+            if not result:
+                # 없는 회원이면 False, 이미 삭제 처리된 회원이면 True
+                return MemberRepository.get_member_state(cursor, member_id) == 'dormant'
+
             cursor.connection.commit()
-            return result > 0
+            identity_map(cursor).patch('members', member_id, {'is_active': False})
+            member_index.refresh(cursor, member_id)
+            locker_inventory.invalidate()
+            return True
         except Exception as e:
             cursor.connection.rollback()
             raise e
@@ -275,128 +308,45 @@ class MemberRepository:
         membership_filter: Optional[str] = None,
         checkin_status: Optional[str] = None,
         locker_filter: bool = False,
-        uniform_filter: bool = False
-    ) -> Tuple[List[dict], int]:
-        """회원 목록 조회 (활성 회원만)"""
-        where_conditions = ["is_active = TRUE"]  # 활성 회원만 조회
-        print(f"🟢 [DEBUG] Initial where_conditions: {where_conditions}")
-        
-        # 검색 (공백 제거)
-        if search:
-            search_clean = search.replace(" ", "")
-            where_conditions.append(f"(REPLACE(name, ' ', '') LIKE '%{search_clean}%' OR REPLACE(phone_number, ' ', '') LIKE '%{search_clean}%')")
-        
-        # 성별
-        if gender:
-            where_conditions.append(f"gender = '{gender}'")
-        
-        # 라커룸 필터
-        if locker_filter:
-            where_conditions.append("locker_type IS NOT NULL")
-        
-        # 회원복 필터
-        if uniform_filter:
-            where_conditions.append("uniform_type IS NOT NULL")
-        
-        # 활성/비활성
-        if checkin_status == "active":
-            where_conditions.append("checkin_time IS NOT NULL")
-        elif checkin_status == "inactive":
-            where_conditions.append("checkout_time IS NOT NULL")
-        
-        # PT권 / 회원권 필터 추가
-        if membership_filter == "pt":
-            where_conditions.append("membership_type LIKE 'PT%'")
-        elif membership_filter == "membership":
-            where_conditions.append("membership_type NOT LIKE 'PT%' AND membership_type IS NOT NULL")
-        
-        where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-
-        # 정렬 (단순화)
-        print(f"🔴 [DEBUG] Final where_clause: {where_clause}")
-        
-        if sort_by == "member_rank_asc":
-            order_clause = "member_id ASC"
-        elif sort_by == "member_rank_desc":
-            order_clause = "member_id DESC"
-        elif sort_by == "membership_type_asc":
-            # PT권 정렬: PT(1개월), PT(3개월), PT(6개월), PT(1년) 순서
-            order_clause = """CASE 
-                WHEN membership_type = 'PT(1개월)' THEN 1
-                WHEN membership_type = 'PT(3개월)' THEN 2
-                WHEN membership_type = 'PT(6개월)' THEN 3
-                WHEN membership_type = 'PT(1년)' THEN 4
-                WHEN membership_type = '1개월' THEN 5
-                WHEN membership_type = '3개월' THEN 6
-                WHEN membership_type = '6개월' THEN 7
-                WHEN membership_type = '1년' THEN 8
-                ELSE 9
-            END ASC"""
-        elif sort_by == "locker_type_asc":
-            order_clause = "locker_type ASC"
-        elif sort_by == "uniform_type_asc":
-            order_clause = "uniform_type ASC"
-        elif sort_by == "checkin_time_desc":
-            order_clause = "checkin_time DESC"
-        elif sort_by == "checkout_time_desc":
-            order_clause = "checkout_time DESC"
-        else:
-            order_clause = "member_id DESC"
-
-        # 디버깅 로그
-        print(f"🔍 [DEBUG] membership_filter: {membership_filter}")
-        print(f"🔍 [DEBUG] sort_by: {sort_by}")
-        print(f"🔍 [DEBUG] where_clause: {where_clause}")
-        print(f"🔍 [DEBUG] order_clause: {order_clause}")
+        uniform_filter: bool = False,
+        after: Optional[str] = None,
+        count_mode: str = "exact"
+    ) -> Tuple[List[dict], Optional[int], Optional[str]]:
+        """
+        회원 목록 조회 (활성 회원만)
+        after 가 주어지면 skip 대신 커서(정렬 키 + member_id) 다음 행부터 조회합니다.
+        count_mode: exact | estimate | none (MemberCountRepository 참고)
+        반환: (회원 목록, 전체 개수 또는 None, 다음 페이지 커서 또는 None)
+        """
+        query = compile_member_query(
+            search=search,
+            gender=gender,
+            locker_filter=locker_filter,
+            uniform_filter=uniform_filter,
+            checkin_status=checkin_status,
+            membership_filter=membership_filter,
+            sort_by=sort_by,
+            default_sort=MEMBER_LIST_DEFAULT_SORT,
+            after=after,
+            checkin_source="session",
+        )
 
-        count_sql = f"SELECT COUNT(*) as total FROM members WHERE {where_clause}"
-        cursor.execute(count_sql)
-        result = cursor.fetchone()
-        total = result['total'] if result else 0
+        # 전체 개수: 필터가 없거나 하나면 증분 카운터, 그 외는 캐시된 COUNT(*)
+        count_sql, count_params = query.count_sql()
+        total, _ = MemberCountRepository.count(
+            cursor, count_sql, count_params, query.facet, count_mode, query.checkin_dependent
+        )
 
-        # [수정] 모든 컬럼명 DB와 일치 (id -> member_id 등)
-        sql = f"""
-        SELECT 
-            member_id, member_rank, name, phone_number, gender,
-            membership_type, membership_start_date, membership_end_date,
-            locker_number, locker_type, locker_start_date, locker_end_date,
-            uniform_type, uniform_start_date, uniform_end_date, is_active, created_at,
-            checkin_time, checkout_time,
-            CASE 
-                WHEN membership_end_date IS NULL THEN NULL
-                WHEN membership_end_date < CURDATE() THEN '만료'
-                WHEN membership_end_date <= DATE_ADD(CURDATE(), INTERVAL 7 DAY) THEN '곧 만료'
-                ELSE '활성'
-            END as status_text
-        FROM members
-        WHERE {where_clause}
-        ORDER BY {order_clause}
-        LIMIT {limit} OFFSET {skip}
-        """
-        cursor.execute(sql)
-        members = cursor.fetchall()
+        sql, params = query.list_sql(MEMBER_LIST_COLUMNS, limit, skip)
+        prepared_statements.execute(cursor, sql, params)
+        members, next_cursor = query.page_rows(cursor.fetchall(), limit)
 
-        return members, total
+        return members, total, next_cursor
 
     @staticmethod
     def get_today_checkins(cursor: DictCursor) -> List[dict]:
-        """당일 입장 회원 목록"""
-        # [수정] id -> member_id, checkins 테이블 컬럼명 일치
-        sql = """
-        SELECT 
-            cl.id as checkin_id, cl.member_id, cl.checkin_time, cl.checkout_time,
-            m.name, m.phone_number, m.gender, m.membership_type,
-            DATE_FORMAT(cl.checkin_time, '%H:%i') as checkin_time_formatted,
-            CASE 
-                WHEN cl.checkout_time IS NULL THEN '입장 중'
-                ELSE DATE_FORMAT(cl.checkout_time, '%H:%i')
-            END as checkout_time_formatted
-        FROM checkins cl
-        JOIN members m ON cl.member_id = m.member_id
-        WHERE DATE(cl.checkin_time) = CURDATE()
-        ORDER BY cl.checkin_time DESC
-        """
-        cursor.execute(sql)
+        """당일 입장 회원 목록 (checkin_time 반열린 구간 -> idx_checkins_checkin_time)"""
+        cursor.execute(MEMBER_TODAY_CHECKINS_SQL)
         return cursor.fetchall()
 
     @staticmethod
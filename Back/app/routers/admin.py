@@ -1,17 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request
+from fastapi.responses import StreamingResponse
 from typing import Dict, Optional, Union, Any, List
 from pydantic import BaseModel, field_validator
-from datetime import date, datetime
-import traceback
+from datetime import date
 from enum import Enum
 
-from ..database import get_db
+from ..database import get_db, run_db
 from ..services.admin_service import AdminService
+from ..services.checkin_service import CheckinService
 from ..schemas.admin import AdminUpdate
 from ..utils.security import oauth2_scheme
+from ..utils.http_cache import etag_response
+from ..checkin_feed import checkin_feed
+from .. import analytics
+from ..config import get_settings
+
+settings = get_settings()
 
 router = APIRouter(tags=["admin"])
 
+
+def _authorized_service(db, token: str) -> AdminService:
+    """토큰을 검증한 AdminService (run_db 워커 스레드 안에서 호출)"""
+    admin_service = AdminService(db)
+    admin_service.authorize(token)
+    return admin_service
+
 # === Request Models ===
 
 class GenderEnum(str, Enum):
@@ -83,12 +98,8 @@ def admin_login(request: LoginRequest, cursor=Depends(get_db)) -> Dict[str, Any]
 @router.post("/members")
 async def create_member(
     member_data: MemberCreateRequest,
-    cursor=Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> Dict[str, Any]:
-    admin_service = AdminService(cursor)
-    await admin_service.get_current_admin(token)
-
     member_dict: Dict[str, Any] = {
         'name': member_data.name,
         'phone_number': member_data.phone_number,
@@ -109,7 +120,7 @@ async def create_member(
         member_dict['uniform_start_date'] = member_data.uniform_start_date.isoformat() if isinstance(member_data.uniform_start_date, date) else member_data.uniform_start_date if member_data.uniform_start_date else None
         member_dict['uniform_end_date'] = member_data.uniform_end_date.isoformat() if isinstance(member_data.uniform_end_date, date) else member_data.uniform_end_date if member_data.uniform_end_date else None
 
-    return admin_service.create_member(**member_dict)
+    return await run_db(lambda db: _authorized_service(db, token).create_member(**member_dict))
 
 @router.get("/members")
 async def get_members(
@@ -123,87 +134,54 @@ async def get_members(
     locker_filter: bool = Query(False),
     uniform_filter: bool = Query(False),
     checkin_status: Optional[str] = Query(None),
-    cursor=Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    count: str = Query("exact", pattern="^(estimate|exact|none)$"),
     token: str = Depends(oauth2_scheme)
 ):
-    admin_service = AdminService(cursor)
-    await admin_service.get_current_admin(token)
-    return admin_service.get_members(
+    return await run_db(lambda db: _authorized_service(db, token).get_members(
         page=page, size=size, search=search, status_filter=status, sort_by=sort_by, 
         gender=gender, membership_filter=membership_filter, locker_filter=locker_filter, uniform_filter=uniform_filter,
-        checkin_status=checkin_status
-    )
+        checkin_status=checkin_status, after=cursor, count=count
+    ))
+
+@router.get("/members/typeahead")
+async def typeahead_members(
+    q: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(10, ge=1, le=50),
+    token: str = Depends(oauth2_scheme)
+):
+    """검색창 자동완성: "ㄱㅁㅅ" / "김ㅁ" / "김민" / 전화번호 일부"""
+    return await run_db(lambda db: _authorized_service(db, token).typeahead_members(q, limit))
 
 @router.get("/members/{member_id}")
 async def get_member(
-    member_id: int, cursor=Depends(get_db), token: str = Depends(oauth2_scheme)
+    member_id: int, token: str = Depends(oauth2_scheme)
 ) -> Dict[str, Any]:
-    admin_service = AdminService(cursor)
-    await admin_service.get_current_admin(token)
-    return admin_service.get_member(member_id)
+    return await run_db(lambda db: _authorized_service(db, token).get_member(member_id))
 
-# ✅ [복구 완료] 출입 기록 조회 기능
-# Repository 의존성을 제거하고, 직접 SQL을 사용하여 가장 안전하게 복구했습니다.
-@router.get("/members/{member_id}/checkins")
-async def get_member_checkins(
+@router.get("/members/{member_id}/calendar")
+async def get_member_calendar(
     member_id: int,
-    cursor=Depends(get_db),
+    request: Request,
+    year: int = Query(..., ge=2000, le=2100),
+    month: Optional[int] = Query(None, ge=1, le=12, description="없으면 한 해 전체"),
     token: str = Depends(oauth2_scheme)
-) -> Dict[str, Any]:
-    """회원별 최근 출입 기록 조회"""
-    admin_service = AdminService(cursor)
-    await admin_service.get_current_admin(token)
-
-    try:
-        # 1. 실제 DB 컬럼(checkin_time)을 사용하는 올바른 SQL
-        sql = """
-        SELECT 
-            id,
-            member_id,
-            checkin_time,
-            checkout_time
-        FROM checkins
-        WHERE member_id = %s
-        ORDER BY checkin_time DESC
-        LIMIT 50
-        """
-        cursor.execute(sql, (member_id,))
-        raw_checkins = cursor.fetchall()
-
-        checkins = []
-        for record in raw_checkins:
-            # 2. 데이터 가져오기 (컬럼명 checkin_time)
-            checkin_dt = record.get('checkin_time')
-            
-            if checkin_dt is None:
-                continue
-
-            # 3. 날짜 변환 (datetime 객체인지 문자열인지 확인 후 처리)
-            # MySQL 설정에 따라 datetime 객체로 올 수도 있고 문자열로 올 수도 있음
-            if isinstance(checkin_dt, str):
-                checkin_dt = datetime.strptime(checkin_dt, '%Y-%m-%d %H:%M:%S')
-
-            # 4. 프론트엔드가 원하는 포맷(date, time 키)으로 변환
-            checkins.append({
-                'id': record['id'],
-                'member_id': record['member_id'],
-                'date': checkin_dt.strftime('%Y-%m-%d'),  # 예: 2024-11-25
-                'time': checkin_dt.strftime('%H:%M'),     # 예: 14:30
-                'type': '입장',
-                # 프론트엔드 MemberDrawer.tsx에서 new Date(record.date)를 쓰므로 
-                # 위 date 필드가 'YYYY-MM-DD' 형식이면 정상 작동합니다.
-            })
-
-        return {
-            "status": "success",
-            "checkins": checkins,
-            "total": len(checkins)
-        }
-
-    except Exception as e:
-        print(f"❌ 출입 기록 조회 실패: {str(e)}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"출입 기록 조회 실패: {str(e)}")
+):
+    """회원 출입 달력: 일별 방문 수 / 이용 시간 (닫힌 달은 immutable 캐시 + ETag)"""
+    payload, etag, closed = await run_db(_get_member_calendar, member_id, year, month, token)
+    return etag_response(request, payload, etag, immutable=closed)
+
+
+def _get_member_calendar(cursor, member_id: int, year: int, month: Optional[int], token: str):
+    _authorized_service(cursor, token)
+    return CheckinService(cursor).get_member_calendar(member_id, year, month)
+
+
+@router.get("/lockers/map")
+async def get_locker_map(request: Request, token: str = Depends(oauth2_scheme)):
+    """락커 배치도: 락커별 상태 / 사용 회원 / 대여 종류 / 만료까지 남은 일수 (캐시 + ETag)"""
+    payload, etag = await run_db(lambda db: _authorized_service(db, token).get_locker_map())
+    return etag_response(request, payload, etag)
 
 
 # ✅ [유지] 422 에러 해결된 수정 기능
@@ -211,12 +189,8 @@ async def get_member_checkins(
 async def update_member(
     member_id: int,
     update_data: MemberUpdateRequest,
-    cursor=Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> Dict[str, Any]:
-    admin_service = AdminService(cursor)
-    await admin_service.get_current_admin(token)
-
     # 422 에러 원인이었던 update_raw 제거 및 데이터 정제 로직
     update_dict = update_data.dict(exclude_unset=True)
 
@@ -227,29 +201,130 @@ async def update_member(
     if 'gender' in update_dict and update_dict['gender'] == '':
         update_dict['gender'] = None
 
-    return admin_service.update_member(member_id=member_id, **update_dict)
+    return await run_db(lambda db: _authorized_service(db, token).update_member(member_id=member_id, **update_dict))
 
 
 @router.delete("/members/{member_id}")
 async def delete_member(
-    member_id: int, cursor=Depends(get_db), token: str = Depends(oauth2_scheme)
+    member_id: int, token: str = Depends(oauth2_scheme)
 ) -> Dict[str, Any]:
-    admin_service = AdminService(cursor)
-    await admin_service.get_current_admin(token)
-    return admin_service.delete_member(member_id)
+    return await run_db(lambda db: _authorized_service(db, token).delete_member(member_id))
 
 @router.get("/today-checkins")
-async def get_today_checkins(
-    cursor=Depends(get_db), token: str = Depends(oauth2_scheme)
+async def get_today_checkins(token: str = Depends(oauth2_scheme)):
+    checkins = await run_db(lambda db: _authorized_service(db, token).get_today_checkins())
+    return {"status": "success", "checkins": checkins}
+
+@router.get("/occupancy")
+async def get_occupancy(token: str = Depends(oauth2_scheme)):
+    """현재 입장 인원 + 입장 중인 회원 목록 (공개 /checkin/occupancy 는 인원수만)"""
+    return await run_db(lambda db: _authorized_service(db, token).get_occupancy())
+
+@router.get("/checkin-stream")
+async def checkin_stream(
+    request: Request,
+    token: str = Query(..., description="EventSource 는 헤더를 보낼 수 없으므로 토큰을 쿼리로 받음"),
+    last_event_id: Optional[str] = Query(None)
 ):
-    admin_service = AdminService(cursor)
-    await admin_service.get_current_admin(token)
-    return {"status": "success", "checkins": admin_service.get_today_checkins()}
+    """
+    입장/퇴장 실시간 피드 (text/event-stream)
+    재연결 시 브라우저가 보내는 Last-Event-ID 헤더(또는 last_event_id 쿼리) 이후의 이벤트만 다시 보냅니다.
+    """
+    await run_db(lambda db: _authorized_service(db, token))
+    resume_from = request.headers.get("last-event-id") or last_event_id
+    sub, replay, reset = checkin_feed.subscribe(resume_from)
+
+    async def events():
+        try:
+            if reset:
+                # 버퍼보다 오래 끊겼거나 서버가 재시작됨 -> 클라이언트가 목록을 다시 읽어야 함
+                yield f"id: {checkin_feed.stats()['last_id']}\nevent: reset\ndata: {{}}\n\n"
+            for event in replay:
+                yield checkin_feed.format(event)
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), settings.CHECKIN_FEED_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    break  # 밀린 이벤트가 너무 많아 끊김 -> 재연결해서 버퍼로 따라잡음
+                yield checkin_feed.format(event)
+        finally:
+            checkin_feed.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/expiries/upcoming")
+async def get_upcoming_expiries(
+    days: int = Query(7, ge=0, description="오늘부터 며칠 안에 만료되는지"),
+    kind: Optional[str] = Query(None, description="membership | locker | uniform"),
+    limit: int = Query(200, ge=1, le=1000),
+    token: str = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """만료 예정 회원권/락커/회원복 (만료 스캔 스냅샷에서 조회)"""
+    return await run_db(lambda db: _authorized_service(db, token).get_upcoming_expiries(days, kind, limit))
+
+@router.get("/expiries/reminders")
+async def get_expiry_reminders(
+    status: str = Query("pending", description="pending | sent | failed | cancelled"),
+    limit: int = Query(100, ge=1, le=1000),
+    token: str = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """만료 알림 outbox 현황"""
+    return await run_db(lambda db: _authorized_service(db, token).get_expiry_reminders(status, limit))
+
+@router.get("/attendance/summary")
+async def get_attendance_summary(
+    start: Optional[date] = Query(None, description="시작일 (기본: 종료일 29일 전)"),
+    end: Optional[date] = Query(None, description="종료일, 포함 (기본: 오늘)"),
+    token: str = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """기간 방문 수 / 평균 이용 시간 / 일별 추이 (출석 롤업)"""
+    return await run_db(lambda db: _authorized_service(db, token).get_attendance_summary(start, end))
+
+@router.get("/attendance/peak-hours")
+async def get_peak_hours(
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    top: int = Query(3, ge=1, le=24),
+    token: str = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """시간대별 방문 수와 피크 시간대 (출석 롤업)"""
+    return await run_db(lambda db: _authorized_service(db, token).get_peak_hours(start, end, top))
+
+@router.get("/attendance/members/{member_id}")
+async def get_member_attendance(
+    member_id: int,
+    year: int = Query(..., ge=2000, le=2100),
+    token: str = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """회원의 월별 방문 수 / 평균 이용 시간 (출석 롤업)"""
+    return await run_db(lambda db: _authorized_service(db, token).get_member_attendance(member_id, year))
+
+@router.get("/analytics/attendance")
+async def get_attendance_analytics(
+    start: date = Query(...),
+    end: date = Query(..., description="종료일, 포함"),
+    token: str = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """요일 x 시간 평균 점유 히트맵 + 이용 시간 분포 (자동 퇴장 세션은 따로 집계)"""
+    await run_db(lambda db: _authorized_service(db, token))
+    if start > end:
+        raise HTTPException(status_code=400, detail="시작일이 종료일보다 늦습니다.")
+    if (end - start).days >= settings.ANALYTICS_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"분석 기간은 최대 {settings.ANALYTICS_MAX_DAYS}일입니다.")
+    # 풀 연결 대신 전용 연결의 서버측 커서로 스트리밍하므로 run_db 밖의 스레드에서 실행
+    return await asyncio.to_thread(analytics.attendance_analytics, start, end)
 
 @router.put("/change-password")
 async def change_admin_password(
-    update_data: AdminUpdate, cursor=Depends(get_db), token: str = Depends(oauth2_scheme)
+    update_data: AdminUpdate, token: str = Depends(oauth2_scheme)
 ) -> Dict[str, Any]:
-    admin_service = AdminService(cursor)
-    await admin_service.get_current_admin(token)
-    return admin_service.change_password(update_data.current_password, update_data.new_password)
\ No newline at end of file
+    return await run_db(lambda db: _authorized_service(db, token).change_password(
+        update_data.current_password, update_data.new_password
+    ))
\ No newline at end of file
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import Dict
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from typing import Dict, Optional
 from pydantic import BaseModel
 from datetime import datetime
-from ..database import get_db
-from ..services.checkin_service import CheckinService
+from ..database import run_db
+from ..async_database import get_async_db
+from ..services.checkin_service import CheckinService, AsyncCheckinService
+from ..repositories.member_repository import MemberRepository
 from ..utils.security import oauth2_scheme
+from ..utils.http_cache import etag_response
 
 # [수정] prefix와 tags는 main.py에서 설정하므로 여기서는 비워둡니다.
 router = APIRouter()
@@ -17,10 +20,7 @@ class KioskCheckinRequest(BaseModel):
 # ==================== 키오스크 체크인 ====================
 
 @router.post("")
-async def kiosk_checkin(
-    request: KioskCheckinRequest,
-    db = Depends(get_db)
-) -> Dict:
+async def kiosk_checkin(request: KioskCheckinRequest) -> Dict:
     phone_tail = request.phone_last_four.strip()
     candidate_id = request.candidate_id
     print(f"🔍 [키오스크] 검색 요청: {phone_tail}, 후보 id: {candidate_id}")
@@ -28,15 +28,15 @@ async def kiosk_checkin(
     if len(phone_tail) != 4 or not phone_tail.isdigit():
         raise HTTPException(status_code=400, detail="숫자 4자리를 입력해주세요.")
 
+    return await run_db(_kiosk_checkin, phone_tail, candidate_id)
+
+
+def _kiosk_checkin(db, phone_tail: str, candidate_id: int | None) -> Dict:
+    """키오스크 체크인 (워커 스레드에서 동기 커서로 실행)"""
     try:
-        # 먼저 삭제된 회원인지 확인
-        deleted_check_sql = """
-        SELECT member_id, name FROM deleted_members
-        WHERE RIGHT(phone_number, 4) = %s
-        """
-        db.execute(deleted_check_sql, (phone_tail,))
-        deleted_member = db.fetchone()
-        if deleted_member:
+        # 뒷자리 4자리로 한 번에 조회 (휴면/활성/없음, idx_members_phone_state)
+        state, members = MemberRepository.probe_phone_tail(db, phone_tail)
+        if state == 'dormant':
             raise HTTPException(
                 status_code=403, 
                 detail=f"휴면회원입니다. 카운터에 문의하세요."
@@ -44,24 +44,11 @@ async def kiosk_checkin(
         
         # 후보 id가 있으면 해당 회원으로 체크인
         if candidate_id:
-            sql = """
-            SELECT member_id, name, phone_number, membership_end_date, is_active
-            FROM members
-            WHERE member_id = %s AND RIGHT(phone_number, 4) = %s
-            """
-            db.execute(sql, (candidate_id, phone_tail))
-            member = db.fetchone()
+            member = next((m for m in members if m["member_id"] == candidate_id), None)
             if not member:
                 raise HTTPException(status_code=404, detail="선택한 회원을 찾을 수 없습니다.")
         else:
-            # 후보 id 없으면 4자리로 전체 검색
-            sql = """
-            SELECT member_id, name, phone_number, membership_end_date, is_active
-            FROM members
-            WHERE RIGHT(phone_number, 4) = %s
-            """
-            db.execute(sql, (phone_tail,))
-            members = db.fetchall()
+            # 후보 id 없으면 4자리 검색 결과 전체
             if not members:
                 raise HTTPException(status_code=404, detail="등록된 회원이 없습니다.")
             if len(members) > 1:
@@ -91,18 +78,24 @@ async def kiosk_checkin(
 
 # ==================== 관리자용 ====================
 @router.get("/today")
-async def get_today_checkins(page: int = Query(1), size: int = Query(50), db = Depends(get_db)):
-    checkin_service = CheckinService(db)
-    checkins, total = checkin_service.get_today_checkins(page, size)
+async def get_today_checkins(page: int = Query(1), size: int = Query(50), db = Depends(get_async_db)):
+    checkin_service = AsyncCheckinService(db)
+    checkins, total = await checkin_service.get_today_checkins(page, size)
     return {"total": total, "page": page, "size": size, "checkins": checkins}
 
+@router.get("/occupancy")
+async def get_occupancy(db = Depends(get_async_db)):
+    """현재 입장 인원 (active_sessions). 인증 없는 키오스크 API 라 인원수만, 회원 목록은 /admin/occupancy"""
+    return await AsyncCheckinService(db).get_occupancy()
+
 @router.put("/{checkin_id}/checkout")
-async def process_checkout(checkin_id: int, db = Depends(get_db)):
-    checkin_service = CheckinService(db)
-    return checkin_service.process_checkout(checkin_id)
+async def process_checkout(checkin_id: int):
+    return await run_db(lambda db: CheckinService(db).process_checkout(checkin_id))
 
 @router.get("/member/{member_id}")
-async def get_member_checkins(member_id: int, year: int = Query(...), month: int = Query(...), db = Depends(get_db)):
-    checkin_service = CheckinService(db)
-    checkins = checkin_service.get_member_checkins(member_id, year, month)
-    return {"checkins": checkins}
\ No newline at end of file
+async def get_member_calendar(
+    member_id: int, request: Request, year: int = Query(..., ge=2000, le=2100), month: Optional[int] = Query(None, ge=1, le=12)
+):
+    """회원 출입 달력 (관리자 /admin/members/{member_id}/calendar 와 같은 응답)"""
+    payload, etag, closed = await run_db(lambda db: CheckinService(db).get_member_calendar(member_id, year, month))
+    return etag_response(request, payload, etag, immutable=closed)
\ No newline at end of file
@@ -36,20 +36,15 @@ def search_by_phone(
             detail="전화번호 뒷자리 4자리를 정확히 입력해주세요."
         )
 
-    # 삭제된 회원 체크
-    deleted_check_sql = "SELECT member_id, name FROM deleted_members WHERE RIGHT(phone_number, 4) = %s"
-    db.execute(deleted_check_sql, (search_query,))
-    deleted_member = db.fetchone()
-    if deleted_member:
+    member_service = MemberService(db)
+    # 뒷자리 4개로 한 번에 조회 (휴면 여부 포함)
+    state, members = member_service.probe_phone_tail(search_query)
+    if state == 'dormant':
         raise HTTPException(
             status_code=403,
             detail="휴면회원입니다. 카운터에 문의하세요."
         )
 
-    member_service = MemberService(db)
-    # 서비스 호출 (뒷자리 4개로 검색)
-    members = member_service.search_by_last_four_digits(search_query)
-
     if not members:
         return {
             "status": "not_found",
@@ -80,30 +75,10 @@ def member_checkin(
     db = Depends(get_db)
 ) -> Dict:
     print(f"\n✅ [키오스크 입장 요청] member_id={member_id}")
-    
-    # 삭제된 회원 체크
-    deleted_check_sql = "SELECT member_id FROM deleted_members WHERE member_id = %s"
-    db.execute(deleted_check_sql, (member_id,))
-    if db.fetchone():
-        print(f"❌ [삭제된 회원] member_id={member_id}")
-        raise HTTPException(
-            status_code=403,
-            detail="휴면회원입니다. 카운터에 문의하세요."
-        )
 
-    member_service = MemberService(db)
+    # 휴면/만료/중복 입장 검증과 입장 기록을 한 트랜잭션으로 처리
     checkin_service = CheckinService(db)
-
-    # 회원 상태 확인
-    validity = member_service.check_member_validity(member_id)
-    if validity["status"] == "expired":
-        print(f"❌ [회원권 만료] member_id={member_id}")
-        return validity
-
-    # 입장 처리
-    print(f"🔵 [입장 처리 시작] member_id={member_id}")
-    checkin_result = checkin_service.process_checkin(member_id)
-    return checkin_result
+    return checkin_service.kiosk_checkin(member_id)
 
 @router.post("/checkout/{member_id}")
 def member_checkout(
@@ -113,9 +88,8 @@ def member_checkout(
     print(f"\n🔵 [키오스크 퇴장 요청] member_id={member_id}")
     
     # 삭제된 회원 체크
-    deleted_check_sql = "SELECT member_id FROM deleted_members WHERE member_id = %s"
-    db.execute(deleted_check_sql, (member_id,))
-    if db.fetchone():
+    from ..repositories.member_repository import MemberRepository
+    if MemberRepository.get_member_state(db, member_id) == 'dormant':
         print(f"❌ [삭제된 회원] member_id={member_id}")
         raise HTTPException(
             status_code=403,
@@ -140,7 +114,6 @@ def member_checkout(
     # 퇴장 처리
     result = checkin_service.process_checkout(active_checkin['id'])
     # 회원 정보도 함께 반환
-    from ..repositories.member_repository import MemberRepository
     member = MemberRepository.get_member_by_id(db, member_id)
     result['member_name'] = member.get('name') if member else None
     result['membership_end_date'] = member.get('membership_end_date') if member else None
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query
 from typing import Dict, Optional
-from ..database import get_db
+from ..database import run_db
 from ..services.member_service import MemberService
 from ..schemas.member import MemberCreate, MemberUpdate, MemberResponse
 from ..utils.security import oauth2_scheme
@@ -9,9 +9,8 @@ from ..utils.security import oauth2_scheme
 router = APIRouter()
 
 @router.post("/", response_model=MemberResponse)
-async def create_member(member_data: MemberCreate, db = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    member_service = MemberService(db)
-    return member_service.create_member(member_data)
+async def create_member(member_data: MemberCreate, token: str = Depends(oauth2_scheme)):
+    return await run_db(lambda db: MemberService(db).create_member(member_data))
 
 @router.get("/", response_model=Dict)
 async def list_members(
@@ -20,27 +19,25 @@ async def list_members(
     gender: Optional[str] = None, sort_by: Optional[str] = None,
     membership_filter: Optional[str] = None, checkin_status: Optional[str] = None,
     locker_filter: bool = Query(False), uniform_filter: bool = Query(False),
-    db = Depends(get_db), token: str = Depends(oauth2_scheme)
+    cursor: Optional[str] = None,
+    count: str = Query("exact", pattern="^(estimate|exact|none)$"),
+    token: str = Depends(oauth2_scheme)
 ):
-    member_service = MemberService(db)
     # 500 에러 방지용 파라미터 전달
-    members, total = member_service.get_members_list(
+    members, total, next_cursor = await run_db(lambda db: MemberService(db).get_members_list(
         page, size, search, status, gender, sort_by, membership_filter, checkin_status,
-        locker_filter, uniform_filter
-    )
-    return {"total": total, "page": page, "size": size, "members": members}
+        locker_filter, uniform_filter, after=cursor, count_mode=count
+    ))
+    return {"total": total, "page": page, "size": size, "members": members, "next_cursor": next_cursor}
 
 @router.get("/{member_id}", response_model=MemberResponse)
-async def get_member(member_id: int, db = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    member_service = MemberService(db)
-    return member_service.get_member(member_id)
+async def get_member(member_id: int, token: str = Depends(oauth2_scheme)):
+    return await run_db(lambda db: MemberService(db).get_member(member_id))
 
 @router.put("/{member_id}", response_model=MemberResponse)
-async def update_member(member_id: int, update_data: MemberUpdate, db = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    member_service = MemberService(db)
-    return member_service.update_member(member_id, update_data)
+async def update_member(member_id: int, update_data: MemberUpdate, token: str = Depends(oauth2_scheme)):
+    return await run_db(lambda db: MemberService(db).update_member(member_id, update_data))
 
 @router.post("/{member_id}/extend-membership")
-async def extend_membership(member_id: int, membership_type_id: int, db = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    member_service = MemberService(db)
-    return member_service.extend_membership(member_id, membership_type_id)
\ No newline at end of file
+async def extend_membership(member_id: int, membership_type_id: int, token: str = Depends(oauth2_scheme)):
+    return await run_db(lambda db: MemberService(db).extend_membership(member_id, membership_type_id))
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query
-from typing import List, Dict, Any
-from ..database import get_db
+from typing import List, Dict, Any, Optional
+from ..database import run_db
 from ..services.rental_service import RentalService
 from ..schemas.locker_rental import LockerRentalCreate, LockerRentalResponse
 from ..schemas.uniform_rental import UniformRentalCreate, UniformRentalResponse
@@ -12,26 +12,21 @@ router = APIRouter(prefix="/api/rentals", tags=["rentals"])
 async def extend_locker_rental(
     member_id: int,
     rental_type: str,
-    db = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> Dict:
-    rental_service = RentalService(db)
-    return rental_service.extend_locker_rental(member_id, rental_type)
+    return await run_db(lambda db: RentalService(db).extend_locker_rental(member_id, rental_type))
 
 @router.post("/uniform/{member_id}/extend")
 async def extend_uniform_rental(
     member_id: int,
     rental_type: str,
-    db = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> Dict:
-    rental_service = RentalService(db)
-    return rental_service.extend_uniform_rental(member_id, rental_type)
+    return await run_db(lambda db: RentalService(db).extend_uniform_rental(member_id, rental_type))
 
 @router.get("/lockers/available")
 async def get_available_lockers(
-    db = Depends(get_db),
+    zone: Optional[str] = Query(None, description="락커 구역 (LOCKER_ZONES)"),
     token: str = Depends(oauth2_scheme)
 ) -> Dict:
-    rental_service = RentalService(db)
-    return rental_service.get_available_lockers()
\ No newline at end of file
+    return await run_db(lambda db: RentalService(db).get_available_lockers(zone))
\ No newline at end of file
@@ -1,14 +1,72 @@
-from datetime import timedelta
+from datetime import date, timedelta
 from typing import Dict, Optional, Any, List
 from fastapi import HTTPException, status, Depends
 from jose import JWTError
 from ..repositories.admin_repository import AdminRepository
 from ..repositories.member_repository import MemberRepository
+from ..repositories.member_count_repository import MemberCountRepository
+from ..repositories.checkin_repository import CheckinRepository
+from ..repositories.attendance_repository import AttendanceRepository, average_minutes
+from ..repositories.expiry_repository import ExpiryRepository
+from ..expiry_reminders import EXPIRY_KINDS
+from ..identity_map import identity_map
+from ..member_index import member_index
+from ..locker_inventory import locker_inventory, is_locker_taken
 from ..utils.security import create_access_token, verify_token, oauth2_scheme
+from ..utils.member_query import compile_member_query
+from ..prepared import prepared_statements
 from ..config import get_settings
 
 settings = get_settings()
 
+# 관리자 회원 목록 기본 정렬 (나머지 정렬은 utils/member_query.MEMBER_SORTS 공용)
+ADMIN_DEFAULT_SORT = ("m.created_at", "DESC")
+
+# 출석 통계 조회 기간 상한 (롤업 버킷 수를 일정하게 유지)
+ATTENDANCE_MAX_DAYS = 366
+
+REMINDER_STATUSES = ("pending", "sent", "failed", "cancelled")
+
+# 마지막 방문 정보는 members.last_checkin_time / last_checkout_time 투영 컬럼에서 읽음
+# (회원마다 checkins 를 뒤지는 상관 서브쿼리 제거, migrations.add_last_checkin_projection 참고)
+ADMIN_MEMBER_COLUMNS = """
+                    m.member_id,
+                    m.member_rank,
+                    m.name,
+                    m.gender,
+                    m.phone_number,
+                    m.membership_type,
+                    m.membership_start_date,
+                    m.membership_end_date,
+                    m.locker_number,
+                    m.locker_type,
+                    m.locker_start_date,
+                    m.locker_end_date,
+                    m.uniform_type,
+                    m.uniform_start_date,
+                    m.uniform_end_date,
+                    m.is_active,
+                    m.created_at,
+                    m.last_checkin_time,
+                    m.last_checkout_time"""
+
+
+# 당일 입장 기록: checkin_time 반열린 구간 [오늘, 내일) -> idx_checkins_checkin_time
+ADMIN_TODAY_CHECKINS_SQL = """
+                SELECT 
+                    c.id as checkin_id,
+                    c.member_id,
+                    c.checkin_time,
+                    c.checkout_time,
+                    m.name,
+                    m.phone_number,
+                    m.gender,
+                    m.membership_type
+                FROM checkins c
+                JOIN members m ON c.member_id = m.member_id
+                WHERE c.checkin_time >= CURDATE() AND c.checkin_time < CURDATE() + INTERVAL 1 DAY
+                ORDER BY c.checkin_time DESC
+"""
 
 class AdminService:
     def __init__(self, db: Any):
@@ -48,6 +106,10 @@ class AdminService:
         return {"status": "success", "message": "비밀번호가 변경되었습니다."}
 
     async def get_current_admin(self, token: str = Depends(oauth2_scheme)) -> Dict:
+        return self.authorize(token)
+
+    def authorize(self, token: str) -> Dict:
+        """토큰 검증 (동기 버전, 워커 스레드에서 호출)"""
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="인증이 필요합니다.",
@@ -68,25 +130,14 @@ class AdminService:
 
     # ==================== 헬퍼 메서드 ====================
     def _get_available_locker_number(self) -> int:
-        sql = """
-            SELECT locker_number 
-            FROM members 
-            WHERE locker_end_date >= CURDATE() 
-            AND locker_number IS NOT NULL
-        """
-        self.db.execute(sql)
-        result = self.db.fetchall()
-        
-        used_lockers = {row['locker_number'] for row in result}
-        
-        for i in range(1, 101):
-            if i not in used_lockers:
-                return i
-        
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="남은 락커가 없습니다. (1~100번 모두 사용 중)"
-        )
+        """빈 락커를 잠그고 번호를 돌려줌 (회원 저장과 같은 트랜잭션에서 커밋, locker_inventory 참고)"""
+        locker_number = locker_inventory.claim(self.db)
+        if locker_number is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="남은 락커가 없습니다. (모든 락커 사용 중)"
+            )
+        return locker_number
 
     # ==================== 회원 관리 메서드 ====================
 
@@ -101,163 +152,42 @@ class AdminService:
         membership_filter: Optional[str] = None,
         locker_filter: bool = False,
         uniform_filter: bool = False,
-        checkin_status: Optional[str] = None
+        checkin_status: Optional[str] = None,
+        after: Optional[str] = None,
+        count: str = "exact"
     ) -> Dict:
-        """회원 목록 조회 (출입기록 복구 완료)"""
+        """
+        회원 목록 조회 (출입기록 복구 완료)
+        after: 이전 응답의 next_cursor. 주어지면 page 대신 커서 다음 행부터 조회 (키셋 페이지네이션)
+        count: exact | estimate | none (none 이면 total 은 None)
+        """
         try:
-            # 🔍 디버그 로그 추가
-            print(f"🔍 [DEBUG] get_members 호출됨 - sort_by: {sort_by}, page: {page}, size: {size}")
-            
-            offset = (page - 1) * size
-            params = []
-            
-            # ✅ [수정] checkins 테이블을 직접 조회하는 서브쿼리로 변경 (데이터 나옴!)
-            sql = """
-                SELECT 
-                    m.member_id,
-                    m.member_rank,
-                    m.name,
-                    m.gender,
-                    m.phone_number,
-                    m.membership_type,
-                    m.membership_start_date,
-                    m.membership_end_date,
-                    m.locker_number,
-                    m.locker_type,
-                    m.locker_start_date,
-                    m.locker_end_date,
-                    m.uniform_type,
-                    m.uniform_start_date,
-                    m.uniform_end_date,
-                    m.is_active,
-                    m.created_at,
-                    (SELECT checkin_time FROM checkins WHERE member_id = m.member_id ORDER BY checkin_time DESC LIMIT 1) as last_checkin_time,
-                    (SELECT checkout_time FROM checkins WHERE member_id = m.member_id ORDER BY checkin_time DESC LIMIT 1) as last_checkout_time
-                FROM members m
-                WHERE m.is_active = TRUE
-            """
-            
-            # 1. 검색 조건
-            if search:
-                sql += " AND (m.name LIKE %s OR m.phone_number LIKE %s)"
-                search_param = f"%{search}%"
-                params.extend([search_param, search_param])
-            
-            # 2. 상태 필터
-            if status_filter == 'active':
-                sql += " AND m.is_active = TRUE AND (m.membership_end_date IS NULL OR m.membership_end_date >= CURDATE())"
-            elif status_filter == 'inactive':
-                 sql += " AND (m.is_active = FALSE OR m.membership_end_date < CURDATE())"
-            elif status_filter == 'expiring_soon':
-                sql += """ AND m.is_active = TRUE AND (
-                    m.membership_end_date BETWEEN CURDATE() AND DATE_ADD(CURDATE(), INTERVAL 7 DAY)
-                )"""
-
-            # 3. 성별 필터
-            if gender:
-                sql += " AND m.gender = %s"
-                params.append(gender)
-            
-            # 4. 라커룸 필터
-            if locker_filter:
-                sql += " AND m.locker_type IS NOT NULL"
-            
-            # 5. 회원복 필터
-            if uniform_filter:
-                sql += " AND m.uniform_type IS NOT NULL"
-            
-            # 6. 활성/비활성 필터
-            if checkin_status == "active":
-                sql += " AND (SELECT checkin_time FROM checkins WHERE member_id = m.member_id AND checkout_time IS NULL ORDER BY checkin_time DESC LIMIT 1) IS NOT NULL"
-            elif checkin_status == "inactive":
-                sql += " AND (SELECT checkout_time FROM checkins WHERE member_id = m.member_id ORDER BY checkin_time DESC LIMIT 1) IS NOT NULL"
-            
-            # 7. PT권 / 회원권 필터
-            if membership_filter == "pt":
-                sql += " AND m.membership_type LIKE 'PT%%'"
-            elif membership_filter == "membership":
-                sql += " AND m.membership_type NOT LIKE 'PT%%' AND m.membership_type IS NOT NULL"
-
-            # 8. 정렬 로직
-            order_clause = "m.created_at DESC" # 기본값
-            
-            if sort_by == 'recent_checkin':
-                order_clause = "last_checkin_time DESC" # 서브쿼리 별칭 사용
-            elif sort_by == 'name':
-                order_clause = "m.name ASC"
-            elif sort_by == 'end_date':
-                order_clause = "m.membership_end_date ASC"
-            elif sort_by == 'member_rank_desc':
-                order_clause = "m.member_id DESC"  # member_id 내림차순
-            elif sort_by == 'member_rank_asc':
-                order_clause = "m.member_id ASC"   # member_id 오름차순
-            elif sort_by == 'membership_type_asc':
-                order_clause = """CASE 
-                    WHEN m.membership_type = 'PT(1개월)' THEN 1
-                    WHEN m.membership_type = 'PT(3개월)' THEN 2
-                    WHEN m.membership_type = 'PT(6개월)' THEN 3
-                    WHEN m.membership_type = 'PT(1년)' THEN 4
-                    WHEN m.membership_type = '1개월' THEN 5
-                    WHEN m.membership_type = '3개월' THEN 6
-                    WHEN m.membership_type = '6개월' THEN 7
-                    WHEN m.membership_type = '1년' THEN 8
-                    ELSE 9 
-                END ASC"""
-            elif sort_by == 'locker_type_asc':
-                order_clause = """CASE 
-                    WHEN m.locker_type LIKE '1개월%%' THEN 1
-                    WHEN m.locker_type LIKE '3개월%%' THEN 2
-                    WHEN m.locker_type LIKE '6개월%%' THEN 3
-                    WHEN m.locker_type LIKE '12개월%%' OR m.locker_type LIKE '1년%%' THEN 4
-                    ELSE 5 
-                END ASC"""
-            elif sort_by == 'uniform_type_asc':
-                order_clause = """CASE 
-                    WHEN m.uniform_type LIKE '1개월%%' THEN 1
-                    WHEN m.uniform_type LIKE '3개월%%' THEN 2
-                    WHEN m.uniform_type LIKE '6개월%%' THEN 3
-                    WHEN m.uniform_type LIKE '12개월%%' OR m.uniform_type LIKE '1년%%' THEN 4
-                    ELSE 5 
-                END ASC"""
-            
-            # 🔍 디버그 로그 추가
-            print(f"🔍 [DEBUG] sort_by: '{sort_by}', order_clause: '{order_clause}'")
-            
-            sql += f" ORDER BY {order_clause}"
-            sql += " LIMIT %s OFFSET %s"
-            params.extend([size, offset])
-            
-            self.db.execute(sql, tuple(params))
-            members = self.db.fetchall()
-            
-            # 5. 전체 개수 조회
-            count_sql = "SELECT COUNT(*) as count FROM members m WHERE m.is_active = TRUE"
-            count_params = []
-            
-            if search:
-                count_sql += " AND (m.name LIKE %s OR m.phone_number LIKE %s)"
-                count_params.extend([search_param, search_param])
-            if status_filter == 'active':
-                count_sql += " AND m.is_active = TRUE AND (m.membership_end_date IS NULL OR m.membership_end_date >= CURDATE())"
-            if status_filter == 'inactive':
-                 count_sql += " AND (m.is_active = FALSE OR m.membership_end_date < CURDATE())"
-            if status_filter == 'expiring_soon':
-                count_sql += " AND m.is_active = TRUE AND (m.membership_end_date BETWEEN CURDATE() AND DATE_ADD(CURDATE(), INTERVAL 7 DAY))"
-            if gender:
-                count_sql += " AND m.gender = %s"
-                count_params.append(gender)
-            if locker_filter:
-                count_sql += " AND m.locker_type IS NOT NULL"
-            if uniform_filter:
-                count_sql += " AND m.uniform_type IS NOT NULL"
-            if checkin_status == "active":
-                count_sql += " AND (SELECT checkin_time FROM checkins WHERE member_id = m.member_id AND checkout_time IS NULL ORDER BY checkin_time DESC LIMIT 1) IS NOT NULL"
-            elif checkin_status == "inactive":
-                count_sql += " AND (SELECT checkout_time FROM checkins WHERE member_id = m.member_id ORDER BY checkin_time DESC LIMIT 1) IS NOT NULL"
-            
-            self.db.execute(count_sql, tuple(count_params))
-            result = self.db.fetchone()
-            total = result['count'] if result else 0
+            query = compile_member_query(
+                search=search,
+                status_filter=status_filter,
+                gender=gender,
+                locker_filter=locker_filter,
+                uniform_filter=uniform_filter,
+                checkin_status=checkin_status,
+                membership_filter=membership_filter,
+                sort_by=sort_by,
+                default_sort=ADMIN_DEFAULT_SORT,
+                after=after,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        try:
+            # 필터/정렬/커서는 공용 컴파일러가 고정 SQL + 파라미터로 만들고, 서버측 prepared statement 로 실행
+            sql, params = query.list_sql(ADMIN_MEMBER_COLUMNS, size, (page - 1) * size)
+            prepared_statements.execute(self.db, sql, params)
+            members, next_cursor = query.page_rows(self.db.fetchall(), size)
+
+            # 5. 전체 개수 조회 (단일 facet 은 증분 카운터, 그 외는 캐시된 COUNT(*))
+            count_sql, count_params = query.count_sql()
+            total, total_exact = MemberCountRepository.count(
+                self.db, count_sql, count_params, query.facet, count, query.checkin_dependent
+            )
             
             # 6. 데이터 포맷팅
             formatted_members = []
@@ -266,7 +196,8 @@ class AdminService:
                 m['id'] = m['member_id']
 
                 # 회원순서 자동 계산 (DB값이 없으면)
-                if m['member_rank'] is None:
+                # 커서 페이지는 앞에 몇 행이 있었는지 모르므로 계산하지 않고 DB값(None) 그대로 둡니다.
+                if m['member_rank'] is None and not after:
                     m['member_rank'] = (page - 1) * size + (i + 1)
 
                 # 별칭을 원래 키 이름으로 변경
@@ -294,7 +225,9 @@ class AdminService:
                 "members": formatted_members,
                 "total": total,
                 "page": page,
-                "size": size
+                "size": size,
+                "next_cursor": next_cursor,
+                "total_exact": total_exact
             }
             
         except Exception as e:
@@ -322,13 +255,13 @@ class AdminService:
                 member_id = existing.get('member_id')
                 print(f"🔵 [DEBUG] 비활성 회원 자동 삭제: member_id={member_id}")
                 
-                # deleted_members와 members에서 완전히 삭제
-                delete_sql1 = "DELETE FROM deleted_members WHERE member_id = %s"
-                self.db.execute(delete_sql1, (member_id,))
-                
-                delete_sql2 = "DELETE FROM members WHERE member_id = %s"
-                self.db.execute(delete_sql2, (member_id,))
+                # members에서 완전히 삭제 (삭제 회원 목록은 members.deleted_at 툼스톤이라 함께 사라짐)
+                delete_sql = "DELETE FROM members WHERE member_id = %s"
+                self.db.execute(delete_sql, (member_id,))
                 self.db.connection.commit()
+                identity_map(self.db).discard('members', member_id)
+                member_index.refresh(self.db, member_id)
+                locker_inventory.invalidate()
                 
                 print(f"🟢 [DEBUG] 비활성 회원 삭제 완료, 회원 추가 진행")
 
@@ -349,6 +282,9 @@ class AdminService:
             
             member_id = self.db.lastrowid
             print(f"🟢 [DEBUG] 회원 추가 성공, member_id: {member_id}")
+            member_index.refresh(self.db, member_id)
+            if kwargs.get('locker_number'):
+                locker_inventory.invalidate()
             
             return {
                 "status": "success",
@@ -360,6 +296,8 @@ class AdminService:
             import traceback
             traceback.print_exc()
             self.db.connection.rollback()
+            if is_locker_taken(e):
+                raise HTTPException(status_code=400, detail="이미 사용 중인 락커입니다.")
             raise HTTPException(status_code=500, detail=f"회원 추가 실패: {str(e)}")
 
     def get_member(self, member_id: int) -> Dict:
@@ -394,6 +332,12 @@ class AdminService:
             values.append(member_id)
             self.db.execute(sql, tuple(values))
             self.db.connection.commit()
+            # 요청 값은 DB 에 저장된 형태가 아니고 트리거가 계산하는 컬럼(membership_status 등)도 빠져 있으므로
+            # 캐시를 버리고 응답은 DB 에서 다시 읽음
+            identity_map(self.db).discard('members', member_id)
+            member_index.refresh(self.db, member_id)
+            if any(key.startswith('locker_') for key in kwargs):
+                locker_inventory.invalidate()
             
             return {
                 "status": "success", 
@@ -402,10 +346,13 @@ class AdminService:
             }
         except Exception as e:
             self.db.connection.rollback()
+            identity_map(self.db).discard('members', member_id)
+            if is_locker_taken(e):
+                raise HTTPException(status_code=400, detail="이미 사용 중인 락커입니다.")
             raise HTTPException(status_code=500, detail=f"수정 실패: {str(e)}")
 
     def delete_member(self, member_id: int) -> Dict:
-        """회원 소프트 삭제 (deleted_members로 이동)"""
+        """회원 소프트 삭제 (members.deleted_at 툼스톤)"""
         try:
             from ..repositories.member_repository import MemberRepository
             
@@ -422,24 +369,19 @@ class AdminService:
             self.db.connection.rollback()
             raise HTTPException(status_code=500, detail=f"삭제 실패: {str(e)}")
 
+    def typeahead_members(self, query: str, limit: int = 10) -> Dict:
+        """검색창 자동완성 (초성/이름/전화번호 접두어, 메모리 인덱스)"""
+        member_index.sync(self.db)
+        return {"query": query, "members": member_index.search(query, limit)}
+
+    def get_occupancy(self) -> Dict:
+        """현재 입장 인원 + 입장 중인 회원 목록 (이름/전화번호 포함이라 관리자 전용)"""
+        total, members = CheckinRepository.get_occupancy(self.db, include_members=True)
+        return {"count": total, "members": members}
+
     def get_today_checkins(self) -> List[Dict]:
         try:
-            sql = """
-                SELECT 
-                    c.id as checkin_id,
-                    c.member_id,
-                    c.checkin_time,
-                    c.checkout_time,
-                    m.name,
-                    m.phone_number,
-                    m.gender,
-                    m.membership_type
-                FROM checkins c
-                JOIN members m ON c.member_id = m.member_id
-                WHERE DATE(c.checkin_time) = CURDATE()
-                ORDER BY c.checkin_time DESC
-            """
-            self.db.execute(sql)
+            self.db.execute(ADMIN_TODAY_CHECKINS_SQL)
             result = self.db.fetchall()
             
             formatted_result = []
@@ -457,4 +399,79 @@ class AdminService:
                 
             return formatted_result
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"당일 입장 조회 실패: {str(e)}")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=f"당일 입장 조회 실패: {str(e)}")
+
+    # ==================== 락커 ====================
+    def get_locker_map(self) -> tuple:
+        """락커 배치도 (상태 / 사용 회원 / 대여 종류 / 만료까지 남은 일수) -> (배치도, ETag)"""
+        return locker_inventory.locker_map(self.db)
+
+    # ==================== 만료 예정 / 알림 ====================
+    def get_upcoming_expiries(self, days: int = 7, kind: Optional[str] = None, limit: int = 200) -> Dict:
+        """오늘부터 days 일 안에 만료되는 회원권/락커/회원복 (만료 스캔 스냅샷, 최대 EXPIRY_HORIZON_DAYS)"""
+        if kind is not None and kind not in EXPIRY_KINDS:
+            raise HTTPException(status_code=400, detail=f"kind 는 {', '.join(EXPIRY_KINDS)} 중 하나입니다.")
+        if days > settings.EXPIRY_HORIZON_DAYS:
+            raise HTTPException(status_code=400, detail=f"조회 기간은 최대 {settings.EXPIRY_HORIZON_DAYS}일입니다.")
+        return {
+            "days": days,
+            "counts": {**{k: 0 for k in EXPIRY_KINDS}, **ExpiryRepository.count_upcoming(self.db, days)},
+            "expiries": ExpiryRepository.get_upcoming(self.db, days, kind, limit),
+        }
+
+    def get_expiry_reminders(self, status_filter: str = "pending", limit: int = 100) -> Dict:
+        """만료 알림 outbox 상태별 목록 / 건수"""
+        if status_filter not in REMINDER_STATUSES:
+            raise HTTPException(status_code=400, detail=f"status 는 {', '.join(REMINDER_STATUSES)} 중 하나입니다.")
+        return {
+            "status": status_filter,
+            "counts": {**{s: 0 for s in REMINDER_STATUSES}, **ExpiryRepository.count_reminders(self.db)},
+            "reminders": ExpiryRepository.get_reminders(self.db, status_filter, limit),
+        }
+
+    # ==================== 출석 통계 (롤업) ====================
+    @staticmethod
+    def _attendance_range(start: Optional[date], end: Optional[date]) -> tuple:
+        """[start, end] (양 끝 포함) -> [start, end + 1일). 기본은 최근 30일"""
+        end = end or date.today()
+        start = start or end - timedelta(days=29)
+        if start > end:
+            raise HTTPException(status_code=400, detail="시작일이 종료일보다 늦습니다.")
+        if (end - start).days >= ATTENDANCE_MAX_DAYS:
+            raise HTTPException(status_code=400, detail=f"조회 기간은 최대 {ATTENDANCE_MAX_DAYS}일입니다.")
+        return start, end + timedelta(days=1)
+
+    def get_attendance_summary(self, start: Optional[date] = None, end: Optional[date] = None) -> Dict:
+        """기간 방문 수 / 평균 이용 시간 + 일별 추이"""
+        start, end = self._attendance_range(start, end)
+        days = AttendanceRepository.get_daily(self.db, start, end)
+        visits = sum(d['visits'] for d in days)
+        closed = sum(d['sessions_closed'] for d in days)
+        duration = sum(d['duration_seconds'] for d in days)
+        return {
+            "start": start,
+            "end": end - timedelta(days=1),
+            "visits": visits,
+            "sessions_closed": closed,
+            "avg_session_minutes": average_minutes(duration, closed),
+            "days": days,
+        }
+
+    def get_peak_hours(self, start: Optional[date] = None, end: Optional[date] = None, top: int = 3) -> Dict:
+        """기간 시간대별 방문 수와 가장 붐비는 시간대 top 개"""
+        start, end = self._attendance_range(start, end)
+        hours = AttendanceRepository.get_hours_of_day(self.db, start, end)
+        peak = sorted((h for h in hours if h['visits']), key=lambda h: h['visits'], reverse=True)[:top]
+        return {"start": start, "end": end - timedelta(days=1), "hours": hours, "peak_hours": [h['hour'] for h in peak]}
+
+    def get_member_attendance(self, member_id: int, year: int) -> Dict:
+        """회원의 연간 월별 방문 수 / 평균 이용 시간"""
+        if not MemberRepository.get_member_by_id(self.db, member_id):
+            raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다.")
+        months = AttendanceRepository.get_member_monthly(self.db, member_id, date(year, 1, 1), date(year + 1, 1, 1))
+        return {
+            "member_id": member_id,
+            "year": year,
+            "visits": sum(m['visits'] for m in months),
+            "months": months,
+        }
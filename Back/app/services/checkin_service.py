@@ -1,8 +1,38 @@
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Any, Optional
-from datetime import datetime
+from datetime import date, datetime, timedelta
+import pymysql
 from fastapi import HTTPException, status
-from ..repositories.checkin_repository import CheckinRepository
+from ..repositories.checkin_repository import CheckinRepository, month_range
+from ..repositories.async_checkin_repository import AsyncCheckinRepository
 from ..repositories.member_repository import MemberRepository
+from ..identity_map import identity_map
+from ..checkin_feed import checkin_feed
+from ..utils.http_cache import make_etag
+from ..config import get_settings
+
+settings = get_settings()
+
+ER_DUP_ENTRY = 1062
+
+# 닫힌 기간(지난달, 지난해)의 회원 달력: (member_id, year, month|None) -> (본문, ETag)
+# 닫힌 기간의 기록은 더 바뀌지 않는다고 보고 만료 없이 LRU 로만 정리합니다.
+_calendar_cache: "OrderedDict[tuple, Tuple[Dict, str]]" = OrderedDict()
+_calendar_cache_lock = threading.Lock()
+
+
+def calendar_range(year: int, month: Optional[int]) -> Tuple[date, date]:
+    """month 가 있으면 그 달, 없으면 그 해의 [시작, 끝) 구간"""
+    if month:
+        return month_range(year, month)
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+
+def is_closed_period(end_date: date, now: Optional[datetime] = None) -> bool:
+    """기간이 끝나고 자동 퇴장 기한까지 지나 더 이상 기록이 바뀌지 않는지"""
+    now = now or datetime.now()
+    return datetime.combine(end_date, datetime.min.time()) + timedelta(minutes=settings.AUTO_CHECKOUT_MINUTES) <= now
 
 class CheckinService:
     def __init__(self, db: Any):
@@ -27,20 +57,39 @@ class CheckinService:
         if membership_end and membership_end < today:
             raise HTTPException(status_code=403, detail="회원권이 만료되었습니다.")
 
-        checkin = CheckinRepository.create_checkin(self.db, member_id)
+        try:
+            checkin = CheckinRepository.create_checkin(self.db, member_id)
+        except pymysql.err.IntegrityError as e:
+            # 동시에 들어온 입장 요청: active_sessions(member_id PK) 트리거가 두 번째 INSERT 를 막음
+            if e.args and e.args[0] == ER_DUP_ENTRY:
+                self.db.connection.rollback()
+                raise HTTPException(status_code=400, detail="이미 입장 상태입니다.")
+            raise
 
         # 입장 시 members 테이블 업데이트: checkin_time 설정, checkout_time NULL로 초기화
         update_sql = "UPDATE members SET checkin_time = %s, checkout_time = NULL WHERE member_id = %s"
         self.db.execute(update_sql, (checkin.get('checkin_time'), member_id))
         self.db.connection.commit()
+        identity_map(self.db).patch('members', member_id, {
+            'checkin_time': checkin.get('checkin_time'), 'checkout_time': None
+        })
+        checkin_feed.publish(
+            "checkin", checkin_id=checkin.get('id'), member_id=member_id,
+            name=member.get('name'), checkin_time=checkin.get('checkin_time')
+        )
+
+        return self._checkin_response(member.get('name'), membership_end, checkin.get('checkin_time'))
 
+    @staticmethod
+    def _checkin_response(name: str, membership_end, checkin_time: datetime) -> Dict:
+        today = datetime.now().date()
         response = {
             "status": "success",
             "member_info": {
-                "name": member.get('name'),
+                "name": name,
                 "membership_end_date": membership_end
             },
-            "checkin_time": checkin.get('checkin_time').strftime("%Y-%m-%d %H:%M:%S"),
+            "checkin_time": checkin_time.strftime("%Y-%m-%d %H:%M:%S"),
             "warnings": []
         }
 
@@ -54,6 +103,57 @@ class CheckinService:
 
         return response
 
+    def kiosk_checkin(self, member_id: int) -> Dict:
+        """키오스크 입장 (sp_kiosk_checkin 한 번의 호출로 검증 + 기록)"""
+        try:
+            row = CheckinRepository.kiosk_checkin(self.db, member_id)
+        except pymysql.err.MySQLError as e:
+            # 1305: PROCEDURE does not exist (setup_all 미실행 DB) -> 기존 단계별 처리
+            if e.args and e.args[0] == 1305:
+                return self._kiosk_checkin_stepwise(member_id)
+            if e.args and e.args[0] == ER_DUP_ENTRY:
+                # 동시에 들어온 입장 요청 (active_sessions 트리거), process_checkin 과 같은 처리
+                self.db.connection.rollback()
+                raise HTTPException(status_code=400, detail="이미 입장 상태입니다.")
+            raise
+
+        result = row['result']
+        if result == 'deleted':
+            print(f"❌ [삭제된 회원] member_id={member_id}")
+            raise HTTPException(status_code=403, detail="휴면회원입니다. 카운터에 문의하세요.")
+        if result == 'not_found':
+            raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다.")
+        if result == 'expired':
+            print(f"❌ [회원권 만료] member_id={member_id}")
+            return {
+                "status": "expired",
+                "message": "회원권이 만료되었습니다.",
+                "member_info": {
+                    "name": row['name'],
+                    "membership_end_date": row['membership_end_date'],
+                }
+            }
+        if result == 'already_checked_in':
+            print(f"❌ [체크인 실패] member_id={member_id} 이미 입장 상태")
+            raise HTTPException(status_code=400, detail="이미 입장 상태입니다.")
+
+        checkin_feed.publish(
+            "checkin", checkin_id=row.get('checkin_id'), member_id=member_id,
+            name=row['name'], checkin_time=row['checkin_time']
+        )
+        return self._checkin_response(row['name'], row['membership_end_date'], row['checkin_time'])
+
+    def _kiosk_checkin_stepwise(self, member_id: int) -> Dict:
+        from .member_service import MemberService
+
+        if MemberRepository.get_member_state(self.db, member_id) == 'dormant':
+            raise HTTPException(status_code=403, detail="휴면회원입니다. 카운터에 문의하세요.")
+
+        validity = MemberService(self.db).check_member_validity(member_id)
+        if validity["status"] == "expired":
+            return validity
+        return self.process_checkin(member_id)
+
     def process_checkout(self, checkin_id: int) -> Dict:
         """퇴장 처리"""
         checkin = CheckinRepository.get_checkin_by_id(self.db, checkin_id)
@@ -79,6 +179,15 @@ class CheckinService:
         update_sql = "UPDATE members SET checkin_time = NULL, checkout_time = %s WHERE member_id = %s"
         self.db.execute(update_sql, (updated_checkin.get('checkout_time'), checkin.get('member_id')))
         self.db.connection.commit()
+        identity_map(self.db).patch('members', checkin.get('member_id'), {
+            'checkin_time': None, 'checkout_time': updated_checkin.get('checkout_time')
+        })
+        checkin_feed.publish(
+            "checkout", checkin_id=checkin_id, member_id=checkin.get('member_id'),
+            name=member.get('name') if member else None,
+            checkin_time=checkin.get('checkin_time'), checkout_time=updated_checkin.get('checkout_time'),
+            auto=False
+        )
 
         return {
             "status": "success",
@@ -95,24 +204,61 @@ class CheckinService:
         skip = (page - 1) * size
         return CheckinRepository.get_today_checkins(self.db, skip, size)
 
-    def get_member_checkins(self, member_id: int, year: int, month: int) -> List[dict]:
+    def get_member_calendar(self, member_id: int, year: int, month: Optional[int] = None) -> Tuple[Dict, str, bool]:
+        """
+        회원 달력: 한 달(또는 한 해)의 일별 방문 수 / 이용 시간(분) / 첫 입장 시각
+        -> (본문, ETag, 닫힌 기간 여부). 닫힌 기간은 프로세스 캐시에서 바로 돌려줍니다.
+        """
         if not MemberRepository.get_member_by_id(self.db, member_id):
             raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다.")
-        return CheckinRepository.get_member_checkins(self.db, member_id, year, month)
-    
-    # [키오스크용 함수]
-    def process_checkin_by_id(self, member_id: int):
-        member = MemberRepository.get_member_by_id(self.db, member_id)
-        if not member:
-            raise ValueError("회원 정보가 없습니다.")
-            
-        if member['membership_end_date'] and member['membership_end_date'] < datetime.now().date():
-             return {"status": "expired", "message": "회원권이 만료되었습니다."}
+        start_date, end_date = calendar_range(year, month)
+        closed = is_closed_period(end_date)
+        key = (member_id, year, month)
+        if closed:
+            with _calendar_cache_lock:
+                cached = _calendar_cache.get(key)
+                if cached:
+                    _calendar_cache.move_to_end(key)
+                    return cached[0], cached[1], True
 
-        CheckinRepository.create_checkin(self.db, member_id)
-        
-        return {
-            "status": "success", 
-            "message": f"{member['name']}님 환영합니다!",
-            "member_name": member['name']
-        }
\ No newline at end of file
+        days = [
+            {
+                "date": row['day'].isoformat(),
+                "visits": int(row['visits']),
+                "minutes": int(row['duration_seconds']) // 60,
+                "first_checkin": row['first_checkin'].strftime('%H:%M'),
+            }
+            for row in CheckinRepository.get_member_calendar(self.db, member_id, start_date, end_date)
+        ]
+        payload = {
+            "member_id": member_id,
+            "year": year,
+            "month": month,
+            "closed": closed,
+            "visits": sum(d['visits'] for d in days),
+            "visit_days": len(days),
+            "total_minutes": sum(d['minutes'] for d in days),
+            "days": days,
+        }
+        etag = make_etag(payload)
+        if closed:
+            with _calendar_cache_lock:
+                _calendar_cache[key] = (payload, etag)
+                while len(_calendar_cache) > settings.CALENDAR_CACHE_SIZE:
+                    _calendar_cache.popitem(last=False)
+        return payload, etag, closed
+
+
+class AsyncCheckinService:
+    """조회 전용 비동기 서비스 (get_async_db 커서 사용)"""
+
+    def __init__(self, db: Any):
+        self.db = db
+
+    async def get_occupancy(self, include_members: bool = False) -> Dict:
+        total, members = await AsyncCheckinRepository.get_occupancy(self.db, include_members)
+        return {"count": total, "members": members if include_members else None}
+
+    async def get_today_checkins(self, page: int = 1, size: int = 50) -> Tuple[List[dict], int]:
+        skip = (page - 1) * size
+        return await AsyncCheckinRepository.get_today_checkins(self.db, skip, size)
@@ -46,12 +46,12 @@ class DeletedMemberService:
             )
         return {"status": "success", "message": "회원이 영구 삭제되었습니다."}
     
-    def permanent_delete_all(self) -> dict:
-        """모든 삭제된 회원 영구 삭제"""
-        count = self.deleted_member_repo.permanent_delete_all(self.db)
+    def permanent_delete_all(self, batch_size: Optional[int] = None) -> dict:
+        """모든 삭제된 회원 영구 삭제 (배치마다 커밋)"""
+        count = self.deleted_member_repo.permanent_delete_all(self.db, batch_size)
         return {"status": "success", "message": f"{count}명의 회원이 영구 삭제되었습니다.", "count": count}
     
-    def restore_all(self) -> dict:
-        """모든 삭제된 회원 복원"""
-        count = self.deleted_member_repo.restore_all(self.db)
+    def restore_all(self, batch_size: Optional[int] = None) -> dict:
+        """모든 삭제된 회원 복원 (배치마다 커밋)"""
+        count = self.deleted_member_repo.restore_all(self.db, batch_size)
         return {"status": "success", "message": f"{count}명의 회원이 복원되었습니다.", "count": count}
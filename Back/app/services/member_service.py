@@ -64,6 +64,9 @@ class MemberService:
         return self.member_repo.soft_delete_member(self.db, member_id)
 
     # 키오스크 호환용
+    def probe_phone_tail(self, last_four: str) -> Tuple[str, List[dict]]:
+        return self.member_repo.probe_phone_tail(self.db, last_four)
+
     def search_by_last_four_digits(self, last_four: str) -> List[dict]:
         return self.member_repo.list_members_by_phone_tail(self.db, last_four)
     
@@ -82,22 +85,30 @@ class MemberService:
         membership_filter: Optional[str] = None,
         checkin_status: Optional[str] = None,
         locker_filter: bool = False,
-        uniform_filter: bool = False
-    ) -> Tuple[List[dict], int]:
+        uniform_filter: bool = False,
+        after: Optional[str] = None,
+        count_mode: str = "exact"
+    ) -> Tuple[List[dict], Optional[int], Optional[str]]:
         skip = (page - 1) * size
-        return self.member_repo.get_members_paginated(
-            self.db,
-            skip=skip,
-            limit=size,
-            search=search,
-            status=status,
-            gender=gender,
-            sort_by=sort_by,
-            membership_filter=membership_filter,
-            checkin_status=checkin_status,
-            locker_filter=locker_filter,
-            uniform_filter=uniform_filter
-        )
+        try:
+            return self.member_repo.get_members_paginated(
+                self.db,
+                skip=skip,
+                limit=size,
+                search=search,
+                status=status,
+                gender=gender,
+                sort_by=sort_by,
+                membership_filter=membership_filter,
+                checkin_status=checkin_status,
+                locker_filter=locker_filter,
+                uniform_filter=uniform_filter,
+                after=after,
+                count_mode=count_mode
+            )
+        except ValueError as e:
+            # 잘못된 커서
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     def check_member_validity(self, member_id: int) -> Dict:
         member = self.get_member(member_id)
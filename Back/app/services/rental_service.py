@@ -8,6 +8,7 @@ from ..schemas.locker_rental import LockerRentalCreate
 from ..schemas.uniform_rental import UniformRentalCreate
 from ..utils.validators import validate_rental_type, validate_locker_number, get_rental_months
 from ..utils.date_utils import calculate_end_date
+from ..locker_inventory import locker_inventory, is_locker_taken
 
 
 class RentalService:
@@ -59,12 +60,25 @@ class RentalService:
                 detail="잘못된 대여 기간입니다."
             )
 
-        locker = self.locker_repo.create_locker_rental(
-            self.db,
-            member_id,
-            locker_data,
-            date.today()
-        )
+        # 위 확인과 배정 사이에 다른 요청이 같은 락커를 가져가면 sp_locker_assign 이 SIGNAL 로 막음
+        try:
+            locker = self.locker_repo.create_locker_rental(
+                self.db,
+                member_id,
+                locker_data,
+                date.today()
+            )
+        except Exception as e:
+            self.db.connection.rollback()
+            if is_locker_taken(e):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="이미 사용 중인 락커입니다."
+                )
+            raise
+        # 커밋 후 비워야 다른 요청이 커밋 전 상태로 배치도/비트맵을 다시 채우지 않음
+        self.db.connection.commit()
+        locker_inventory.invalidate()
 
         return {
             "status": "success",
@@ -148,6 +162,8 @@ class RentalService:
             rental_type,
             new_end_date
         )
+        self.db.connection.commit()
+        locker_inventory.invalidate()
 
         return {
             "status": "success",
@@ -157,6 +173,26 @@ class RentalService:
             "new_end_date": updated_locker.get('end_date')
         }
 
+    def release_locker_rental(self, member_id: int) -> Dict:
+        # 대여 정보 확인
+        locker = self.locker_repo.get_locker_by_member(self.db, member_id)
+        if not locker:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="대여 중인 락커가 없습니다."
+            )
+
+        # 반납 처리 (lockers 재고에서도 비움)
+        self.locker_repo.release_locker(self.db, locker.get('locker_id'))
+        self.db.connection.commit()
+        locker_inventory.invalidate()
+
+        return {
+            "status": "success",
+            "message": "락커가 반납되었습니다.",
+            "locker_number": locker.get('locker_number')
+        }
+
     def extend_uniform_rental(
         self,
         member_id: int,
@@ -194,10 +230,11 @@ class RentalService:
             "new_end_date": updated_uniform.get('end_date')
         }
 
-    def get_available_lockers(self) -> Dict:
-        available = self.locker_repo.get_available_lockers(self.db)
+    def get_available_lockers(self, zone: Optional[str] = None) -> Dict:
+        available = self.locker_repo.get_available_lockers(self.db, zone)
         return {
             "available_lockers": available,
             "total_available": len(available),
-            "total_lockers": 100
-        }
\ No newline at end of file
+            "total_lockers": locker_inventory.total(self.db),
+            "zones": locker_inventory.zone_summary(self.db)
+        }
@@ -0,0 +1,34 @@
+"""
+ETag 조건부 응답
+- 본문이 같으면 같은 ETag 를 돌려주고, If-None-Match 가 맞으면 본문 없이 304 를 보냅니다.
+- immutable=True 면 다시 바뀌지 않는 응답(닫힌 달의 달력 등)으로 보고 브라우저가 재검증 없이 캐시하게 합니다.
+"""
+import hashlib
+import json
+from typing import Any
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(payload: Any) -> str:
+    body = json.dumps(jsonable_encoder(payload), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return '"' + hashlib.sha1(body.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def etag_response(request: Request, payload: Any, etag: str, immutable: bool = False) -> Response:
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL}
+    if _matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(jsonable_encoder(payload), headers=headers)
@@ -0,0 +1,220 @@
+"""
+회원 목록 필터/정렬 SQL 컴파일러
+members / deleted_members 목록과 개수 쿼리를 한 곳에서 만듭니다. (AdminService, MemberRepository, DeletedMemberRepository)
+- 삭제 회원도 members 테이블에서 읽습니다. (deleted_at 툼스톤, migrations.setup_member_tombstones)
+- 검색어, 성별, 커서 값, LIMIT/OFFSET 등 요청마다 바뀌는 값은 전부 %s 파라미터로만 들어갑니다.
+- SQL 본문은 (테이블, 적용된 필터 종류, 정렬, 커서 유무) 조합으로만 달라지므로 가짓수가 작고 고정되어 있어
+  서로 다른 검색어도 같은 문장을 재사용합니다. -> prepared.py 의 서버측 prepared statement 캐시
+- 테이블 별칭은 항상 m 입니다.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from .pagination import encode_cursor, decode_cursor, keyset_condition
+from .search import member_search_condition
+
+# 회원 목록 정렬: sort_by -> (정렬 키 식, 방향). 동순위는 member_id 로 같은 방향 정렬
+# 기본 정렬(None)은 화면마다 달라서 호출하는 쪽에서 default_sort 로 넘깁니다.
+MEMBER_SORTS: Dict[str, Tuple[str, str]] = {
+    'recent_checkin': ("m.last_checkin_time", "DESC"),  # idx_members_active_last_checkin 사용
+    'name': ("m.name", "ASC"),
+    'end_date': ("m.membership_end_date", "ASC"),
+    'created_at': ("m.created_at", "DESC"),
+    'member_rank_desc': ("m.member_id", "DESC"),  # member_id 내림차순
+    'member_rank_asc': ("m.member_id", "ASC"),    # member_id 오름차순
+    # 종류 정렬: membership_catalog 의 순위를 저장한 컬럼 + (is_active, 순위) 인덱스
+    # PT(1개월) .. PT(1년), 1개월 .. 1년 / 대여는 1개월 .. 12개월(1년), 미사용은 맨 뒤
+    'membership_type_asc': ("m.membership_rank", "ASC"),
+    'locker_type_asc': ("m.locker_rank", "ASC"),
+    'uniform_type_asc': ("m.uniform_rank", "ASC"),
+    'checkin_time_desc': ("m.checkin_time", "DESC"),
+    'checkout_time_desc': ("m.checkout_time", "DESC"),
+}
+
+DELETED_MEMBER_SORTS: Dict[str, Tuple[str, str]] = {
+    'deleted_at': ("m.deleted_at", "DESC"),  # idx_members_deleted_at 사용
+}
+
+# table 인자 -> (FROM 테이블, 항상 붙는 조건)
+MEMBER_TABLES: Dict[str, Tuple[str, str]] = {
+    "members": ("members", "m.is_active = TRUE"),
+    "deleted_members": ("members", "m.deleted_at IS NOT NULL"),
+}
+
+# 필터 이름 -> 고정 SQL 조건 (%s 가 있으면 값은 파라미터로)
+# 이름은 member_facet_counts 의 facet 이름과 같습니다. (migrations.MEMBER_FACETS)
+# 입장 상태 필터(checked_in / checked_out / checkout_time)는 카운터 대신 active_sessions 로 셉니다. (MemberCountRepository)
+MEMBER_FILTERS: Dict[str, str] = {
+    # membership_status: 0 만료일 없음, 1 활성, 2 곧 만료, 3 만료 (migrations.MEMBER_STATUS_EXPR)
+    "status:active": "m.membership_status <= 2",
+    "status:inactive": "m.membership_status = 3",
+    "status:expiring_soon": "m.membership_status = 2",
+    "gender": "m.gender = %s",
+    "locker": "m.locker_type IS NOT NULL",
+    "uniform": "m.uniform_type IS NOT NULL",
+    # 입장 중: active_sessions (입장 인원만큼만 읽음, migrations.setup_active_sessions)
+    "checked_in": "m.member_id IN (SELECT s.member_id FROM active_sessions s)",
+    # 퇴장: 관리자 목록은 마지막 방문 투영 컬럼, /members 목록은 현재 세션 컬럼 기준
+    "checked_out": "m.last_checkout_time IS NOT NULL",
+    "checkout_time": "m.checkout_time IS NOT NULL",
+    "pt": "m.membership_type LIKE 'PT%%'",
+    "membership": "m.membership_type NOT LIKE 'PT%%' AND m.membership_type IS NOT NULL",
+}
+
+# checkin_status 값 -> 필터 이름 (checkin_source 별)
+_CHECKIN_FILTERS = {
+    "projection": {"active": "checked_in", "inactive": "checked_out"},
+    "session": {"active": "checked_in", "inactive": "checkout_time"},
+}
+
+
+class MemberQuery:
+    """compile_member_query 결과: FROM/WHERE 절, 파라미터, 정렬, 개수 카운터 facet"""
+
+    def __init__(self, table: str, where: List[str], params: List[Any], sort_by: Optional[str],
+                 sort_expr: str, direction: str, facet: Optional[str], keyset: Optional[Tuple[str, List[Any]]],
+                 checkin_dependent: bool = False):
+        self.table = table
+        self.where = where
+        self.params = params
+        self.sort_by = sort_by
+        self.sort_expr = sort_expr
+        self.direction = direction
+        self.facet = facet
+        self.checkin_dependent = checkin_dependent  # 입장 상태 필터 포함 (카운트 캐시는 active_sessions 기준으로 무효화)
+        self._keyset = keyset
+
+    @property
+    def where_clause(self) -> str:
+        return " AND ".join(self.where) if self.where else "1=1"
+
+    @property
+    def order_clause(self) -> str:
+        # 정렬 키 + member_id 로 순서를 완전히 고정해야 커서가 안정적
+        order = f"{self.sort_expr} {self.direction}"
+        if self.sort_expr != "m.member_id":
+            order += f", m.member_id {self.direction}"
+        return order
+
+    def count_sql(self) -> Tuple[str, List[Any]]:
+        """개수 쿼리 (커서 조건 제외)"""
+        return (
+            f"SELECT COUNT(*) AS total FROM {self.table} m WHERE {self.where_clause}",
+            list(self.params),
+        )
+
+    def list_sql(self, columns: str, limit: int, offset: int = 0) -> Tuple[str, List[Any]]:
+        """
+        목록 쿼리. columns 는 m. 별칭을 쓴 고정 컬럼 목록이며, 커서용 sort_key 컬럼이 덧붙습니다.
+        다음 페이지 존재 여부를 알기 위해 limit + 1 행을 읽습니다. (page_rows 참고)
+        """
+        where = self.where_clause
+        params = list(self.params)
+        if self._keyset:
+            # 키셋 페이지네이션: 커서가 있으면 OFFSET 없이 마지막 행 이후부터
+            condition, condition_params = self._keyset
+            where += f" AND {condition}"
+            params.extend(condition_params)
+            offset = 0
+        sql = f"""
+        SELECT {columns},
+            {self.sort_expr} AS sort_key
+        FROM {self.table} m
+        WHERE {where}
+        ORDER BY {self.order_clause}
+        LIMIT %s OFFSET %s
+        """
+        params.extend([limit + 1, offset])
+        return sql, params
+
+    def page_rows(self, rows: List[dict], limit: int) -> Tuple[List[dict], Optional[str]]:
+        """list_sql 결과를 limit 행으로 자르고 다음 페이지 커서를 만듭니다. (sort_key 컬럼은 제거)"""
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(self.sort_by, last['sort_key'], last['member_id'])
+        for row in rows:
+            row.pop('sort_key', None)
+        return rows, next_cursor
+
+
+def compile_member_query(
+    table: str = "members",
+    search: Optional[str] = None,
+    status_filter: Optional[str] = None,
+    gender: Optional[str] = None,
+    locker_filter: bool = False,
+    uniform_filter: bool = False,
+    checkin_status: Optional[str] = None,
+    membership_filter: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    default_sort: Tuple[str, str] = ("m.member_id", "DESC"),
+    sorts: Optional[Dict[str, Tuple[str, str]]] = None,
+    after: Optional[str] = None,
+    checkin_source: str = "projection",
+) -> MemberQuery:
+    """
+    필터/정렬/커서를 MemberQuery 로 변환합니다.
+    - table 이 members 면 활성 회원(is_active = TRUE), deleted_members 면 삭제된 회원(deleted_at 이 있는 행)만 대상으로 합니다.
+    - after 는 이전 응답의 next_cursor. 형식이 틀렸거나 다른 정렬의 커서면 ValueError
+    - facet: 적용된 필터가 없거나 하나뿐이면 그 개수를 바로 주는 증분 카운터 이름, 아니면 None
+    """
+    sorts = MEMBER_SORTS if sorts is None else sorts
+    keyset_value = decode_cursor(after, sort_by) if after else None
+
+    where: List[str] = []
+    params: List[Any] = []
+    applied: List[Optional[str]] = []  # 적용된 필터의 facet 이름 (카운터가 없는 필터는 None)
+
+    source, base_condition = MEMBER_TABLES[table]
+    where.append(base_condition)
+
+    # 검색 (공백 무시, search_text ngram FULLTEXT 인덱스)
+    search_sql, search_params = member_search_condition(search, "m.search_text")
+    if search_sql:
+        where.append(search_sql)
+        params.extend(search_params)
+        applied.append(None)
+
+    def add(name: str, *values):
+        where.append(MEMBER_FILTERS[name])
+        params.extend(values)
+
+    if status_filter in ("active", "inactive", "expiring_soon"):
+        add(f"status:{status_filter}")
+        applied.append(f"status:{status_filter}")
+
+    if gender:
+        add("gender", gender)
+        applied.append(f"gender:{gender}" if gender in ("M", "F") else None)
+
+    if locker_filter:
+        add("locker")
+        applied.append("locker")
+
+    if uniform_filter:
+        add("uniform")
+        applied.append("uniform")
+
+    checkin_filter = _CHECKIN_FILTERS[checkin_source].get(checkin_status)
+    if checkin_filter:
+        add(checkin_filter)
+        applied.append(checkin_filter)
+
+    if membership_filter in ("pt", "membership"):
+        add(membership_filter)
+        applied.append(membership_filter)
+
+    if table != "members":
+        facet = None  # deleted_members 는 증분 카운터가 없음
+    elif not applied:
+        facet = "active"
+    else:
+        facet = applied[0] if len(applied) == 1 else None
+
+    sort_expr, direction = sorts.get(sort_by, default_sort) if sort_by else default_sort
+    keyset = None
+    if keyset_value:
+        keyset = keyset_condition(sort_expr, direction, *keyset_value, id_expr="m.member_id")
+
+    return MemberQuery(source, where, params, sort_by, sort_expr, direction, facet, keyset,
+                       checkin_dependent=checkin_filter is not None)
@@ -0,0 +1,81 @@
+"""
+키셋(커서) 페이지네이션 헬퍼
+커서는 (정렬 키 값, member_id) 를 담은 불투명 문자열이며, 다음 페이지는
+OFFSET 대신 "마지막 행 이후" 조건으로 조회합니다.
+MySQL 정렬 규칙에 맞춰 NULL 은 ASC 에서 맨 앞, DESC 에서 맨 뒤로 취급합니다.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("잘못된 커서 값입니다.")
+    return value
+
+
+def encode_cursor(sort_by: Optional[str], sort_value: Any, member_id: int) -> str:
+    payload = {"s": sort_by, "k": [_encode_value(sort_value), member_id]}
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort_by: Optional[str]) -> Tuple[Any, int]:
+    """커서를 (정렬 키 값, member_id) 로 해석. 형식이 틀렸거나 다른 정렬의 커서면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+        sort_value, member_id = payload["k"]
+    except Exception:
+        raise ValueError("잘못된 커서입니다.")
+    if payload.get("s") != sort_by:
+        raise ValueError("정렬 기준이 바뀐 커서입니다. 첫 페이지부터 다시 조회하세요.")
+    if not isinstance(member_id, int):
+        raise ValueError("잘못된 커서입니다.")
+    return _decode_value(sort_value), member_id
+
+
+def keyset_condition(
+    sort_expr: str,
+    direction: str,
+    sort_value: Any,
+    member_id: int,
+    id_expr: str = "member_id"
+) -> Tuple[str, List[Any]]:
+    """
+    ORDER BY {sort_expr} {direction}, {id_expr} {direction} 순서에서
+    (sort_value, member_id) 다음 행들을 고르는 WHERE 조건과 파라미터
+    """
+    descending = direction.upper() == "DESC"
+    cmp = "<" if descending else ">"
+
+    # 정렬 키가 member_id 자체면 id 비교만으로 충분
+    if sort_expr == id_expr:
+        return f"{id_expr} {cmp} %s", [member_id]
+
+    if sort_value is None:
+        if descending:
+            # DESC 에서 NULL 은 마지막 → NULL 구간 안에서만 이어짐
+            return f"({sort_expr} IS NULL AND {id_expr} {cmp} %s)", [member_id]
+        # ASC 에서 NULL 은 처음 → 남은 NULL 구간 + NULL 이 아닌 모든 행
+        return f"(({sort_expr} IS NULL AND {id_expr} {cmp} %s) OR {sort_expr} IS NOT NULL)", [member_id]
+
+    condition = f"({sort_expr} {cmp} %s OR ({sort_expr} = %s AND {id_expr} {cmp} %s)"
+    if descending:
+        condition += f" OR {sort_expr} IS NULL"
+    condition += ")"
+    return condition, [sort_value, sort_value, member_id]
@@ -0,0 +1,34 @@
+"""
+회원 이름/전화번호 검색 조건 생성
+members 의 search_text 생성 컬럼(공백 없는 이름 + 숫자만 남긴 전화번호)에
+ngram FULLTEXT 인덱스(ft_members_search)가 걸려 있습니다. 삭제 회원 목록도 같은 인덱스를 씁니다. (migrations.add_member_search_index)
+- 2글자 이상: MATCH ... AGAINST('"검색어"' IN BOOLEAN MODE) 로 인덱스를 타고,
+  ngram 구문(phrase) 검색이 놓칠 수 없는 부분 문자열 조건(LIKE)으로 결과를 한 번 더 확인합니다.
+- 1글자: ngram(2글자) 토큰으로 찾을 수 없으므로 search_text LIKE 로 처리합니다.
+"""
+import re
+from typing import List, Optional, Tuple
+
+_PHONE_LIKE = re.compile(r"^[0-9\-\s]+$")
+
+
+def normalize_search(search: Optional[str]) -> str:
+    """공백 제거, 전화번호 형태(숫자/하이픈)면 하이픈도 제거"""
+    if not search:
+        return ""
+    term = re.sub(r"\s+", "", search)
+    if _PHONE_LIKE.match(term):
+        term = term.replace("-", "")
+    # FULLTEXT 구문 검색의 따옴표와 LIKE 와일드카드는 검색어로 쓰지 않음
+    return term.replace('"', "").replace("%", "").replace("_", "").replace("\\", "")
+
+
+def member_search_condition(search: Optional[str], column: str = "search_text") -> Tuple[Optional[str], List[str]]:
+    """검색어가 없으면 (None, [])"""
+    term = normalize_search(search)
+    if not term:
+        return None, []
+    like = f"%{term}%"
+    if len(term) < 2:
+        return f"{column} LIKE %s", [like]
+    return f"(MATCH({column}) AGAINST (%s IN BOOLEAN MODE) AND {column} LIKE %s)", [f'"{term}"', like]
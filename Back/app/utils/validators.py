@@ -1,5 +1,6 @@
 import re
 from typing import Optional
+from ..config import get_settings
 
 def validate_phone_number(phone: str) -> bool:
     """
@@ -19,9 +20,9 @@ def validate_last_four_digits(digits: str) -> bool:
 
 def validate_locker_number(locker_num: int) -> bool:
     """
-    락커 번호 범위 검증 (1-100)
+    락커 번호 범위 검증 (1-LOCKER_COUNT)
     """
-    return 1 <= locker_num <= 100
+    return 1 <= locker_num <= get_settings().LOCKER_COUNT
 
 def validate_rental_type(rental_type: str) -> bool:
     """
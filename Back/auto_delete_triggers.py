@@ -18,7 +18,7 @@ if __name__ == "__main__":
         print("\n다음 명령어로 확인할 수 있습니다:")
         print("  - SHOW EVENTS;")
         print("  - SHOW TRIGGERS LIKE 'members';")
-        print("  - SHOW TABLES LIKE 'deleted_members';")
+        print("  - SHOW FULL TABLES LIKE 'deleted_members';  (members.deleted_at 위의 호환 뷰)")
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ 설정 중 오류가 발생했습니다: {e}")
@@ -0,0 +1,43 @@
+"""벤치마크 스크립트 공용 헬퍼"""
+import sys
+import os
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def time_calls(fn, repeat: int = 200):
+    """fn() 을 repeat 번 실행하고 (p50, p99, mean) 을 밀리초 단위로 반환"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentile(samples, 50), percentile(samples, 99), sum(samples) / len(samples)
+
+
+def random_phone(rng: random.Random) -> str:
+    return f"010{rng.randint(0, 99999999):08d}"
+
+
+def bulk_insert(cursor, sql: str, rows, batch_size: int = 5000):
+    """executemany 를 batch_size 단위로 나눠 실행 (대용량 시드용)"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            cursor.executemany(sql, batch)
+            cursor.connection.commit()
+            batch = []
+    if batch:
+        cursor.executemany(sql, batch)
+        cursor.connection.commit()
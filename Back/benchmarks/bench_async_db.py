@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+async 라우트 동시 처리량 벤치마크
+- before : async def 핸들러에서 동기 pymysql 쿼리를 그대로 실행 (이벤트 루프 차단)
+- offload: 동일한 동기 쿼리를 run_db()로 제한된 스레드 풀에서 실행
+- async  : aiomysql 풀로 비동기 실행
+
+실행: python benchmarks/bench_async_db.py --requests 200 --concurrency 50 --query-seconds 0.02
+(.env 의 DB 설정을 사용하며, 각 요청은 SELECT SLEEP(n) 으로 느린 쿼리를 흉내냅니다.)
+"""
+import sys
+import os
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+from app.database import get_cursor, run_db, get_pool, close_pool
+from app.async_database import get_async_cursor, init_async_pool, close_async_pool
+
+
+def build_app(query_seconds: float) -> FastAPI:
+    app = FastAPI()
+
+    def slow_query(cursor):
+        cursor.execute("SELECT SLEEP(%s) AS s", (query_seconds,))
+        return cursor.fetchone()
+
+    @app.get("/before")
+    async def before():
+        with get_cursor() as cursor:
+            return slow_query(cursor)
+
+    @app.get("/offload")
+    async def offload():
+        return await run_db(slow_query)
+
+    @app.get("/async")
+    async def async_route():
+        async with get_async_cursor() as cursor:
+            await cursor.execute("SELECT SLEEP(%s) AS s", (query_seconds,))
+            return await cursor.fetchone()
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - started
+
+
+async def main(args):
+    get_pool().warm()
+    await init_async_pool()
+    app = build_app(args.query_seconds)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        print(f"요청 {args.requests}건, 동시성 {args.concurrency}, 쿼리 {args.query_seconds}s")
+        print(f"{'mode':<10}{'elapsed(s)':>12}{'req/s':>10}")
+        for path in ("/before", "/offload", "/async"):
+            await measure(client, path, min(args.concurrency, args.requests), args.concurrency)  # warm-up
+            elapsed = await measure(client, path, args.requests, args.concurrency)
+            print(f"{path[1:]:<10}{elapsed:>12.3f}{args.requests / elapsed:>10.1f}")
+    await close_async_pool()
+    close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-seconds", type=float, default=0.02)
+    asyncio.run(main(parser.parse_args()))
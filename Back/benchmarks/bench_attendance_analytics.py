@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+출석 분석(analytics.py) 벤치마크
+5년치 합성 출입 기록(기본 하루 600건, 약 110만 세션)을 만들어
+- 배치 변환: 서버측 커서가 주는 (입장 초, 퇴장 초) 튜플 배치를 NumPy 배열로 모으는 시간
+- 계산    : 구간 스윕 점유 히트맵 + 이용 시간 분포 (compute_attendance)
+을 잽니다. DB 없이 실행됩니다.
+
+실행: python benchmarks/bench_attendance_analytics.py --years 5 --per-day 600
+"""
+import argparse
+import time
+from datetime import date, datetime
+
+import numpy as np
+
+from _common import percentile
+from app.analytics import compute_attendance, to_seconds
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def synthetic_sessions(days: int, per_day: int, start_s: int, seed: int) -> np.ndarray:
+    """저녁 피크가 있는 입장 시각, 로그정규 이용 시간, 일부 자동 퇴장/입장 중 세션"""
+    rng = np.random.default_rng(seed)
+    n = days * per_day
+    day = rng.integers(0, days, n)
+    hour = np.clip(np.where(rng.random(n) < 0.6, rng.normal(19, 1.5, n), rng.normal(8, 2, n)), 5, 23)
+    checkin = start_s + day * 86400 + (hour * 3600).astype(np.int64)
+    duration = np.clip(rng.lognormal(np.log(70 * 60), 0.4, n), 10 * 60, None).astype(np.int64)
+    duration = np.where(rng.random(n) < 0.03, settings.AUTO_CHECKOUT_MINUTES * 60, duration)  # 퇴장 미기록 -> 자동 퇴장
+    checkout = np.where(checkin >= start_s + days * 86400 - 2 * 3600, -1, checkin + duration)  # 마지막 두 시간은 입장 중
+    return np.column_stack([checkin, checkout]).astype(np.int64)
+
+
+def run(years: int, per_day: int, batch_size: int, repeat: int):
+    end = date.today()
+    start = end.replace(year=end.year - years)
+    start_s = to_seconds(datetime.combine(start, datetime.min.time()))
+    end_s = to_seconds(datetime.combine(end, datetime.min.time()))
+    days = (end - start).days
+    sessions = synthetic_sessions(days, per_day, start_s, seed=7)
+    print(f"합성 세션 {len(sessions):,}건 ({start} ~ {end}, {days}일)")
+
+    # 서버측 커서 fetchmany 결과와 같은 모양(튜플 리스트)으로 배치를 만들어 변환 시간만 측정
+    batches = [list(map(tuple, sessions[i:i + batch_size].tolist())) for i in range(0, len(sessions), batch_size)]
+    convert, compute = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        loaded = np.concatenate([np.array(rows, dtype=np.int64) for rows in batches])
+        convert.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        result = compute_attendance(loaded, start_s, end_s, end_s)
+        compute.append(time.perf_counter() - started)
+
+    print(f"{'step':<12}{'p50(s)':>10}{'max(s)':>10}")
+    print(f"{'convert':<12}{percentile(convert, 50):>10.3f}{max(convert):>10.3f}")
+    print(f"{'compute':<12}{percentile(compute, 50):>10.3f}{max(compute):>10.3f}")
+    print(f"세션 {result['sessions']:,} / 자동 퇴장 {result['auto_checkout_sessions']:,} / 입장 중 {result['open_sessions']:,}")
+    print(f"최대 동시 인원 {result['peak_occupancy']} ({result['peak_at']}), "
+          f"이용 시간 p50 {result['durations']['p50_minutes']}분 / p90 {result['durations']['p90_minutes']}분")
+    weekday, hour = divmod(int(np.argmax(result['heatmap'])), 24)
+    print(f"가장 붐비는 칸: {result['weekdays'][weekday]}요일 {hour}시 "
+          f"(평균 {result['heatmap'][weekday][hour]}명)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--per-day", type=int, default=600)
+    parser.add_argument("--batch-size", type=int, default=settings.ANALYTICS_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.years, args.per_day, args.batch_size, args.repeat)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+"""
+삭제 회원 전체 복원 / 전체 영구 삭제 벤치마크
+- legacy : 행 복사 모델. deleted_members 를 모두 읽어 행마다 INSERT ... ON DUPLICATE KEY UPDATE (복원),
+           member_id 를 모두 모아 거대한 IN (...) 으로 DELETE (영구 삭제). 전체가 한 트랜잭션 (기존)
+- batched: members.deleted_at 툼스톤 + deleted_member_repository.run_in_batches / RESTORE_BATCH_SQL / PURGE_BATCH_SQL
+           (member_id 구간마다 UPDATE / DELETE 한 문장, 배치마다 커밋, 현재)
+
+bench_members (+ legacy 용 bench_deleted_members 사본) 에 소프트 삭제된 회원 N명(기본 100k)을 시드하고
+모드별 전체 시간과 가장 긴 트랜잭션(잠금을 쥐고 있는 시간)을 비교합니다. 트리거는 없는 순수 문장 비용입니다.
+종료 시 벤치마크 테이블을 삭제합니다.
+
+실행: python benchmarks/bench_deleted_members_bulk.py --members 100000 --batch-size 1000
+"""
+import argparse
+import re
+import time
+
+from bench_member_list import SEED_DIGITS_SQL
+from app.database import get_connection
+from app.repositories.deleted_member_repository import (
+    BATCH_END_SQL, PURGE_BATCH_SQL, RESTORE_BATCH_SQL, TOMBSTONE_COUNT_SQL, run_in_batches
+)
+
+MEMBER_COLUMNS = """
+    member_id INT AUTO_INCREMENT PRIMARY KEY,
+    member_rank INT,
+    name VARCHAR(100),
+    phone_number VARCHAR(20),
+    gender CHAR(1),
+    membership_type VARCHAR(50),
+    membership_start_date DATE,
+    membership_end_date DATE,
+    locker_number INT,
+    locker_type VARCHAR(50),
+    locker_start_date DATE,
+    locker_end_date DATE,
+    uniform_type VARCHAR(50),
+    uniform_start_date DATE,
+    uniform_end_date DATE,
+    created_at DATETIME"""
+
+CREATE_SQL = [
+    f"""CREATE TABLE bench_members ({MEMBER_COLUMNS}, is_active BOOLEAN DEFAULT TRUE, deleted_at DATETIME NULL,
+        INDEX idx_members_deleted_at (deleted_at))""",
+    f"CREATE TABLE bench_deleted_members ({MEMBER_COLUMNS}, deleted_at DATETIME)",
+]
+
+SEED_SQL = [
+    """
+    INSERT INTO bench_members (member_id, member_rank, name, phone_number, gender, membership_type,
+                               membership_start_date, membership_end_date, is_active, created_at, deleted_at)
+    SELECT a.n * 10000 + b.n + 1, a.n * 10000 + b.n + 1, CONCAT('회원', a.n * 10000 + b.n),
+           CONCAT('010', LPAD(a.n * 10000 + b.n, 8, '0')), IF(b.n % 2 = 0, 'M', 'F'), '3개월',
+           CURDATE() - INTERVAL 30 DAY, CURDATE() + INTERVAL 60 DAY, FALSE, NOW(), NOW()
+    FROM bench_digits a JOIN bench_digits b
+    WHERE a.n * 10000 + b.n < %s
+    """,
+    """
+    INSERT INTO bench_deleted_members (member_id, member_rank, name, phone_number, gender, membership_type,
+                                       membership_start_date, membership_end_date, created_at, deleted_at)
+    SELECT member_id, member_rank, name, phone_number, gender, membership_type,
+           membership_start_date, membership_end_date, created_at, NOW()
+    FROM bench_members
+    """,
+]
+
+LEGACY_RESTORE_SQL = """
+INSERT INTO bench_members (
+    member_id, member_rank, name, phone_number, gender,
+    membership_type, membership_start_date, membership_end_date,
+    locker_number, locker_type, locker_start_date, locker_end_date,
+    uniform_type, uniform_start_date, uniform_end_date,
+    is_active, created_at
+) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, TRUE, %s)
+ON DUPLICATE KEY UPDATE
+    is_active = TRUE, member_rank = VALUES(member_rank), name = VALUES(name),
+    phone_number = VALUES(phone_number), gender = VALUES(gender),
+    membership_type = VALUES(membership_type), membership_start_date = VALUES(membership_start_date),
+    membership_end_date = VALUES(membership_end_date), locker_number = VALUES(locker_number),
+    locker_type = VALUES(locker_type), locker_start_date = VALUES(locker_start_date),
+    locker_end_date = VALUES(locker_end_date), uniform_type = VALUES(uniform_type),
+    uniform_start_date = VALUES(uniform_start_date), uniform_end_date = VALUES(uniform_end_date)
+"""
+
+LEGACY_COLUMNS = [
+    "member_id", "member_rank", "name", "phone_number", "gender",
+    "membership_type", "membership_start_date", "membership_end_date",
+    "locker_number", "locker_type", "locker_start_date", "locker_end_date",
+    "uniform_type", "uniform_start_date", "uniform_end_date", "created_at",
+]
+
+# 모드별로 처리 후 남은 삭제 회원 수
+LEFTOVER_SQL = {
+    "legacy": "SELECT COUNT(*) AS n FROM bench_deleted_members",
+    "batched": "SELECT COUNT(*) AS n FROM bench_members WHERE deleted_at IS NOT NULL",
+}
+
+
+def to_bench(sql: str) -> str:
+    sql = re.sub(r"\bdeleted_members\b", "bench_deleted_members", sql)
+    return re.sub(r"\bmembers\b", "bench_members", sql)
+
+
+def seed(cursor, members: int):
+    cursor.execute("DROP TABLE IF EXISTS bench_members, bench_deleted_members")
+    for sql in CREATE_SQL:
+        cursor.execute(sql)
+    cursor.execute("DROP TEMPORARY TABLE IF EXISTS bench_digits")
+    cursor.execute(SEED_DIGITS_SQL)
+    cursor.execute(SEED_SQL[0], (members,))
+    cursor.execute(SEED_SQL[1])
+    cursor.connection.commit()
+
+
+def legacy_restore(cursor, _batch_size: int, _on_progress) -> int:
+    cursor.execute(f"SELECT {', '.join(LEGACY_COLUMNS)} FROM bench_deleted_members")
+    rows = cursor.fetchall()
+    for row in rows:
+        cursor.execute(LEGACY_RESTORE_SQL, tuple(row[col] for col in LEGACY_COLUMNS))
+    cursor.execute("DELETE FROM bench_deleted_members")
+    cursor.connection.commit()
+    return len(rows)
+
+
+def legacy_purge(cursor, _batch_size: int, _on_progress) -> int:
+    cursor.execute("SELECT member_id FROM bench_deleted_members")
+    member_ids = [row['member_id'] for row in cursor.fetchall()]
+    cursor.execute("DELETE FROM bench_deleted_members")
+    if member_ids:
+        placeholders = ', '.join(['%s'] * len(member_ids))
+        cursor.execute(f"DELETE FROM bench_members WHERE member_id IN ({placeholders})", tuple(member_ids))
+    cursor.connection.commit()
+    return len(member_ids)
+
+
+def batched(statements):
+    bench_statements = [to_bench(sql) for sql in statements]
+
+    def run(cursor, batch_size: int, on_progress) -> int:
+        return run_in_batches(
+            cursor, bench_statements, batch_size, on_progress,
+            end_sql=to_bench(BATCH_END_SQL),
+            count_sql=to_bench(TOMBSTONE_COUNT_SQL),
+        )
+    return run
+
+
+CASES = [
+    ("restore", "legacy", legacy_restore),
+    ("restore", "batched", batched(RESTORE_BATCH_SQL)),
+    ("purge", "legacy", legacy_purge),
+    ("purge", "batched", batched(PURGE_BATCH_SQL)),
+]
+
+
+def run(members: int, batch_size: int):
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            print(f"소프트 삭제된 회원 {members:,}명, 배치 {batch_size:,}명\n")
+            print(f"{'operation':<10}{'mode':<10}{'rows':>10}{'total(s)':>10}{'longest txn(s)':>16}{'batches':>9}")
+            for operation, mode, fn in CASES:
+                seed(cursor, members)
+                marks = []
+                started = time.perf_counter()
+                rows = fn(cursor, batch_size, lambda done, total: marks.append(time.perf_counter()))
+                elapsed = time.perf_counter() - started
+                points = [started] + (marks or [started + elapsed])
+                longest = max(b - a for a, b in zip(points, points[1:]))
+                print(f"{operation:<10}{mode:<10}{rows:>10,}{elapsed:>10.2f}{longest:>16.3f}{max(len(marks), 1):>9}")
+                cursor.execute(LEFTOVER_SQL[mode])
+                if cursor.fetchone()['n']:
+                    raise SystemExit(f"❌ {operation}/{mode}: 삭제된 회원이 남아 있습니다.")
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members, bench_deleted_members")
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.members, args.batch_size)
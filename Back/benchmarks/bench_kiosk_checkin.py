@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+키오스크 입장 지연 시간 벤치마크 (before / after)
+- stepwise : 휴면 확인 -> check_member_validity -> process_checkin (기존 단계별 처리)
+- procedure: CheckinService.kiosk_checkin (sp_kiosk_checkin 한 번 호출)
+
+벤치마크용 회원을 하나 만들고, 매 반복마다 입장(측정) 후 퇴장(측정 제외)시킵니다.
+종료 시 벤치마크 회원과 출입 기록을 삭제합니다.
+
+실행: python benchmarks/bench_kiosk_checkin.py --repeat 300
+"""
+import argparse
+import time
+
+from _common import percentile
+from app.database import get_connection
+from app.services.checkin_service import CheckinService
+
+BENCH_PHONE = "010-0000-9999"
+
+
+def create_bench_member(cursor) -> int:
+    cursor.execute("DELETE FROM members WHERE phone_number = %s", (BENCH_PHONE,))
+    cursor.execute(
+        """
+        INSERT INTO members (member_rank, name, phone_number, gender, membership_type,
+                             membership_start_date, membership_end_date, is_active, created_at)
+        VALUES (0, '벤치마크', %s, 'M', '1년', CURDATE(), CURDATE() + INTERVAL 1 YEAR, TRUE, NOW())
+        """,
+        (BENCH_PHONE,)
+    )
+    member_id = cursor.lastrowid
+    cursor.connection.commit()
+    return member_id
+
+
+def checkout_all(cursor, member_id: int):
+    cursor.execute("UPDATE checkins SET checkout_time = NOW() WHERE member_id = %s AND checkout_time IS NULL", (member_id,))
+    cursor.execute("UPDATE members SET checkin_time = NULL, checkout_time = NOW() WHERE member_id = %s", (member_id,))
+    cursor.connection.commit()
+
+
+def run(repeat: int):
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            member_id = create_bench_member(cursor)
+            service = CheckinService(cursor)
+            modes = {
+                "stepwise": lambda: service._kiosk_checkin_stepwise(member_id),
+                "procedure": lambda: service.kiosk_checkin(member_id),
+            }
+            print(f"{'mode':<12}{'p50(ms)':>10}{'p99(ms)':>10}{'mean(ms)':>10}")
+            for label, checkin in modes.items():
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    result = checkin()
+                    samples.append((time.perf_counter() - started) * 1000)
+                    assert result["status"] == "success", result
+                    checkout_all(cursor, member_id)
+                mean = sum(samples) / len(samples)
+                print(f"{label:<12}{percentile(samples, 50):>10.2f}{percentile(samples, 99):>10.2f}{mean:>10.2f}")
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "DELETE c FROM checkins c JOIN members m ON m.member_id = c.member_id WHERE m.phone_number = %s",
+                (BENCH_PHONE,)
+            )
+            cursor.execute("DELETE FROM members WHERE phone_number = %s", (BENCH_PHONE,))
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=300)
+    run(parser.parse_args().repeat)
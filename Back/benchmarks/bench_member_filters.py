@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+회원 목록 필터 쿼리 처리량 벤치마크
+utils/member_query.py 가 만드는 고정 문장을 두 방식으로 실행해 초당 처리량을 비교합니다.
+- text    : cursor.execute(sql, params) - pymysql 이 값을 SQL 본문에 채워 보내므로 검색어마다 서버가 새로 파싱
+- prepared: prepared.PreparedStatementCache - 연결마다 문장을 한 번만 PREPARE 하고 EXECUTE ... USING
+검색어/성별/필터/정렬/페이지를 무작위로 섞은 요청을 --threads 개 연결에서 --seconds 초 동안 보냅니다.
+현재 DB 의 members 테이블을 읽기만 합니다. (마이그레이션 적용 후 실행)
+
+실행: python benchmarks/bench_member_filters.py --threads 8 --seconds 10
+"""
+import argparse
+import random
+import threading
+import time
+
+from _common import random_phone
+from app.database import get_connection
+from app.prepared import PreparedStatementCache
+from app.utils.member_query import compile_member_query, MEMBER_SORTS
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+SYLLABLES = "민서준도윤예하지우수현채은건태영진선혜유아연성경재희동규나라"
+COLUMNS = "m.member_id, m.name, m.phone_number, m.membership_end_date, m.last_checkin_time"
+
+
+def random_request(rng: random.Random) -> dict:
+    search = None
+    roll = rng.random()
+    if roll < 0.4:
+        search = rng.choice(SURNAMES) + rng.choice(SYLLABLES)
+    elif roll < 0.6:
+        search = random_phone(rng)[-4:]
+    return {
+        "search": search,
+        "status_filter": rng.choice(("all", "all", "active", "expiring_soon")),
+        "gender": rng.choice((None, None, "M", "F")),
+        "locker_filter": rng.random() < 0.2,
+        "membership_filter": rng.choice((None, None, "pt", "membership")),
+        "sort_by": rng.choice((None, "name", "end_date", "recent_checkin", "membership_type_asc")),
+        "page": rng.randint(1, 5),
+    }
+
+
+def run_mode(mode: str, threads: int, seconds: float, seed: int):
+    cache = PreparedStatementCache(64)
+    done = [0] * threads
+    status_before, status_after = [], []
+    stop = time.monotonic() + seconds
+
+    def worker(index: int):
+        rng = random.Random(seed + index)
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SHOW SESSION STATUS WHERE Variable_name IN ('Com_select', 'Com_prepare_sql', 'Com_execute_sql')")
+                status_before.append({r['Variable_name']: int(r['Value']) for r in cursor.fetchall()})
+                while time.monotonic() < stop:
+                    req = random_request(rng)
+                    page = req.pop("page")
+                    query = compile_member_query(default_sort=MEMBER_SORTS['created_at'], **req)
+                    for sql, params in (query.list_sql(COLUMNS, 20, (page - 1) * 20), query.count_sql()):
+                        if mode == "prepared":
+                            cache.execute(cursor, sql, params)
+                        else:
+                            cursor.execute(sql, tuple(params))
+                        cursor.fetchall()
+                    done[index] += 1
+                cursor.execute("SHOW SESSION STATUS WHERE Variable_name IN ('Com_select', 'Com_prepare_sql', 'Com_execute_sql')")
+                status_after.append({r['Variable_name']: int(r['Value']) for r in cursor.fetchall()})
+        finally:
+            conn.close()
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    server = {k: sum(a[k] for a in status_after) - sum(b[k] for b in status_before) for k in status_before[0]}
+    stats = cache.stats()
+    print(f"{mode:<10}{sum(done) / seconds:>12.1f}{stats['hit_rate'] if mode == 'prepared' else '-':>10}"
+          f"{server['Com_prepare_sql']:>14}{server['Com_execute_sql']:>14}{server['Com_select']:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(f"{'mode':<10}{'req/s':>12}{'hit_rate':>10}{'PREPARE':>14}{'EXECUTE':>14}{'SELECT':>12}")
+    for mode in ("text", "prepared"):
+        run_mode(mode, args.threads, args.seconds, args.seed)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+관리자 회원 목록(AdminService.get_members) 쿼리 계획/지연 시간 벤치마크
+- subquery  : 회원마다 checkins 를 ORDER BY ... LIMIT 1 로 뒤지는 상관 서브쿼리 (기존)
+- projection: members.last_checkin_time / last_checkout_time 투영 컬럼 (현재)
+
+bench_members / bench_checkins 테이블을 만들어 (기본 100k 회원, 10M 출입 기록) 시드한 뒤
+EXPLAIN 으로 계획을 확인하고, projection 쿼리에 DEPENDENT SUBQUERY 나 filesort 가 없는지 검사합니다.
+종료 시 벤치마크 테이블을 삭제합니다.
+
+실행: python benchmarks/bench_member_list.py --members 100000 --checkins 10000000
+"""
+import argparse
+
+from _common import time_calls
+from app.database import get_connection
+
+CREATE_SQL = [
+    """
+    CREATE TABLE bench_members (
+        member_id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100),
+        is_active BOOLEAN DEFAULT TRUE,
+        created_at DATETIME,
+        last_checkin_time DATETIME NULL,
+        last_checkout_time DATETIME NULL,
+        INDEX idx_bench_members_active_last_checkin (is_active, last_checkin_time)
+    )
+    """,
+    """
+    CREATE TABLE bench_checkins (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        member_id INT NOT NULL,
+        checkin_time DATETIME NOT NULL,
+        checkout_time DATETIME NULL,
+        INDEX idx_bench_checkins_member_time (member_id, checkin_time)
+    )
+    """,
+]
+
+# 0..9999 숫자 테이블을 교차 조인해 대량 시드를 서버 안에서 생성합니다.
+SEED_DIGITS_SQL = """
+CREATE TEMPORARY TABLE bench_digits (n INT PRIMARY KEY)
+SELECT a.n + b.n * 10 + c.n * 100 + d.n * 1000 AS n
+FROM (SELECT 0 n UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+      UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) a,
+     (SELECT 0 n UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+      UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) b,
+     (SELECT 0 n UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+      UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) c,
+     (SELECT 0 n UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+      UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) d
+"""
+
+SEED_MEMBERS_SQL = """
+INSERT INTO bench_members (name, is_active, created_at)
+SELECT CONCAT('회원', a.n * 10000 + b.n), TRUE, NOW() - INTERVAL (a.n * 10000 + b.n) MINUTE
+FROM bench_digits a JOIN bench_digits b
+WHERE a.n * 10000 + b.n < %s
+"""
+
+SEED_CHECKINS_SQL = """
+INSERT INTO bench_checkins (member_id, checkin_time, checkout_time)
+SELECT 1 + (d.n * 7919 + %s * 104729) %% %s,
+       NOW() - INTERVAL (d.n + %s * 10000) MINUTE,
+       NOW() - INTERVAL (d.n + %s * 10000) MINUTE + INTERVAL 90 MINUTE
+FROM bench_digits d
+"""
+
+BACKFILL_SQL = """
+UPDATE bench_members m
+JOIN (
+    SELECT c.member_id, MAX(c.checkin_time) AS last_checkin_time
+    FROM bench_checkins c
+    GROUP BY c.member_id
+) latest ON latest.member_id = m.member_id
+JOIN bench_checkins c ON c.member_id = latest.member_id AND c.checkin_time = latest.last_checkin_time
+SET m.last_checkin_time = c.checkin_time,
+    m.last_checkout_time = c.checkout_time
+"""
+
+QUERIES = {
+    "subquery": {
+        "recent_checkin": """
+            SELECT m.member_id, m.name,
+                (SELECT checkin_time FROM bench_checkins WHERE member_id = m.member_id ORDER BY checkin_time DESC LIMIT 1) AS last_checkin_time,
+                (SELECT checkout_time FROM bench_checkins WHERE member_id = m.member_id ORDER BY checkin_time DESC LIMIT 1) AS last_checkout_time
+            FROM bench_members m
+            WHERE m.is_active = TRUE
+            ORDER BY last_checkin_time DESC
+            LIMIT 20 OFFSET 0
+        """,
+        "count_checked_in": """
+            SELECT COUNT(*) AS count FROM bench_members m
+            WHERE m.is_active = TRUE
+              AND (SELECT checkin_time FROM bench_checkins WHERE member_id = m.member_id AND checkout_time IS NULL
+                   ORDER BY checkin_time DESC LIMIT 1) IS NOT NULL
+        """,
+    },
+    "projection": {
+        "recent_checkin": """
+            SELECT m.member_id, m.name, m.last_checkin_time, m.last_checkout_time
+            FROM bench_members m
+            WHERE m.is_active = TRUE
+            ORDER BY m.last_checkin_time DESC
+            LIMIT 20 OFFSET 0
+        """,
+        "count_checked_in": """
+            SELECT COUNT(*) AS count FROM bench_members m
+            WHERE m.is_active = TRUE
+              AND m.last_checkin_time IS NOT NULL AND m.last_checkout_time IS NULL
+        """,
+    },
+}
+
+
+def seed(cursor, members: int, checkins: int):
+    for sql in CREATE_SQL:
+        cursor.execute(sql)
+    cursor.execute(SEED_DIGITS_SQL)
+    cursor.execute(SEED_MEMBERS_SQL, (members,))
+    cursor.connection.commit()
+    for batch in range((checkins + 9999) // 10000):
+        cursor.execute(SEED_CHECKINS_SQL, (batch, members, batch, batch))
+        if batch % 50 == 0:
+            cursor.connection.commit()
+    cursor.connection.commit()
+    cursor.execute(BACKFILL_SQL)
+    cursor.connection.commit()
+    for table in ("bench_members", "bench_checkins"):
+        cursor.execute(f"ANALYZE TABLE {table}")
+        cursor.fetchall()
+
+
+def explain(cursor, sql: str) -> list:
+    cursor.execute("EXPLAIN " + sql)
+    return cursor.fetchall()
+
+
+def check_projection_plan(label: str, plan: list):
+    for row in plan:
+        assert row["select_type"] != "DEPENDENT SUBQUERY", f"{label}: 상관 서브쿼리가 남아 있습니다: {row}"
+        assert "filesort" not in (row.get("Extra") or ""), f"{label}: filesort 가 발생합니다: {row}"
+        assert row["table"] != "bench_checkins", f"{label}: checkins 를 읽습니다: {row}"
+
+
+def run(members: int, checkins: int, repeat: int):
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members, bench_checkins")
+            print(f"시드: 회원 {members:,}명, 출입 기록 {checkins:,}건")
+            seed(cursor, members, checkins)
+
+            for mode, queries in QUERIES.items():
+                for name, sql in queries.items():
+                    plan = explain(cursor, sql)
+                    print(f"\n[{mode}] {name}")
+                    for row in plan:
+                        print(f"  {row['select_type']:<20}{row['table']:<16}{row['type'] or '':<8}"
+                              f"{row['key'] or '-':<40}{row.get('Extra') or ''}")
+                    if mode == "projection":
+                        check_projection_plan(name, plan)
+
+            print(f"\n{'mode':<12}{'query':<18}{'p50(ms)':>10}{'p99(ms)':>10}{'mean(ms)':>10}")
+            for mode, queries in QUERIES.items():
+                for name, sql in queries.items():
+                    def list_members():
+                        cursor.execute(sql)
+                        cursor.fetchall()
+                    # 기존 상관 서브쿼리는 수 초가 걸릴 수 있어 반복 횟수를 줄입니다.
+                    p50, p99, mean = time_calls(list_members, repeat if mode == "projection" else max(1, repeat // 20))
+                    print(f"{mode:<12}{name:<18}{p50:>10.2f}{p99:>10.2f}{mean:>10.2f}")
+            print("\n✅ projection 쿼리 계획 검사 통과 (DEPENDENT SUBQUERY / filesort / checkins 접근 없음)")
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members, bench_checkins")
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--checkins", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    run(args.members, args.checkins, args.repeat)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+회원 이름/전화번호 검색 지연 시간 벤치마크
+REPLACE(...) LIKE '%x%' (풀스캔) 와 search_text ngram FULLTEXT (utils/search.py 조건) 를
+10k / 100k / 1M 행에서 한글 이름 2~3글자, 전화번호 4~8자리 부분 문자열로 비교합니다.
+별도의 bench_members 테이블을 만들어 사용하고 종료 시 삭제합니다.
+
+실행: python benchmarks/bench_member_search.py --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+
+from _common import time_calls, random_phone, bulk_insert
+from app.database import get_connection
+from app.migrations import SEARCH_TEXT_EXPR
+from app.utils.search import member_search_condition
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+SYLLABLES = "민서준도윤예하지우수현채은건태영진선혜유아연성경재희동규나라"
+
+CREATE_SQL = f"""
+CREATE TABLE bench_members (
+    member_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100),
+    phone_number VARCHAR(20),
+    is_active BOOLEAN DEFAULT TRUE,
+    search_text VARCHAR(160) GENERATED ALWAYS AS ({SEARCH_TEXT_EXPR}) STORED
+)
+"""
+
+LIKE_SQL = """
+SELECT member_id, name FROM bench_members
+WHERE is_active = TRUE
+  AND (REPLACE(name, ' ', '') LIKE %s OR REPLACE(phone_number, ' ', '') LIKE %s)
+ORDER BY member_id DESC LIMIT 20
+"""
+
+
+def random_name(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + "".join(rng.choice(SYLLABLES) for _ in range(rng.choice((1, 2, 2))))
+
+
+def random_term(rng: random.Random, names, phones) -> str:
+    if rng.random() < 0.5:
+        name = rng.choice(names)
+        return name[rng.randint(0, max(0, len(name) - 2)):][:rng.choice((2, 3))]
+    phone = rng.choice(phones)
+    length = rng.choice((4, 6, 8))
+    start = rng.randint(3, len(phone) - length)
+    return phone[start:start + length]
+
+
+def run(sizes, repeat: int):
+    rng = random.Random(7)
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members")
+            cursor.execute(CREATE_SQL)
+            cursor.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+            sample_names, sample_phones = [], []
+            loaded = 0
+            print(f"{'rows':>10}  {'query':<10}{'p50(ms)':>10}{'p99(ms)':>10}{'mean(ms)':>10}")
+            for size in sorted(sizes):
+                def rows():
+                    for _ in range(loaded, size):
+                        name, phone = random_name(rng), random_phone(rng)
+                        if len(sample_names) < 1000:
+                            sample_names.append(name)
+                            sample_phones.append(phone)
+                        yield name, phone
+                # 인덱스를 지우고 적재한 뒤 다시 만드는 편이 대량 시드에 빠름
+                cursor.execute("SHOW INDEX FROM bench_members WHERE Key_name = 'ft_bench_members_search'")
+                if cursor.fetchall():
+                    cursor.execute("ALTER TABLE bench_members DROP INDEX ft_bench_members_search")
+                bulk_insert(cursor, "INSERT INTO bench_members (name, phone_number) VALUES (%s, %s)", rows())
+                cursor.execute(
+                    "ALTER TABLE bench_members ADD FULLTEXT INDEX ft_bench_members_search (search_text) WITH PARSER ngram"
+                )
+                loaded = size
+
+                terms = [random_term(rng, sample_names, sample_phones) for _ in range(repeat)]
+
+                def like_search(it=iter(terms * 2)):
+                    term = next(it)
+                    cursor.execute(LIKE_SQL, (f"%{term}%", f"%{term}%"))
+                    cursor.fetchall()
+
+                def fulltext_search(it=iter(terms * 2)):
+                    condition, params = member_search_condition(next(it))
+                    cursor.execute(
+                        f"SELECT member_id, name FROM bench_members WHERE is_active = TRUE AND {condition} "
+                        f"ORDER BY member_id DESC LIMIT 20",
+                        tuple(params)
+                    )
+                    cursor.fetchall()
+
+                for label, fn in (("LIKE", like_search), ("FULLTEXT", fulltext_search)):
+                    p50, p99, mean = time_calls(fn, repeat)
+                    print(f"{size:>10}  {label:<10}{p50:>10.2f}{p99:>10.2f}{mean:>10.2f}")
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members")
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+키오스크 뒷자리 검색 지연 시간 벤치마크
+RIGHT(phone_number, 4) = ? (풀스캔) 와 phone_last4 = ? (인덱스) 를 10k / 100k / 1M 행에서 비교합니다.
+별도의 bench_members 테이블을 만들어 사용하고 종료 시 삭제합니다.
+
+실행: python benchmarks/bench_phone_lookup.py --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+
+from _common import time_calls, random_phone, bulk_insert
+from app.database import get_connection
+
+CREATE_SQL = """
+CREATE TABLE bench_members (
+    member_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100),
+    phone_number VARCHAR(20),
+    is_active BOOLEAN DEFAULT TRUE,
+    phone_last4 CHAR(4) GENERATED ALWAYS AS (RIGHT(phone_number, 4)) STORED,
+    INDEX idx_bench_members_phone_last4 (phone_last4)
+)
+"""
+
+QUERIES = {
+    "RIGHT()": "SELECT member_id, name FROM bench_members WHERE RIGHT(phone_number, 4) = %s",
+    "phone_last4": "SELECT member_id, name FROM bench_members WHERE phone_last4 = %s",
+}
+
+
+def run(sizes, repeat: int):
+    rng = random.Random(42)
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members")
+            cursor.execute(CREATE_SQL)
+            loaded = 0
+            print(f"{'rows':>10}  {'query':<12}{'p50(ms)':>10}{'p99(ms)':>10}{'mean(ms)':>10}")
+            for size in sorted(sizes):
+                rows = ((f"회원{i}", random_phone(rng)) for i in range(loaded, size))
+                bulk_insert(cursor, "INSERT INTO bench_members (name, phone_number) VALUES (%s, %s)", rows)
+                loaded = size
+                cursor.execute("ANALYZE TABLE bench_members")
+                cursor.fetchall()
+                for label, sql in QUERIES.items():
+                    def lookup():
+                        cursor.execute(sql, (f"{rng.randint(0, 9999):04d}",))
+                        cursor.fetchall()
+                    p50, p99, mean = time_calls(lookup, repeat)
+                    print(f"{size:>10}  {label:<12}{p50:>10.2f}{p99:>10.2f}{mean:>10.2f}")
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members")
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
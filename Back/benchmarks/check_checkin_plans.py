@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""
+checkins 조회 쿼리 계획 검사
+repository / service / 자동 퇴장 sweeper 가 실제로 쓰는 SQL 상수를 bench_checkins / bench_members 에 EXPLAIN 해서
+checkins 접근이 전체 스캔(type ALL)이 아니고 migrations.CHECKIN_INDEXES 의 인덱스를 쓰는지 확인합니다.
+(DATE(checkin_time) = ? 처럼 컬럼을 함수로 감싸면 인덱스를 못 타므로 반열린 구간 [시작, 끝) 으로 작성해야 함)
+
+bench 테이블을 만들어 (기본 100k 회원, 10M 출입 기록, 최근 기록 일부는 입장 중) 시드하고, 종료 시 삭제합니다.
+
+실행: python benchmarks/check_checkin_plans.py --members 100000 --checkins 10000000
+"""
+import argparse
+import re
+from datetime import date
+
+from _common import time_calls
+from bench_member_list import SEED_DIGITS_SQL, SEED_MEMBERS_SQL
+from app.auto_checkout import DUE_SQL
+from app.database import get_connection
+from app.migrations import CHECKIN_INDEXES, ACTIVE_SESSIONS_REBUILD_SQL
+from app.repositories.checkin_repository import (
+    TODAY_CHECKINS_COUNT_SQL, TODAY_CHECKINS_SQL, MEMBER_CALENDAR_SQL, day_range, month_range
+)
+from app.repositories.member_repository import MEMBER_TODAY_CHECKINS_SQL
+from app.services.admin_service import ADMIN_TODAY_CHECKINS_SQL
+
+CREATE_SQL = [
+    """
+    CREATE TABLE bench_members (
+        member_id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100),
+        phone_number VARCHAR(20),
+        gender CHAR(1),
+        membership_type VARCHAR(50),
+        is_active BOOLEAN DEFAULT TRUE,
+        created_at DATETIME
+    )
+    """,
+    f"""
+    CREATE TABLE bench_checkins (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        member_id INT NOT NULL,
+        checkin_time DATETIME NOT NULL,
+        checkout_time DATETIME NULL,
+        open_member_id INT GENERATED ALWAYS AS (IF(checkout_time IS NULL, member_id, NULL)) VIRTUAL,
+        {", ".join(f"INDEX {name} {columns}" for name, columns in CHECKIN_INDEXES.items())}
+    )
+    """,
+]
+
+# 1분 간격으로 과거로 채우고, 최근 기록 중 1/50 은 퇴장하지 않은 상태로 남깁니다.
+SEED_CHECKINS_SQL = """
+INSERT INTO bench_checkins (member_id, checkin_time, checkout_time)
+SELECT 1 + (d.n * 7919 + %s * 104729) %% %s,
+       NOW() - INTERVAL (d.n + %s * 10000) MINUTE,
+       IF(%s = 0 AND d.n %% 50 = 0, NULL, NOW() - INTERVAL (d.n + %s * 10000) MINUTE + INTERVAL 90 MINUTE)
+FROM bench_digits d
+"""
+
+# EXPLAIN 결과에서 checkins 접근으로 보는 테이블 (별칭 포함)
+CHECKIN_TABLES = ("c", "cl", "bench_checkins")
+
+today_start, today_end = day_range(date.today())
+month_start, month_end = month_range(date.today().year, date.today().month)
+
+# (설명, SQL, 파라미터)
+CASES = [
+    ("today count", TODAY_CHECKINS_COUNT_SQL, (today_start, today_end)),
+    ("today list", TODAY_CHECKINS_SQL, (today_start, today_end, 50, 0)),
+    ("member today", MEMBER_TODAY_CHECKINS_SQL, None),
+    ("admin today", ADMIN_TODAY_CHECKINS_SQL, None),
+    ("member calendar", MEMBER_CALENDAR_SQL, (1, month_start, month_end)),
+    ("auto checkout due", DUE_SQL, (240,)),
+    ("active sessions rebuild", ACTIVE_SESSIONS_REBUILD_SQL.split("SELECT", 1)[1], None),
+]
+
+
+def to_bench(sql: str) -> str:
+    sql = re.sub(r"\bcheckins\b", "bench_checkins", sql)
+    sql = re.sub(r"\bmembers\b", "bench_members", sql)
+    if not sql.lstrip().upper().startswith("SELECT"):
+        sql = "SELECT" + sql
+    return sql.replace("FOR UPDATE", "")
+
+
+def seed(cursor, members: int, checkins: int):
+    for sql in CREATE_SQL:
+        cursor.execute(sql)
+    cursor.execute(SEED_DIGITS_SQL)
+    cursor.execute(SEED_MEMBERS_SQL, (members,))
+    cursor.connection.commit()
+    for batch in range((checkins + 9999) // 10000):
+        cursor.execute(SEED_CHECKINS_SQL, (batch, members, batch, batch, batch))
+        if batch % 50 == 0:
+            cursor.connection.commit()
+    cursor.connection.commit()
+    for table in ("bench_members", "bench_checkins"):
+        cursor.execute(f"ANALYZE TABLE {table}")
+        cursor.fetchall()
+
+
+def run(members: int, checkins: int, repeat: int):
+    conn = get_connection()
+    failed = 0
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members, bench_checkins")
+            print(f"시드: 회원 {members:,}명, 출입 기록 {checkins:,}건")
+            seed(cursor, members, checkins)
+
+            print(f"\n{'case':<26}{'type':<8}{'key':<30}{'rows':>10}{'p50(ms)':>10}  Extra")
+            for label, sql, params in CASES:
+                sql = to_bench(sql)
+                cursor.execute("EXPLAIN " + sql, params)
+                plan = [row for row in cursor.fetchall() if row['table'] in CHECKIN_TABLES]
+
+                def run_query():
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+                p50, _, _ = time_calls(run_query, repeat)
+
+                for row in plan:
+                    ok = row['type'] != "ALL" and row['key'] in CHECKIN_INDEXES
+                    failed += not ok
+                    print(f"{'✅' if ok else '❌'} {label:<24}{row['type'] or '':<8}{row['key'] or '-':<30}"
+                          f"{row['rows'] or 0:>10}{p50:>10.2f}  {row.get('Extra') or ''}")
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members, bench_checkins")
+        conn.close()
+    if failed:
+        raise SystemExit(f"❌ checkins 접근 {failed}건이 전체 스캔이거나 CHECKIN_INDEXES 를 쓰지 않습니다.")
+    print("\n✅ checkins 쿼리 계획 검사 통과 (전체 스캔 없음)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--checkins", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.members, args.checkins, args.repeat)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+회원 목록 종류 정렬 / 상태 필터 쿼리 계획 검사
+utils/member_query.py 가 만드는 목록 쿼리를 현재 DB 의 members 에 EXPLAIN 해서
+membership_type_asc / locker_type_asc / uniform_type_asc 정렬이 filesort 없이 순위 인덱스를 타고,
+status_filter=inactive|expiring_soon 이 idx_members_active_status 를 쓰는지 확인합니다.
+(active 는 대부분의 회원이 해당되어 인덱스보다 스캔이 유리하고, 개수는 증분 카운터가 답합니다.)
+(migrations.setup_membership_catalog 적용 후 실행)
+
+실행: python benchmarks/check_member_sort_plans.py
+"""
+from _common import time_calls
+from app.database import get_connection
+from app.utils.member_query import compile_member_query, MEMBER_SORTS
+
+CASES = [
+    # (설명, compile_member_query 인자, 기대 인덱스)
+    ("sort membership_type_asc", {"sort_by": "membership_type_asc"}, "idx_members_active_membership_rank"),
+    ("sort locker_type_asc", {"sort_by": "locker_type_asc"}, "idx_members_active_locker_rank"),
+    ("sort uniform_type_asc", {"sort_by": "uniform_type_asc"}, "idx_members_active_uniform_rank"),
+    # 상태 필터는 인덱스 순서와 맞는 만료일 정렬로 확인 (등호 조건이라 filesort 도 없어야 함)
+    ("status expiring_soon", {"status_filter": "expiring_soon", "sort_by": "end_date"}, "idx_members_active_status"),
+    ("status inactive", {"status_filter": "inactive", "sort_by": "end_date"}, "idx_members_active_status"),
+]
+
+
+def main():
+    conn = get_connection()
+    failed = 0
+    try:
+        with conn.cursor() as cursor:
+            print(f"{'case':<28}{'type':<8}{'key':<40}{'p50(ms)':>10}  Extra")
+            for label, kwargs, expected_key in CASES:
+                query = compile_member_query(default_sort=MEMBER_SORTS['created_at'], **kwargs)
+                sql, params = query.list_sql("m.member_id, m.name", 20)
+                cursor.execute("EXPLAIN " + sql, tuple(params))
+                plan = cursor.fetchall()[0]
+                extra = plan.get('Extra') or ''
+
+                def run_query():
+                    cursor.execute(sql, tuple(params))
+                    cursor.fetchall()
+                p50, _, _ = time_calls(run_query, 50)
+
+                ok = plan['key'] == expected_key and "filesort" not in extra
+                failed += not ok
+                print(f"{'✅' if ok else '❌'} {label:<26}{plan['type'] or '':<8}{plan['key'] or '-':<40}{p50:>10.2f}  {extra}")
+    finally:
+        conn.close()
+    if failed:
+        raise SystemExit(f"❌ {failed}개 쿼리가 기대한 인덱스를 쓰지 않거나 filesort 가 발생합니다.")
+    print("✅ 종류 정렬 / 상태 필터 쿼리 계획 검사 통과")
+
+
+if __name__ == "__main__":
+    main()
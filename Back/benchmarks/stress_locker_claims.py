@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+락커 동시 배정 스트레스 테스트
+bench_lockers (lockers 와 같은 구조) 에 락커를 만들고, 여러 스레드가 동시에 "가입"을 흉내 냅니다.
+(빈 락커 배정 -> hold 만큼 회원 INSERT 대기 -> 락커에 회원 기록 -> 커밋, 락커가 떨어질 때까지 반복)
+
+- inventory: locker_inventory.LockerInventory.claim (비트맵 힌트 + FOR UPDATE SKIP LOCKED)
+  --workers 개의 인스턴스를 스레드에 나눠 줘 워커 프로세스 여러 개를 흉내 냅니다.
+- naive    : 예전 방식 (사용 중 번호를 모두 읽고 range 로 첫 빈 번호를 고름, 예약 없음)
+두 방식 모두 같은 번호를 두 번 배정했는지 세고, inventory 는 중복이 0 이고 모든 락커가 배정되어야 통과입니다.
+
+실행: python benchmarks/stress_locker_claims.py --lockers 500 --threads 32 --workers 4
+"""
+import argparse
+import threading
+import time
+from collections import Counter
+
+from _common import percentile
+import app.locker_inventory as inventory_module
+from app.database import get_connection
+from app.locker_inventory import LockerInventory, locker_layout
+from app.migrations import LOCKERS_TABLE_SQL
+
+BENCH_TABLE = "bench_lockers"
+
+# claim 이 쓰는 SQL 을 bench 테이블로 돌림
+for _name in ("FREE_LOCKERS_SQL", "CLAIM_ONE_SQL", "CLAIM_ANY_SQL"):
+    setattr(inventory_module, _name, getattr(inventory_module, _name).replace("FROM lockers", f"FROM {BENCH_TABLE}"))
+
+NAIVE_USED_SQL = f"SELECT locker_number FROM {BENCH_TABLE} WHERE member_id IS NOT NULL"
+ASSIGN_SQL = f"UPDATE {BENCH_TABLE} SET member_id = %s, claimed_at = NOW() WHERE locker_number = %s"
+
+
+def seed(cursor, lockers: int):
+    cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+    cursor.execute(LOCKERS_TABLE_SQL.replace("lockers (", f"{BENCH_TABLE} (", 1))
+    cursor.executemany(
+        f"INSERT INTO {BENCH_TABLE} (locker_number, zone) VALUES (%s, %s)",
+        locker_layout(lockers, "")
+    )
+    cursor.connection.commit()
+
+
+def claim_naive(cursor, lockers: int):
+    cursor.execute(NAIVE_USED_SQL)
+    used = {row['locker_number'] for row in cursor.fetchall()}
+    for number in range(1, lockers + 1):
+        if number not in used:
+            return number
+    return None
+
+
+def run_mode(mode: str, lockers: int, threads: int, workers: int, hold: float):
+    conn = get_connection()
+    with conn.cursor() as cursor:
+        seed(cursor, lockers)
+    conn.close()
+
+    inventories = [LockerInventory() for _ in range(workers)]
+    claims, latencies, errors = [], [], []
+    lock = threading.Lock()
+    next_member = iter(range(1, 10 ** 9))
+
+    def signup_loop(index: int):
+        inventory = inventories[index % workers]
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                while True:
+                    started = time.perf_counter()
+                    if mode == "inventory":
+                        number = inventory.claim(cursor)
+                    else:
+                        number = claim_naive(cursor, lockers)
+                    if number is None:
+                        conn.rollback()
+                        return
+                    time.sleep(hold)  # 회원 INSERT 등 같은 트랜잭션의 나머지 작업
+                    with lock:
+                        member_id = next(next_member)
+                    try:
+                        cursor.execute(ASSIGN_SQL, (member_id, number))
+                        conn.commit()
+                    except Exception as e:
+                        conn.rollback()
+                        with lock:
+                            errors.append(str(e))
+                        continue
+                    with lock:
+                        claims.append(number)
+                        latencies.append((time.perf_counter() - started - hold) * 1000)
+                    if mode == "naive" and len(claims) >= lockers * 2:
+                        return  # 덮어쓰기가 끝없이 이어지지 않도록
+        finally:
+            conn.close()
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=signup_loop, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    duplicates = sum(count - 1 for count in Counter(claims).values() if count > 1)
+    conn = get_connection()
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) AS n FROM {BENCH_TABLE} WHERE member_id IS NOT NULL")
+        assigned = cursor.fetchone()['n']
+        cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+    conn.close()
+
+    stats = [inv.stats() for inv in inventories] if mode == "inventory" else []
+    stale = sum(s["total_stale_hints"] for s in stats)
+    print(f"{mode:<10}{len(claims):>8}{assigned:>10}{duplicates:>12}{len(errors):>8}"
+          f"{percentile(latencies, 50):>10.2f}{percentile(latencies, 99):>10.2f}{elapsed:>9.2f}s"
+          f"{'':>2}{'stale hints ' + str(stale) if stats else ''}")
+    return len(claims), assigned, duplicates
+
+
+def run(lockers: int, threads: int, workers: int, hold: float):
+    print(f"락커 {lockers}개, 스레드 {threads}개, 워커(비트맵) {workers}개, hold {hold * 1000:.0f}ms\n")
+    print(f"{'mode':<10}{'claims':>8}{'assigned':>10}{'duplicates':>12}{'errors':>8}"
+          f"{'p50(ms)':>10}{'p99(ms)':>10}{'elapsed':>10}")
+    claimed, assigned, duplicates = run_mode("inventory", lockers, threads, workers, hold)
+    run_mode("naive", lockers, threads, workers, hold)
+    if duplicates or claimed != lockers or assigned != lockers:
+        raise SystemExit(f"❌ inventory 배정 실패: 배정 {claimed}/{lockers}, 중복 {duplicates}")
+    print("\n✅ 동시 배정에서 중복 없이 모든 락커가 한 번씩 배정됨")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lockers", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--hold", type=float, default=0.005, help="배정 후 커밋까지 걸리는 시간(초)")
+    args = parser.parse_args()
+    run(args.lockers, args.threads, args.workers, args.hold)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+"""
+출석 롤업 재구성 (백필)
+checkins 로 attendance_hourly / attendance_daily / attendance_member_monthly 를 다시 계산합니다.
+--since 가 없으면 DB 에 남아 있는 가장 오래된 월부터 (아카이브된 월의 롤업은 유지)
+터미널에서 실행: python rebuild_attendance_rollups.py [--since 2024-01-01]
+"""
+import sys
+import os
+import argparse
+from datetime import date
+
+# 현재 파일의 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import get_connection
+from app.migrations import rebuild_attendance_rollups
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="이 날짜가 속한 월부터 재구성")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            rebuild_attendance_rollups(cursor, args.since)
+        conn.commit()
+        print("✅ 출석 롤업 재구성 완료")
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ 출석 롤업 재구성 실패: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
@@ -0,0 +1,27 @@
+"""
+테스트 공용 fixture
+- DB 가 필요한 테스트는 db_connect fixture 를 씁니다. DB_PASSWORD 가 없거나 DB 에 연결할 수 없으면 skip
+- DB 없는 단위 테스트도 app 모듈을 import 할 수 있도록 필수 설정값의 기본값을 채웁니다.
+"""
+import os
+
+import pymysql
+import pytest
+
+DB_CONFIGURED = bool(os.environ.get("DB_PASSWORD"))
+
+os.environ.setdefault("DB_PASSWORD", "")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+
+@pytest.fixture(scope="session")
+def db_connect():
+    """app.database.get_connection 을 돌려줍니다. (스레드마다 연결이 필요한 테스트용)"""
+    if not DB_CONFIGURED:
+        pytest.skip("DB_PASSWORD 가 설정되지 않아 DB 테스트를 건너뜁니다.")
+    from app.database import get_connection
+    try:
+        get_connection().close()
+    except pymysql.MySQLError as e:
+        pytest.skip(f"DB 에 연결할 수 없어 DB 테스트를 건너뜁니다: {e}")
+    return get_connection
@@ -0,0 +1,40 @@
+"""
+checkins 조회 쿼리 계획 테스트 (DB 필요)
+benchmarks/check_checkin_plans.py 와 같은 SQL 상수를 bench 테이블에 EXPLAIN 해서
+checkins 접근이 전체 스캔(type ALL)이 아니고 migrations.CHECKIN_INDEXES 의 인덱스를 쓰는지 확인합니다.
+시드 크기는 TEST_CHECKIN_PLAN_MEMBERS / TEST_CHECKIN_PLAN_CHECKINS 로 바꿀 수 있습니다.
+"""
+import os
+
+import pytest
+
+from check_checkin_plans import CASES, CHECKIN_TABLES, seed, to_bench
+from app.migrations import CHECKIN_INDEXES
+
+MEMBERS = int(os.environ.get("TEST_CHECKIN_PLAN_MEMBERS", 20_000))
+CHECKINS = int(os.environ.get("TEST_CHECKIN_PLAN_CHECKINS", 500_000))
+
+
+@pytest.fixture(scope="module")
+def cursor(db_connect):
+    conn = db_connect()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members, bench_checkins")
+            seed(cursor, MEMBERS, CHECKINS)
+            yield cursor
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_members, bench_checkins")
+        conn.close()
+
+
+@pytest.mark.parametrize("label, sql, params", CASES, ids=[case[0] for case in CASES])
+def test_checkins_access_uses_index(cursor, label, sql, params):
+    cursor.execute("EXPLAIN " + to_bench(sql), params)
+    plan = [row for row in cursor.fetchall() if row['table'] in CHECKIN_TABLES]
+
+    assert plan, f"{label}: EXPLAIN 에 checkins 접근이 없습니다."
+    for row in plan:
+        assert row['type'] != "ALL", f"{label}: checkins 전체 스캔 ({row})"
+        assert row['key'] in CHECKIN_INDEXES, f"{label}: CHECKIN_INDEXES 밖의 인덱스 {row['key']!r} ({row})"
@@ -0,0 +1,66 @@
+"""
+입장 처리 서비스 테스트 (DB 없이 repository 를 대역으로 바꿔 실행)
+- 동시에 들어온 같은 회원의 입장: active_sessions 트리거의 중복 키(1062)를 400 으로 응답하고 피드에는 알리지 않는지
+"""
+import pymysql
+import pytest
+from fastapi import HTTPException
+
+from app.checkin_feed import checkin_feed
+from app.repositories.checkin_repository import CheckinRepository
+from app.repositories.member_repository import MemberRepository
+from app.services.checkin_service import ER_DUP_ENTRY, CheckinService
+
+
+class FakeConnection:
+    def __init__(self):
+        self.rollbacks = 0
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeCursor:
+    def __init__(self):
+        self.connection = FakeConnection()
+
+
+def duplicate_session(*args):
+    raise pymysql.err.IntegrityError(ER_DUP_ENTRY, "Duplicate entry for key 'PRIMARY'")
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+    monkeypatch.setattr(checkin_feed, "publish", lambda *args, **kwargs: events.append((args, kwargs)))
+    return events
+
+
+def test_process_checkin_duplicate_session_is_400(monkeypatch, published):
+    monkeypatch.setattr(MemberRepository, "get_member_by_id",
+                        staticmethod(lambda cursor, member_id: {"name": "홍길동", "membership_end_date": None}))
+    monkeypatch.setattr(CheckinRepository, "get_active_checkin", staticmethod(lambda cursor, member_id: None))
+    monkeypatch.setattr(CheckinRepository, "create_checkin", staticmethod(duplicate_session))
+    service = CheckinService(FakeCursor())
+
+    with pytest.raises(HTTPException) as exc_info:
+        service.process_checkin(1)
+
+    assert exc_info.value.status_code == 400
+    assert service.db.connection.rollbacks == 1
+    assert not published
+
+
+def test_kiosk_checkin_duplicate_session_is_400(monkeypatch, published):
+    monkeypatch.setattr(CheckinRepository, "kiosk_checkin", staticmethod(duplicate_session))
+    service = CheckinService(FakeCursor())
+
+    with pytest.raises(HTTPException) as exc_info:
+        service.kiosk_checkin(1)
+
+    assert exc_info.value.status_code == 400
+    assert service.db.connection.rollbacks == 1
+    assert not published
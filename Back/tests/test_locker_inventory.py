@@ -0,0 +1,130 @@
+"""
+락커 재고 테스트
+- locker_layout / locker_state: DB 없이 실행
+- 동시 배정: bench_lockers 에 여러 스레드가 동시에 LockerInventory.claim 으로 배정해 같은 번호가 두 번 나오지 않는지 (DB 필요)
+  (benchmarks/stress_locker_claims.py 의 inventory 모드와 같은 흐름)
+"""
+import threading
+from collections import Counter
+
+import pytest
+
+import app.locker_inventory as inventory_module
+from app.locker_inventory import (
+    DEFAULT_ZONE, EXPIRING_DAYS, LOCKER_STATES, LockerInventory, locker_layout, locker_state
+)
+from app.migrations import LOCKERS_TABLE_SQL
+
+BENCH_TABLE = "bench_lockers"
+ASSIGN_SQL = f"UPDATE {BENCH_TABLE} SET member_id = %s, claimed_at = NOW() WHERE locker_number = %s"
+
+
+# ==================== locker_layout ====================
+def test_layout_without_zones_is_all_default_zone():
+    assert locker_layout(3, "") == [(1, DEFAULT_ZONE), (2, DEFAULT_ZONE), (3, DEFAULT_ZONE)]
+
+
+def test_layout_assigns_zone_ranges():
+    layout = dict(locker_layout(10, "남:1-6, 여:7-9"))
+    assert [layout[n] for n in (1, 6, 7, 9, 10)] == ["남", "남", "여", "여", DEFAULT_ZONE]
+
+
+def test_layout_single_number_and_blank_parts():
+    layout = dict(locker_layout(5, " ,VIP:3,, "))
+    assert layout == {1: DEFAULT_ZONE, 2: DEFAULT_ZONE, 3: "VIP", 4: DEFAULT_ZONE, 5: DEFAULT_ZONE}
+
+
+def test_layout_ignores_numbers_past_count():
+    assert locker_layout(2, "남:1-60") == [(1, "남"), (2, "남")]
+
+
+def test_layout_zone_name_may_contain_colon():
+    assert dict(locker_layout(2, "1층:남:1-2")) == {1: "1층:남", 2: "1층:남"}
+
+
+@pytest.mark.parametrize("zones", ["1-60", ":1-60", "남:", "남:a-60", "남:1-b", "남:-60", "남 1-60"])
+def test_layout_rejects_malformed_zone(zones):
+    with pytest.raises(ValueError, match="LOCKER_ZONES"):
+        locker_layout(100, zones)
+
+
+# ==================== locker_state ====================
+@pytest.mark.parametrize("member_id, days_left, expected", [
+    (None, None, "available"),
+    (None, -3, "available"),
+    (1, None, "occupied"),
+    (1, -1, "expired"),
+    (1, 0, "expiring"),
+    (1, EXPIRING_DAYS, "expiring"),
+    (1, EXPIRING_DAYS + 1, "occupied"),
+])
+def test_locker_state(member_id, days_left, expected):
+    assert locker_state(member_id, days_left) == expected
+    assert expected in LOCKER_STATES
+
+
+# ==================== 동시 배정 (DB) ====================
+@pytest.fixture
+def bench_lockers(db_connect, monkeypatch):
+    """bench_lockers 를 만들고 claim 이 쓰는 SQL 을 그 테이블로 돌립니다."""
+    for name in ("FREE_LOCKERS_SQL", "CLAIM_ONE_SQL", "CLAIM_ANY_SQL"):
+        monkeypatch.setattr(inventory_module, name,
+                            getattr(inventory_module, name).replace("FROM lockers", f"FROM {BENCH_TABLE}"))
+    conn = db_connect()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+            cursor.execute(LOCKERS_TABLE_SQL.replace("lockers (", f"{BENCH_TABLE} (", 1))
+            cursor.executemany(f"INSERT INTO {BENCH_TABLE} (locker_number, zone) VALUES (%s, %s)",
+                               locker_layout(200, ""))
+        conn.commit()
+        yield conn, 200
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+        conn.close()
+
+
+def test_concurrent_claims_never_duplicate(db_connect, bench_lockers):
+    conn, lockers = bench_lockers
+    threads, workers = 16, 4
+    inventories = [LockerInventory() for _ in range(workers)]
+    claims, errors = [], []
+    lock = threading.Lock()
+    next_member = iter(range(1, 10 ** 9))
+
+    def signup_loop(index: int):
+        inventory = inventories[index % workers]
+        worker_conn = db_connect()
+        try:
+            with worker_conn.cursor() as cursor:
+                while True:
+                    number = inventory.claim(cursor)
+                    if number is None:
+                        worker_conn.rollback()
+                        return
+                    with lock:
+                        member_id = next(next_member)
+                    cursor.execute(ASSIGN_SQL, (member_id, number))
+                    worker_conn.commit()
+                    with lock:
+                        claims.append(number)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+        finally:
+            worker_conn.close()
+
+    pool = [threading.Thread(target=signup_loop, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    assert not errors
+    duplicates = {number: count for number, count in Counter(claims).items() if count > 1}
+    assert not duplicates, f"같은 락커가 두 번 배정됨: {duplicates}"
+    assert sorted(claims) == list(range(1, lockers + 1))
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) AS n FROM {BENCH_TABLE} WHERE member_id IS NOT NULL")
+        assert cursor.fetchone()['n'] == lockers
@@ -0,0 +1,84 @@
+"""키셋(커서) 페이지네이션 헬퍼 테스트 (utils/pagination.py)"""
+import base64
+import json
+from datetime import date, datetime
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_condition
+
+
+# ==================== encode_cursor / decode_cursor ====================
+@pytest.mark.parametrize("sort_value", [
+    "홍길동", 42, None, date(2026, 3, 1), datetime(2026, 3, 1, 9, 30, 15),
+])
+def test_cursor_round_trip(sort_value):
+    token = encode_cursor("name", sort_value, 7)
+    assert "=" not in token
+    assert decode_cursor(token, "name") == (sort_value, 7)
+
+
+def test_cursor_keeps_date_and_datetime_types():
+    value, _ = decode_cursor(encode_cursor("end_date", date(2026, 1, 31), 1), "end_date")
+    assert type(value) is date
+    value, _ = decode_cursor(encode_cursor("recent_checkin", datetime(2026, 1, 31, 8, 0), 1), "recent_checkin")
+    assert type(value) is datetime
+
+
+def test_cursor_for_default_sort():
+    assert decode_cursor(encode_cursor(None, 10, 10), None) == (10, 10)
+
+
+def test_cursor_from_other_sort_is_rejected():
+    with pytest.raises(ValueError, match="정렬 기준"):
+        decode_cursor(encode_cursor("name", "a", 1), "end_date")
+
+
+def _token(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("token", [
+    "not-base64!!",
+    base64.urlsafe_b64encode(b"not json").decode("ascii"),
+    _token({"s": "name"}),
+    _token({"s": "name", "k": ["a"]}),
+    _token({"s": "name", "k": ["a", "1"]}),
+    _token({"s": "name", "k": [{"x": "2026-01-01"}, 1]}),
+])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token, "name")
+
+
+# ==================== keyset_condition ====================
+def test_keyset_on_member_id_compares_id_only():
+    assert keyset_condition("m.member_id", "DESC", 5, 5, id_expr="m.member_id") == ("m.member_id < %s", [5])
+    assert keyset_condition("m.member_id", "ASC", 5, 5, id_expr="m.member_id") == ("m.member_id > %s", [5])
+
+
+def test_keyset_asc_value():
+    # ASC: NULL 은 앞에서 이미 지나갔으므로 NULL 조건 없음
+    assert keyset_condition("m.name", "ASC", "김", 3) == (
+        "(m.name > %s OR (m.name = %s AND member_id > %s))", ["김", "김", 3]
+    )
+
+
+def test_keyset_desc_value_includes_trailing_nulls():
+    # DESC: NULL 은 맨 뒤라 값이 있는 행 다음에도 남아 있음
+    assert keyset_condition("m.last_checkin_time", "desc", "2026-01-01", 3) == (
+        "(m.last_checkin_time < %s OR (m.last_checkin_time = %s AND member_id < %s) OR m.last_checkin_time IS NULL)",
+        ["2026-01-01", "2026-01-01", 3],
+    )
+
+
+def test_keyset_asc_null_continues_into_values():
+    # ASC: NULL 구간의 나머지 + NULL 이 아닌 모든 행
+    assert keyset_condition("m.name", "ASC", None, 3) == (
+        "((m.name IS NULL AND member_id > %s) OR m.name IS NOT NULL)", [3]
+    )
+
+
+def test_keyset_desc_null_stays_in_null_tail():
+    # DESC: NULL 이 마지막이므로 NULL 구간 안에서만 이어짐
+    assert keyset_condition("m.name", "DESC", None, 3) == ("(m.name IS NULL AND member_id < %s)", [3])
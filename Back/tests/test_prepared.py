@@ -0,0 +1,70 @@
+"""prepared statement 캐시 테스트 (DB 없이 실행한 문장만 기록하는 대역 연결로 확인)"""
+import pymysql
+import pytest
+
+from app.prepared import PreparedStatementCache, to_server_sql
+
+
+class RecordingConnection:
+    def __init__(self, fail_on: str = None):
+        self.statements = []
+        self.fail_on = fail_on
+
+    def cursor(self):
+        return RecordingCursor(self)
+
+
+class RecordingCursor:
+    def __init__(self, connection: RecordingConnection):
+        self.connection = connection
+        self.rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.connection.statements.append((sql, params))
+        if self.connection.fail_on and sql.startswith(self.connection.fail_on):
+            raise pymysql.err.OperationalError(1064, "syntax error")
+        self.rows = [{"sql": sql}]
+
+
+def test_to_server_sql():
+    assert to_server_sql("SELECT * FROM m WHERE a = %s AND b LIKE 'PT%%'") == \
+        "SELECT * FROM m WHERE a = ? AND b LIKE 'PT%'"
+
+
+def test_parameters_are_cleared_after_execute():
+    conn = RecordingConnection()
+    cursor = conn.cursor()
+    PreparedStatementCache(4).execute(cursor, "SELECT %s, %s", ("010-1234", "홍길동"))
+
+    sqls = [sql for sql, _ in conn.statements]
+    assert sqls[0].startswith("PREPARE ps_")
+    assert sqls[1].startswith("SET @ps_") and sqls[1].endswith("= %s")
+    assert sqls[2].startswith("EXECUTE ps_")
+    assert sqls[3] == "SET " + ", ".join(f"@{sqls[2].split()[1]}_{i} = NULL" for i in range(2))
+    # 정리 문장은 다른 커서에서 실행되어 EXECUTE 결과가 그대로 남음
+    assert cursor.rows == [{"sql": sqls[2]}]
+
+
+def test_parameters_are_cleared_when_execute_fails():
+    conn = RecordingConnection(fail_on="EXECUTE")
+    with pytest.raises(pymysql.err.OperationalError):
+        PreparedStatementCache(4).execute(conn.cursor(), "SELECT %s", ("010-1234",))
+
+    assert conn.statements[-1][0].endswith("_0 = NULL")
+
+
+def test_statement_is_prepared_once_per_connection():
+    cache = PreparedStatementCache(4)
+    conn = RecordingConnection()
+    for _ in range(3):
+        cache.execute(conn.cursor(), "SELECT %s", (1,))
+
+    assert sum(sql.startswith("PREPARE") for sql, _ in conn.statements) == 1
+    stats = cache.stats()
+    assert (stats["total_hits"], stats["total_misses"]) == (2, 1)
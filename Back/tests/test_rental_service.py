@@ -0,0 +1,86 @@
+"""
+락커 대여 서비스 테스트 (DB 없이 repository 를 대역으로 바꿔 실행)
+- 빈 락커 확인과 배정 사이에 다른 요청이 같은 락커를 가져간 경우(sp_locker_assign SIGNAL) 400 으로 응답하는지
+"""
+import pymysql
+import pytest
+from fastapi import HTTPException
+
+from app.locker_inventory import LOCKER_TAKEN_ERROR, locker_inventory
+from app.schemas.locker_rental import LockerRentalCreate
+from app.services.rental_service import RentalService
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeCursor:
+    def __init__(self):
+        self.connection = FakeConnection()
+
+
+class FreeThenTakenLockers:
+    """확인 시점에는 비어 있었지만 배정 시점에는 다른 요청이 커밋한 락커"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def get_locker_by_member(self, cursor, member_id):
+        return None
+
+    def is_locker_available(self, cursor, locker_number):
+        return True
+
+    def create_locker_rental(self, cursor, member_id, locker_data, start_date):
+        raise self.error
+
+
+class FoundMembers:
+    def get_member_by_id(self, cursor, member_id):
+        return {"member_id": member_id}
+
+
+def make_service(error: Exception) -> RentalService:
+    service = RentalService(FakeCursor())
+    service.member_repo = FoundMembers()
+    service.locker_repo = FreeThenTakenLockers(error)
+    return service
+
+
+@pytest.fixture
+def invalidations(monkeypatch):
+    calls = []
+    monkeypatch.setattr(locker_inventory, "invalidate", lambda: calls.append(True))
+    return calls
+
+
+def test_locker_taken_between_check_and_assign_is_400(invalidations):
+    service = make_service(pymysql.err.OperationalError(LOCKER_TAKEN_ERROR, "이미 사용 중인 락커입니다."))
+
+    with pytest.raises(HTTPException) as exc_info:
+        service.create_locker_rental(1, LockerRentalCreate(locker_number=7, rental_type="1개월"))
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "이미 사용 중인 락커입니다."
+    assert service.db.connection.rollbacks == 1
+    assert service.db.connection.commits == 0
+    assert not invalidations
+
+
+def test_other_assign_errors_are_not_mapped(invalidations):
+    service = make_service(pymysql.err.OperationalError(2013, "Lost connection"))
+
+    with pytest.raises(pymysql.err.OperationalError):
+        service.create_locker_rental(1, LockerRentalCreate(locker_number=7, rental_type="1개월"))
+
+    assert service.db.connection.rollbacks == 1
+    assert not invalidations
@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { adminService } from "../services/adminService";
 import MemberDrawer from "./MemberDrawer";
 import DeletedMembers from "./DeletedMembers";
@@ -11,14 +11,22 @@ export default function AdminDashboard({ onLogout }: AdminDashboardProps) {
   const [members, setMembers] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState("");
+  // 검색창 자동완성 (초성 검색 지원, 입력이 멈춘 뒤 호출)
+  const [suggestions, setSuggestions] = useState<any[]>([]);
+  const [showSuggestions, setShowSuggestions] = useState(false);
+  const typeaheadRequest = useRef(0);
   const [statusFilter, setStatusFilter] = useState<'all' | 'active' | 'inactive' | 'expiring_soon' | null>(null);
   const [currentPage, setCurrentPage] = useState(1);
   const [totalPages, setTotalPages] = useState(1);
   const [totalMembers, setTotalMembers] = useState(0);
+  // 키셋 페이지네이션: 페이지 번호 -> 그 페이지를 여는 커서 (같은 필터/정렬일 때만 유효)
+  const pageCursors = useRef<{ key: string; cursors: Record<number, string> }>({ key: "", cursors: {} });
   const [selectedMember, setSelectedMember] = useState<any>(null);
   const [isAddingNew, setIsAddingNew] = useState(false);
   const [isClosing, setIsClosing] = useState(false);
   const [showDeletedMembers, setShowDeletedMembers] = useState(false);
+  // 현재 입장 인원 (실시간 피드로 갱신)
+  const [occupancy, setOccupancy] = useState<number | null>(null);
 
   // 탭 상태 관리
   const [selectedTabs, setSelectedTabs] = useState<string[]>(["전체"]);
@@ -155,7 +163,7 @@ export default function AdminDashboard({ onLogout }: AdminDashboardProps) {
     }
   };
 
-  const fetchMembers = async () => {
+  const fetchMembers = async (searchOverride?: string) => {
     setLoading(true);
     try {
       const token = sessionStorage.getItem('admin_token');
@@ -168,8 +176,9 @@ export default function AdminDashboard({ onLogout }: AdminDashboardProps) {
         page: currentPage,
         size: 20,
       };
-      if (searchTerm) {
-        params.search = searchTerm;
+      const search = searchOverride ?? searchTerm;
+      if (search) {
+        params.search = search;
       }
       
       console.log('🎯 selectedTabs:', selectedTabs);
@@ -228,14 +237,31 @@ export default function AdminDashboard({ onLogout }: AdminDashboardProps) {
         params.gender = selectedGender;
       }
       
+      // 필터/정렬이 바뀌면 저장된 커서를 버리고, 같으면 이전 응답의 next_cursor 로 다음 페이지 조회
+      const { page, ...filterParams } = params;
+      const cursorKey = JSON.stringify(filterParams);
+      if (pageCursors.current.key !== cursorKey) {
+        pageCursors.current = { key: cursorKey, cursors: {} };
+      }
+      const pageCursor = pageCursors.current.cursors[page];
+      if (pageCursor) {
+        params.cursor = pageCursor;
+        params.count = 'none'; // 같은 필터의 다음 페이지는 전체 개수가 이미 있으므로 생략
+      }
+
       console.log('📤 최종 요청 파라미터:', params);
       const response = await adminService.getMembers(params);
+      if (response.next_cursor) {
+        pageCursors.current.cursors[page + 1] = response.next_cursor;
+      }
       console.log('📥 응답 데이터:', response);
       console.log('📊 회원 수:', response.members?.length, '/ 전체:', response.total);
 
       setMembers([...response.members]); // 강제 새 배열 생성
-      setTotalMembers(response.total);
-      setTotalPages(Math.ceil(response.total / response.size));
+      if (response.total !== null && response.total !== undefined) {
+        setTotalMembers(response.total);
+        setTotalPages(Math.ceil(response.total / response.size));
+      }
     } catch (error: any) {
       if (error.response?.status === 401) {
         alert('인증이 만료되었습니다. 다시 로그인해주세요.');
@@ -265,6 +291,35 @@ export default function AdminDashboard({ onLogout }: AdminDashboardProps) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [currentPage, statusFilter, selectedTabs, selectedGender]);
 
+  // 입장/퇴장 실시간 피드: 목록을 다시 불러오지 않고 해당 회원 행과 현재 인원만 갱신
+  useEffect(() => {
+    const loadOccupancy = () =>
+      adminService.getOccupancy()
+        .then((res) => setOccupancy(res.count))
+        .catch((error) => console.error('현재 인원 조회 실패:', error));
+    loadOccupancy();
+
+    const stream = adminService.openCheckinStream();
+    const applyEvent = (e: MessageEvent, delta: number) => {
+      const data = JSON.parse(e.data);
+      setMembers((prev) => prev.map((m) =>
+        m.member_id === data.member_id
+          ? { ...m, checkin_time: data.checkin_time, checkout_time: data.checkout_time ?? null }
+          : m
+      ));
+      setOccupancy((prev) => (prev === null ? prev : Math.max(0, prev + delta)));
+    };
+    stream.addEventListener('checkin', (e) => applyEvent(e as MessageEvent, 1));
+    stream.addEventListener('checkout', (e) => applyEvent(e as MessageEvent, -1));
+    // 서버가 놓친 이벤트를 다시 보낼 수 없을 때 (재시작 등): 한 번 전체를 다시 읽음
+    stream.addEventListener('reset', () => {
+      loadOccupancy();
+      fetchMembers();
+    });
+    return () => stream.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
   // 화면에 표시할 멤버 목록을 탭(만료/곧 만료) 조건에 따라 필터링
   const getDisplayedMembers = () => {
     if (!members) return [];
@@ -298,12 +353,42 @@ export default function AdminDashboard({ onLogout }: AdminDashboardProps) {
 
   const displayedMembers = getDisplayedMembers();
 
+  useEffect(() => {
+    const query = searchTerm.trim();
+    if (!query) {
+      setSuggestions([]);
+      return;
+    }
+    // 디바운스: 마지막 입력 후 200ms 동안 추가 입력이 없을 때만 호출
+    const requestId = ++typeaheadRequest.current;
+    const timer = setTimeout(async () => {
+      try {
+        const response = await adminService.typeaheadMembers(query);
+        if (requestId === typeaheadRequest.current) {
+          setSuggestions(response.members);
+        }
+      } catch (error) {
+        console.error('자동완성 조회 실패:', error);
+      }
+    }, 200);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
   const handleSearch = (e: React.FormEvent) => {
     e.preventDefault();
+    setShowSuggestions(false);
     setCurrentPage(1);
     fetchMembers();
   };
 
+  const handleSuggestionClick = (member: any) => {
+    // 전화번호는 회원마다 고유하므로 그 회원 한 명으로 목록을 좁힘
+    setSearchTerm(member.phone_number);
+    setShowSuggestions(false);
+    setCurrentPage(1);
+    fetchMembers(member.phone_number);
+  };
+
   const handleFilterChange = (newFilter: typeof statusFilter) => {
     setStatusFilter(statusFilter === newFilter ? null : newFilter);
     setCurrentPage(1);
@@ -392,7 +477,12 @@ export default function AdminDashboard({ onLogout }: AdminDashboardProps) {
           );
         })}
         </div>
-        <div className="flex items-center">
+        <div className="flex items-center gap-4">
+          {occupancy !== null && (
+            <span className="text-sm font-medium text-gray-700">
+              현재 입장 <span className="text-blue-600 font-bold">{occupancy}</span>명
+            </span>
+          )}
           <button 
             onClick={handleLogout} 
             className="px-6 py-2 bg-red-500 text-white rounded-lg hover:bg-red-600 transition-colors font-medium text-sm ml-auto"
@@ -406,13 +496,35 @@ export default function AdminDashboard({ onLogout }: AdminDashboardProps) {
       {/* 검색 및 필터 */}
       <div className="bg-white border-b border-gray-200 px-6 py-4">
         <form onSubmit={handleSearch} className="flex gap-4 items-center">
-          <input
-            type="text"
-            value={searchTerm}
-            onChange={(e) => setSearchTerm(e.target.value)}
-            placeholder="이름 또는 전화번호로 검색..."
-            className="flex-1 px-4 py-2 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500"
-          />
+          <div className="relative flex-1">
+            <input
+              type="text"
+              value={searchTerm}
+              onChange={(e) => {
+                setSearchTerm(e.target.value);
+                setShowSuggestions(true);
+              }}
+              onFocus={() => setShowSuggestions(true)}
+              onBlur={() => setTimeout(() => setShowSuggestions(false), 150)}
+              placeholder="이름, 초성(ㄱㅁㅅ) 또는 전화번호로 검색..."
+              className="w-full px-4 py-2 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500"
+            />
+            {showSuggestions && suggestions.length > 0 && (
+              <ul className="absolute z-20 mt-1 w-full bg-white border border-gray-200 rounded-lg shadow-lg max-h-72 overflow-auto">
+                {suggestions.map((s) => (
+                  <li
+                    key={s.member_id}
+                    onMouseDown={(e) => e.preventDefault()}
+                    onClick={() => handleSuggestionClick(s)}
+                    className="px-4 py-2 flex justify-between cursor-pointer hover:bg-blue-50"
+                  >
+                    <span className="font-medium text-gray-900">{s.name}</span>
+                    <span className="text-sm text-gray-500">{s.phone_number}</span>
+                  </li>
+                ))}
+              </ul>
+            )}
+          </div>
           <button
             type="submit"
             className="px-6 py-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700 transition-colors"
@@ -33,7 +33,11 @@ export default function MemberDrawer({
     uniform_end_date: member?.uniform_end_date || '',
   });
 
-  const [checkinHistory, setCheckinHistory] = useState<any[]>([]);
+  const [calendar, setCalendar] = useState<any | null>(null);
+  const [calendarMonth, setCalendarMonth] = useState(() => {
+    const now = new Date();
+    return { year: now.getFullYear(), month: now.getMonth() + 1 };
+  });
   const [loadingHistory, setLoadingHistory] = useState(!isNewMember);
   const [saving, setSaving] = useState(false);
   const [deleting, setDeleting] = useState(false);
@@ -74,21 +78,39 @@ export default function MemberDrawer({
       return;
     }
 
-    const fetchHistory = async () => {
+    const fetchCalendar = async () => {
       try {
         setLoadingHistory(true);
-        const response = await adminService.getCheckinHistory(member.member_id);
-        setCheckinHistory(response.checkins || []);
+        const response = await adminService.getMemberCalendar(member.member_id, calendarMonth.year, calendarMonth.month);
+        setCalendar(response);
       } catch (error) {
         console.error('출입 기록 조회 실패:', error);
-        setCheckinHistory([]);
+        setCalendar(null);
       } finally {
         setLoadingHistory(false);
       }
     };
 
-    fetchHistory();
-  }, [member?.member_id, isNewMember, member]);
+    fetchCalendar();
+  }, [member?.member_id, isNewMember, member, calendarMonth]);
+
+  const moveCalendarMonth = (delta: number) => {
+    setCalendarMonth(({ year, month }) => {
+      const next = new Date(year, month - 1 + delta, 1);
+      return { year: next.getFullYear(), month: next.getMonth() + 1 };
+    });
+  };
+
+  const isCurrentMonth = (() => {
+    const now = new Date();
+    return calendarMonth.year === now.getFullYear() && calendarMonth.month === now.getMonth() + 1;
+  })();
+
+  const formatMinutes = (minutes: number) =>
+    minutes >= 60 ? `${Math.floor(minutes / 60)}시간 ${minutes % 60}분` : `${minutes}분`;
+
+  // 최근 날짜부터 표시
+  const calendarDays: any[] = calendar?.days ? [...calendar.days].reverse() : [];
 
   // 기간 계산 함수
   const calculateEndDate = (startDate: string, type: string) => {
@@ -559,27 +581,41 @@ export default function MemberDrawer({
         {/* 출입 기록 */}
         {!isNewMember && (
           <div className={`bg-white rounded-xl border-2 border-gray-200 p-6 ${isEditMode ? 'opacity-75' : ''}`}>
-            <h3 className="text-lg font-bold text-gray-800 mb-4 flex items-center gap-2">
-              <span className="text-2xl">📈</span> 최근 출입 기록 {isEditMode && <span className="text-sm text-gray-500 font-normal">(수정 불가)</span>}
-            </h3>
+            <div className="flex items-center justify-between mb-4">
+              <h3 className="text-lg font-bold text-gray-800 flex items-center gap-2">
+                <span className="text-2xl">📈</span> 출입 기록 {isEditMode && <span className="text-sm text-gray-500 font-normal">(수정 불가)</span>}
+              </h3>
+              <div className="flex items-center gap-2">
+                <button onClick={() => moveCalendarMonth(-1)} className="px-2 py-1 text-gray-600 hover:bg-gray-100 rounded">◀</button>
+                <span className="font-semibold text-gray-800 w-28 text-center">{calendarMonth.year}년 {calendarMonth.month}월</span>
+                <button onClick={() => moveCalendarMonth(1)} disabled={isCurrentMonth} className="px-2 py-1 text-gray-600 hover:bg-gray-100 rounded disabled:opacity-30">▶</button>
+              </div>
+            </div>
+            {calendar && calendar.visits > 0 && (
+              <div className="flex gap-4 mb-4 text-sm text-gray-600">
+                <span>방문 <b className="text-gray-900">{calendar.visits}회</b></span>
+                <span>방문일 <b className="text-gray-900">{calendar.visit_days}일</b></span>
+                <span>총 이용 <b className="text-gray-900">{formatMinutes(calendar.total_minutes)}</b></span>
+              </div>
+            )}
             {loadingHistory ? (
               <div className="flex items-center justify-center py-12"><div className="animate-spin rounded-full h-8 w-8 border-b-2 border-blue-600"></div><span className="ml-3 text-gray-500">로딩 중...</span></div>
-            ) : checkinHistory.length === 0 ? (
+            ) : calendarDays.length === 0 ? (
               <div className="text-center py-12 text-gray-500"><span className="text-4xl mb-3 block">📭</span>출입 기록이 없습니다.</div>
             ) : (
               <div className="space-y-2 max-h-96 overflow-y-auto">
-                {checkinHistory.map((record, index) => (
-                  <div key={record.id} className="flex items-center justify-between p-4 bg-gradient-to-r from-gray-50 to-gray-100 rounded-lg border border-gray-200">
+                {calendarDays.map((day) => (
+                  <div key={day.date} className="flex items-center justify-between p-4 bg-gradient-to-r from-gray-50 to-gray-100 rounded-lg border border-gray-200">
                     <div className="flex items-center gap-4">
-                      <div className="flex items-center justify-center w-8 h-8 bg-green-500 text-white rounded-full font-bold text-sm">{index + 1}</div>
+                      <div className="flex items-center justify-center w-8 h-8 bg-green-500 text-white rounded-full font-bold text-sm">{day.visits}</div>
                       <div>
-                        <span className="font-bold text-gray-900 text-lg block">{new Date(record.date).toLocaleDateString('ko-KR', { month: 'long', day: 'numeric', weekday: 'short' })}</span>
-                        <span className="text-sm text-gray-500">{new Date(record.date).getFullYear()}년</span>
+                        <span className="font-bold text-gray-900 text-lg block">{new Date(day.date).toLocaleDateString('ko-KR', { month: 'long', day: 'numeric', weekday: 'short' })}</span>
+                        <span className="text-sm text-gray-500">첫 입장 {day.first_checkin}</span>
                       </div>
                     </div>
                     <div className="flex items-center gap-3">
-                      <span className="text-gray-700 font-semibold text-lg">{record.time}</span>
-                      <span className="px-3 py-1 text-xs bg-green-100 text-green-700 rounded-full font-bold">{record.type}</span>
+                      <span className="text-gray-700 font-semibold text-lg">{day.minutes > 0 ? formatMinutes(day.minutes) : '-'}</span>
+                      <span className="px-3 py-1 text-xs bg-green-100 text-green-700 rounded-full font-bold">{day.visits > 1 ? `입장 ${day.visits}회` : '입장'}</span>
                     </div>
                   </div>
                 ))}
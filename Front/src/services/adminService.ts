@@ -57,6 +57,8 @@ export const adminService = {
     search?: string;
     status?: string;
     sort_by?: string;
+    cursor?: string; // 이전 응답의 next_cursor (있으면 page 대신 키셋 페이지네이션)
+    count?: 'exact' | 'estimate' | 'none'; // 전체 개수 계산 방식 (기본 exact)
   }) => {
     console.log('📞 [getMembers] 호출, params:', params); // ⭐ 디버깅
     const response = await client.get('/admin/members', { params });
@@ -64,6 +66,12 @@ export const adminService = {
     return response.data;
   },
 
+  // 검색창 자동완성 (이름/초성/전화번호 접두어)
+  typeaheadMembers: async (q: string, limit: number = 10) => {
+    const response = await client.get('/admin/members/typeahead', { params: { q, limit } });
+    return response.data;
+  },
+
   // 회원 상세 조회
   getMember: async (memberId: number) => {
     const response = await client.get(`/admin/members/${memberId}`);
@@ -115,9 +123,26 @@ export const adminService = {
     return response.data;
   },
 
-  // 출입 기록 조회 ⭐ 새로 추가
-  getCheckinHistory: async (memberId: number) => {
-    const response = await client.get(`/admin/members/${memberId}/checkins`);
+  // 회원 출입 달력 (일별 방문 수 / 이용 시간, month 가 없으면 한 해)
+  // 지난 달은 서버가 immutable + ETag 로 응답하므로 브라우저 캐시가 재사용합니다.
+  getMemberCalendar: async (memberId: number, year: number, month?: number) => {
+    const response = await client.get(`/admin/members/${memberId}/calendar`, {
+      params: { year, month },
+    });
+    return response.data;
+  },
+
+  // 락커 배치도 (락커별 상태 / 사용 회원 / 대여 종류 / 남은 일수)
+  getLockerMap: async () => {
+    const response = await client.get('/admin/lockers/map');
+    return response.data;
+  },
+
+  // 만료 예정 회원권/락커/회원복 (kind: membership | locker | uniform)
+  getUpcomingExpiries: async (days: number = 7, kind?: string) => {
+    const response = await client.get('/admin/expiries/upcoming', {
+      params: { days, kind },
+    });
     return response.data;
   },
 
@@ -127,6 +152,25 @@ export const adminService = {
     return response.data;
   },
 
+  // 현재 입장 인원 (active_sessions)
+  getOccupancy: async () => {
+    const response = await client.get('/checkin/occupancy');
+    return response.data;
+  },
+
+  // 현재 입장 중인 회원 목록 (관리자 전용)
+  getOccupancyMembers: async () => {
+    const response = await client.get('/admin/occupancy');
+    return response.data;
+  },
+
+  // 입장/퇴장 실시간 피드 (SSE). EventSource 는 헤더를 못 보내므로 토큰을 쿼리로 전달하고,
+  // 끊기면 브라우저가 Last-Event-ID 를 붙여 자동 재연결해 놓친 이벤트만 받습니다.
+  openCheckinStream: () => {
+    const token = sessionStorage.getItem('admin_token') || '';
+    return new EventSource(`${API_BASE_URL}/admin/checkin-stream?token=${encodeURIComponent(token)}`);
+  },
+
   // 비밀번호 변경
   changePassword: async (currentPassword: string, newPassword: string) => {
     const response = await client.put('/admin/change-password', {